@@ -0,0 +1,120 @@
+"""DeepPCB 라벨 파싱/YOLO 변환 벤치마크.
+
+합성 DeepPCB 라벨 파일을 만들어 기존 경로(``load_deeppcb_annotation`` 의 박스별
+딕셔너리 + ``convert_to_yolo_format`` 의 박스별 f-string)와 배열 경로
+(``parse_deeppcb_labels`` + ``deeppcb_to_yolo`` + ``format_yolo_labels``)의
+파싱+변환 시간과 라벨 파일 기록을 포함한 전체 시간을 비교합니다. 두 경로가 만든 라벨 파일이
+바이트 단위로 같은지도 확인하며, 다르면 종료 코드 1을 반환합니다.
+
+사용 예::
+
+    python benchmarks/deeppcb_labels.py --files 20000 --mean-boxes 6
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.deeppcb_loader import (  # noqa: E402
+    DeepPCBLoader,
+    deeppcb_to_yolo,
+    format_yolo_labels,
+    parse_deeppcb_labels,
+)
+
+IMAGE_SIZE = 640
+
+
+def make_labels(root: Path, num_files: int, mean_boxes: float, seed: int) -> list:
+    """DeepPCB 형식(x1 y1 x2 y2 class_id)의 합성 라벨 파일을 만듭니다."""
+    rng = np.random.default_rng(seed)
+    label_dir = root / "PCBData" / "group00000" / "00000_not"
+    label_dir.mkdir(parents=True)
+    paths = []
+    for index in range(num_files):
+        n = max(1, int(rng.poisson(mean_boxes)))
+        xy = rng.integers(0, IMAGE_SIZE - 64, size=(n, 2))
+        rows = np.concatenate([xy, xy + rng.integers(8, 64, size=(n, 2)), rng.integers(1, 7, size=(n, 1))], axis=1)
+        path = label_dir / f"{index:08d}.txt"
+        path.write_text("".join(" ".join(map(str, row)) + "\n" for row in rows.tolist()))
+        paths.append(path)
+    return paths
+
+
+def run_legacy(loader: DeepPCBLoader, paths: list, out_dir: Path) -> tuple:
+    """기존 경로: 파일별로 읽고 변환한 뒤 기록. (파싱+변환 시간, 전체 시간)을 반환."""
+    started = time.perf_counter()
+    converted = []
+    for path in paths:
+        annotations = loader.load_deeppcb_annotation(str(path))
+        converted.append("\n".join(loader.convert_to_yolo_format(annotations, IMAGE_SIZE, IMAGE_SIZE)))
+    parsed = time.perf_counter()
+    for path, content in zip(paths, converted):
+        with open(out_dir / path.name, "w") as f:
+            f.write(content)
+    return parsed - started, time.perf_counter() - started
+
+
+def run_vectorized(paths: list, out_dir: Path) -> tuple:
+    """배열 경로: 전체를 한 번에 읽고 변환한 뒤 기록. (파싱+변환 시간, 전체 시간)을 반환."""
+    started = time.perf_counter()
+    boxes, counts, _ = parse_deeppcb_labels(paths)
+    contents = format_yolo_labels(deeppcb_to_yolo(boxes, IMAGE_SIZE, IMAGE_SIZE), counts)
+    parsed = time.perf_counter()
+    for path, content in zip(paths, contents):
+        with open(out_dir / path.name, "w") as f:
+            f.write(content)
+    return parsed - started, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DeepPCB 라벨 변환 벤치마크")
+    parser.add_argument("--files", type=int, default=10000, help="합성 라벨 파일 수")
+    parser.add_argument("--mean-boxes", type=float, default=6.0, help="파일당 평균 박스 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 시드")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="liteaoi_labels_") as tmp:
+        root = Path(tmp)
+        paths = make_labels(root, args.files, args.mean_boxes, args.seed)
+        boxes = len(parse_deeppcb_labels(paths)[0])
+        loader = DeepPCBLoader(str(root))
+        legacy_dir, vectorized_dir = root / "legacy", root / "vectorized"
+        legacy_dir.mkdir()
+        vectorized_dir.mkdir()
+
+        legacy = min(run_legacy(loader, paths, legacy_dir) for _ in range(args.repeat))
+        vectorized = min(run_vectorized(paths, vectorized_dir) for _ in range(args.repeat))
+        mismatched = sum(1 for path in paths
+                         if (legacy_dir / path.name).read_bytes() != (vectorized_dir / path.name).read_bytes())
+
+    report = {"files": args.files, "boxes": boxes, "mismatched_files": mismatched}
+    print(f"{args.files}개 파일, {boxes}개 박스")
+    print(f"  {'':12}{'parse+convert':>16}{'total':>12}")
+    for name, (convert_sec, total_sec) in (("legacy", legacy), ("vectorized", vectorized)):
+        report[name] = {"convert_sec": convert_sec, "total_sec": total_sec,
+                        "files_per_sec": args.files / total_sec}
+        print(f"  {name:12}{convert_sec:>15.3f}s{total_sec:>11.3f}s")
+    report["convert_speedup"] = legacy[0] / vectorized[0]
+    report["total_speedup"] = legacy[1] / vectorized[1]
+    print(f"  속도 향상: 파싱+변환 {report['convert_speedup']:.2f}x, 전체 {report['total_speedup']:.2f}x")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if mismatched:
+        print(f"실패: {mismatched}개 라벨 파일의 내용이 기존 경로와 다릅니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""LiteAOI 파이프라인 단계별 벤치마크.
+
+고정 시드로 만든 합성 데이터셋에서 ``infer.py`` 파이프라인의 각 단계
+(load_images, preprocess, run_inference, summarize, visualize)와
+``DeepPCBLoader.prepare_dataset`` 을 반복 실행하여 단계별 p50/p95 지연,
+처리량, 최대 RSS를 측정합니다. 결과는 JSON으로 저장하며, 저장해 둔 기준선
+JSON과 비교해 허용 범위를 넘게 느려지면 종료 코드 1을 반환합니다.
+
+``--model`` 을 생략하면 run_inference 단계를 건너뛰고 합성 검출 결과로
+summarize/visualize를 측정합니다. CPU에서는 yolov8n 같은 작은 모델을 사용합니다.
+
+사용 예::
+
+    python benchmarks/pipeline.py --model ./models/yolov8n.onnx --json bench.json
+    python benchmarks/pipeline.py --model ./models/yolov8n.onnx --baseline bench.json
+"""
+import argparse
+import json
+import logging
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.data_loader import load_images, load_single_image  # noqa: E402
+from modules.postprocessor import Detections, summarize  # noqa: E402
+from modules.preprocessor import preprocess  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# 합성 데이터셋 기본값 (DeepPCB 이미지와 같은 640x640)
+DEFAULT_NUM_IMAGES = 64
+DEFAULT_IMAGE_SIZE = 640
+DEFAULT_SEED = 0
+
+# 기준선 대비 허용 악화 비율 (0.2면 20%)
+DEFAULT_TOLERANCE = 0.2
+# 이보다 작은 지연 차이(ms)는 측정 잡음으로 보고 악화로 판단하지 않음
+MIN_REGRESSION_MS = 1.0
+
+
+def peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS(MB)를 반환합니다."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / 1e6 if platform.system() == "Darwin" else peak / 1e3
+
+
+def make_dataset(root: Path, num_images: int, image_size: int, seed: int) -> Path:
+    """DeepPCB 구조의 합성 데이터셋을 만듭니다.
+
+    ``PCBData/groupNNNNN/NNNNN/*_test.jpg`` 이미지와 ``NNNNN_not/*.txt``
+    라벨(x1 y1 x2 y2 class_id)을 그룹당 최대 16장씩 생성합니다.
+
+    Args:
+        root: 데이터셋을 만들 디렉터리
+        num_images: 이미지 수
+        image_size: 이미지 한 변의 길이
+        seed: 난수 시드
+
+    Returns:
+        데이터셋 루트 경로 (``PCBData`` 의 상위 디렉터리)
+    """
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    per_group = 16
+    for index in range(num_images):
+        group = 10000 + index // per_group
+        image_dir = root / "PCBData" / f"group{group}" / str(group)
+        label_dir = root / "PCBData" / f"group{group}" / f"{group}_not"
+        image_dir.mkdir(parents=True, exist_ok=True)
+        label_dir.mkdir(parents=True, exist_ok=True)
+
+        # 배경 위에 배선 같은 직사각형을 그린 흑백 패턴
+        image = np.full((image_size, image_size), 200, dtype=np.uint8)
+        lines = []
+        for _ in range(int(rng.integers(10, 30))):
+            x1, y1 = rng.integers(0, image_size - 40, size=2)
+            w, h = rng.integers(8, 40, size=2)
+            image[y1:y1 + h, x1:x1 + w] = 40
+            if len(lines) < 6:
+                lines.append(f"{x1} {y1} {x1 + w} {y1 + h} {int(rng.integers(1, 7))}")
+        cv2.imwrite(str(image_dir / f"{group}{index:03d}_test.jpg"), image)
+        (label_dir / f"{group}{index:03d}_test.txt").write_text("\n".join(lines) + "\n")
+    return root
+
+
+def synthetic_detections(images: List[str], image_size: int, seed: int) -> List[Detections]:
+    """모델 없이 summarize/visualize를 측정하기 위한 합성 검출 결과를 만듭니다."""
+    rng = np.random.default_rng(seed)
+    detections = []
+    for path in images:
+        n = int(rng.integers(0, 6))
+        xy = rng.uniform(0, image_size - 40, size=(n, 2))
+        wh = rng.uniform(8, 40, size=(n, 2))
+        detections.append(Detections(
+            path=path,
+            xyxy=np.concatenate([xy, xy + wh], axis=1),
+            conf=rng.uniform(0.5, 1.0, size=n),
+            cls=rng.integers(0, 6, size=n).astype(np.float64),
+            orig_shape=(image_size, image_size),
+        ))
+    return detections
+
+
+def time_stage(name: str, func: Callable[[], Any], items: int, repeat: int, warmup: int) -> Dict[str, Any]:
+    """단계를 반복 실행하여 지연/처리량/최대 RSS를 측정합니다.
+
+    Args:
+        name: 단계 이름
+        func: 단계 한 번을 실행하는 함수
+        items: 한 번 실행에서 처리하는 항목 수 (처리량 계산용)
+        repeat: 측정 반복 횟수
+        warmup: 측정 전 버리는 실행 횟수
+
+    Returns:
+        단계 측정 결과 딕셔너리
+    """
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    p50 = float(np.percentile(timings, 50))
+    result = {
+        "items": items,
+        "repeat": repeat,
+        "p50_ms": p50 * 1000.0,
+        "p95_ms": float(np.percentile(timings, 95)) * 1000.0,
+        "items_per_sec": items / p50 if p50 > 0 else 0.0,
+        # ru_maxrss는 프로세스 전체 최대값이므로 단계 순서대로 누적됨
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    print(f"{name:18}{result['p50_ms']:>12.1f}{result['p95_ms']:>12.1f}"
+          f"{result['items_per_sec']:>14.1f}{result['peak_rss_mb']:>12.1f}")
+    return result
+
+
+def compare_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """기준선 대비 악화된 항목 목록을 반환합니다.
+
+    단계별 p50 지연과 최대 RSS가 기준선의 ``1 + tolerance`` 배를 넘으면
+    악화로 판단합니다. 지연 차이가 ``MIN_REGRESSION_MS`` 미만이면 잡음으로
+    보고, 기준선에 없는 단계는 비교하지 않습니다.
+    """
+    regressions = []
+    for name, current in report["stages"].items():
+        previous = baseline.get("stages", {}).get(name)
+        if not previous:
+            continue
+        for key in ("p50_ms", "peak_rss_mb"):
+            limit = previous[key] * (1.0 + tolerance)
+            if key == "p50_ms":
+                limit = max(limit, previous[key] + MIN_REGRESSION_MS)
+            if current[key] > limit:
+                regressions.append(f"{name}.{key}: {current[key]:.1f} > {limit:.1f} "
+                                   f"(기준선 {previous[key]:.1f})")
+    return regressions
+
+
+def run_benchmark(args: argparse.Namespace, workdir: Path) -> Dict[str, Any]:
+    """합성 데이터셋을 만들고 모든 단계를 측정합니다."""
+    from modules.deeppcb_loader import DeepPCBLoader
+    from modules.inference import run_inference
+    from modules.visualizer import visualize
+
+    dataset_root = make_dataset(workdir / "DeepPCB", args.images, args.image_size, args.seed)
+    image_dir = workdir / "images"
+    image_dir.mkdir()
+    for path in sorted((dataset_root / "PCBData").rglob("*_test.jpg")):
+        shutil.copy2(path, image_dir / path.name)
+
+    stages: Dict[str, Dict[str, Any]] = {}
+    measure = dict(repeat=args.repeat, warmup=args.warmup)
+    print(f"{'단계':18}{'p50 (ms)':>12}{'p95 (ms)':>12}{'items/s':>14}{'RSS (MB)':>12}")
+
+    images = load_images(str(image_dir))
+    stages["load_images"] = time_stage("load_images", lambda: load_images(str(image_dir)),
+                                       len(images), **measure)
+
+    def preprocess_all() -> None:
+        batch = None
+        for start in range(0, len(images), args.batch_size):
+            decoded = [load_single_image(path) for path in images[start:start + args.batch_size]]
+            batch = preprocess(decoded, args.imgsz, batch)
+
+    stages["preprocess"] = time_stage("preprocess", preprocess_all, len(images), **measure)
+
+    if args.model:
+        from modules.model_loader import load_model
+
+        model = load_model(args.model, device=args.device, backend=args.backend, imgsz=args.imgsz)
+
+        def infer_all() -> List[Detections]:
+            return list(run_inference(model, images, batch_size=args.batch_size,
+                                      confidence=args.confidence, imgsz=args.imgsz))
+
+        stages["run_inference"] = time_stage("run_inference", infer_all, len(images), **measure)
+        results = infer_all()
+    else:
+        logger.info("--model 이 없어 run_inference 단계를 건너뛰고 합성 검출 결과를 사용합니다.")
+        results = synthetic_detections(images, args.image_size, args.seed)
+
+    stages["summarize"] = time_stage("summarize", lambda: summarize(results), len(results), **measure)
+    summarized = summarize(results)
+
+    vis_dir = workdir / "vis"
+    vis_dir.mkdir()
+    stages["visualize"] = time_stage("visualize", lambda: visualize(summarized, str(vis_dir), mode="all"),
+                                     summarized.num_images, **measure)
+
+    loader = DeepPCBLoader(str(dataset_root))
+    prepared = workdir / "prepared"
+
+    def prepare() -> None:
+        shutil.rmtree(prepared, ignore_errors=True)
+        loader.prepare_dataset(str(prepared), workers=1, incremental=False)
+
+    stages["prepare_dataset"] = time_stage("prepare_dataset", prepare, args.images, **measure)
+
+    return {
+        "config": {
+            "images": args.images,
+            "image_size": args.image_size,
+            "imgsz": args.imgsz,
+            "batch_size": args.batch_size,
+            "model": args.model,
+            "backend": args.backend,
+            "device": args.device,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "platform": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "stages": stages,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LiteAOI 파이프라인 벤치마크")
+    parser.add_argument("--model", default=None, help="추론 모델 경로 (생략하면 run_inference 단계 제외)")
+    parser.add_argument("--backend", default="auto", help="추론 백엔드 (기본값: auto)")
+    parser.add_argument("--device", default="cpu", help="추론 장치 (기본값: cpu)")
+    parser.add_argument("--images", type=int, default=DEFAULT_NUM_IMAGES, help="합성 이미지 수")
+    parser.add_argument("--image-size", type=int, default=DEFAULT_IMAGE_SIZE, help="합성 이미지 한 변의 길이")
+    parser.add_argument("--imgsz", type=int, default=640, help="레터박스 입력 크기")
+    parser.add_argument("--batch-size", type=int, default=8, help="배치 크기")
+    parser.add_argument("--confidence", type=float, default=0.25, help="신뢰도 임계값")
+    parser.add_argument("--repeat", type=int, default=5, help="단계별 측정 반복 횟수 (기본값: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="단계별 워밍업 횟수 (기본값: 1)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="합성 데이터 시드")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 기준선 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="기준선 대비 허용 악화 비율 (기본값: 0.2)")
+    parser.add_argument("--workdir", help="합성 데이터를 만들 디렉터리 (기본값: 임시 디렉터리)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.workdir:
+        workdir = Path(args.workdir)
+        shutil.rmtree(workdir, ignore_errors=True)
+        workdir.mkdir(parents=True)
+        report = run_benchmark(args, workdir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="liteaoi_bench_") as tmp:
+            report = run_benchmark(args, Path(tmp))
+
+    print(f"최대 RSS: {report['peak_rss_mb']:.1f} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline: Optional[Dict[str, Any]] = json.load(f)
+        if baseline.get("config") != report["config"]:
+            logger.warning("기준선과 벤치마크 설정이 다릅니다. 비교 결과를 주의해서 해석하세요.")
+        regressions = compare_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"실패: 기준선 대비 {args.tolerance:.0%} 넘게 악화된 항목")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"통과: 기준선 대비 {args.tolerance:.0%} 이내")
+
+
+if __name__ == "__main__":
+    main()
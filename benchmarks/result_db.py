@@ -0,0 +1,109 @@
+"""검사 결과 SQLite 기록/조회 처리량 벤치마크.
+
+합성 검출 결과를 추론 배치 크기 단위로 ``ResultDatabase`` 에 기록하여 초당
+기록 이미지/결함 수를 측정하고, 누적된 데이터에서 대표 조회(로트별 클래스
+집계, 보드 이력, 클래스/신뢰도 필터) 지연을 측정합니다. 기록 처리량이
+``--target`` (추론 엔진 처리량, images/s)보다 낮으면 종료 코드 1을 반환합니다.
+
+사용 예::
+
+    python benchmarks/result_db.py --images 100000 --batch-size 8 --target 500
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.postprocessor import Detections  # noqa: E402
+from modules.result_db import ResultDatabase  # noqa: E402
+
+
+def synthetic_results(num_images: int, mean_defects: float, seed: int):
+    """로트 100장 단위의 합성 결과를 만듭니다 (보드의 절반 정도는 결함 없음)."""
+    rng = np.random.default_rng(seed)
+    for index in range(num_images):
+        n = int(rng.poisson(mean_defects)) if rng.random() < 0.5 else 0
+        xy = rng.uniform(0, 600, size=(n, 2))
+        yield f"LOT-{index // 100:05d}", Detections(
+            path=f"/data/lots/{index // 100:05d}/board_{index:07d}.jpg",
+            xyxy=np.concatenate([xy, xy + rng.uniform(5, 40, size=(n, 2))], axis=1).astype(np.float32),
+            conf=rng.uniform(0.25, 1.0, size=n).astype(np.float32),
+            cls=rng.integers(0, 6, size=n),
+            orig_shape=(640, 640),
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="검사 결과 DB 벤치마크")
+    parser.add_argument("--images", type=int, default=20000, help="기록할 합성 이미지 수")
+    parser.add_argument("--mean-defects", type=float, default=4.0, help="결함 보드의 평균 결함 수")
+    parser.add_argument("--batch-size", type=int, default=8, help="트랜잭션당 이미지 수 (추론 배치 크기)")
+    parser.add_argument("--target", type=float, default=0.0, help="요구 기록 처리량 (images/s, 0이면 검사 안 함)")
+    parser.add_argument("--db", help="데이터베이스 경로 (기본값: 임시 파일)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 시드")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="liteaoi_db_") as tmp:
+        db_path = args.db or str(Path(tmp) / "inspections.db")
+        db = ResultDatabase(db_path, names={i: f"class{i}" for i in range(6)})
+        run_id = db.start_run(model="synthetic")
+
+        # 합성 데이터 생성 시간은 측정에서 제외
+        items = list(synthetic_results(args.images, args.mean_defects, args.seed))
+        started = time.perf_counter()
+        for start in range(0, len(items), args.batch_size):
+            chunk = items[start:start + args.batch_size]
+            db.insert([det for _, det in chunk], run_id, lot=chunk[0][0])
+        elapsed = time.perf_counter() - started
+        detections = db.detections
+
+        queries = {
+            "defect_counts(lot)": lambda: db.defect_counts(lot="LOT-00010"),
+            "defect_counts(all)": lambda: db.defect_counts(),
+            "board_history": lambda: db.board_history("board_0001234"),
+            "find_detections(cls, conf)": lambda: db.find_detections(cls=3, min_conf=0.9, limit=100),
+        }
+        query_ms = {}
+        for name, query in queries.items():
+            timings = []
+            for _ in range(5):
+                t = time.perf_counter()
+                query()
+                timings.append(time.perf_counter() - t)
+            query_ms[name] = float(np.median(timings)) * 1000.0
+        db.close()
+        size_mb = sum(p.stat().st_size for p in Path(db_path).parent.glob(Path(db_path).name + "*")) / 1e6
+
+    report = {
+        "images": args.images,
+        "detections": detections,
+        "batch_size": args.batch_size,
+        "images_per_sec": args.images / elapsed,
+        "detections_per_sec": detections / elapsed,
+        "db_size_mb": size_mb,
+        "query_ms": query_ms,
+    }
+    print(f"기록: {args.images}개 이미지, {detections}개 결함, {elapsed:.2f}s "
+          f"({report['images_per_sec']:.0f} images/s, {report['detections_per_sec']:.0f} rows/s), "
+          f"DB {size_mb:.1f} MB")
+    for name, ms in query_ms.items():
+        print(f"  {name:28}{ms:>10.2f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.target and report["images_per_sec"] < args.target:
+        print(f"실패: 기록 처리량이 목표({args.target:.0f} images/s)보다 낮습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
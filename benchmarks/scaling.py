@@ -0,0 +1,65 @@
+"""샤딩 추론 워커 수별 처리량 확장 벤치마크.
+
+같은 이미지 집합을 워커 수를 늘려 가며 추론하고, 처리량과 1워커 대비 속도
+향상/효율을 표와 JSON으로 보고합니다.
+
+사용 예::
+
+    python benchmarks/scaling.py --model ./models/deeppcb_best.onnx --input ./test_images --workers 1 2 4 8
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.data_loader import load_images  # noqa: E402
+from modules.sharding import scaling_report  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="샤딩 추론 확장 벤치마크")
+    parser.add_argument("--model", required=True, help="모델 경로")
+    parser.add_argument("--input", required=True, help="이미지 디렉터리")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="측정할 워커 수 목록")
+    parser.add_argument("--threads-per-worker", type=int, default=None, help="워커당 연산 스레드 수")
+    parser.add_argument("--batch-size", type=int, default=8, help="배치 크기")
+    parser.add_argument("--imgsz", type=int, default=640, help="입력 크기")
+    parser.add_argument("--limit", type=int, default=0, help="사용할 최대 이미지 수 (0이면 전체)")
+    parser.add_argument("--backend", default="auto", help="추론 백엔드")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    images = load_images(args.input)
+    if args.limit:
+        images = images[:args.limit]
+
+    rows = scaling_report(
+        args.model,
+        images,
+        args.workers,
+        threads_per_worker=args.threads_per_worker,
+        batch_size=args.batch_size,
+        imgsz=args.imgsz,
+        backend=args.backend,
+    )
+
+    print(f"\n{'workers':>8}{'threads':>9}{'images/s':>12}{'speedup':>10}{'efficiency':>12}")
+    for row in rows:
+        print(f"{row['workers']:>8}{row['threads_per_worker']:>9}{row['images_per_sec']:>12.2f}"
+              f"{row['speedup']:>9.2f}x{row['efficiency']:>11.0%}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"images": len(images), "results": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""CLI 진입점 콜드 스타트 시간 벤치마크.
+
+각 진입점을 새 인터프리터에서 ``--help`` 로 여러 번 실행해 중앙값 시간을
+측정하고, 모듈 임포트만으로 무거운 의존성(torch, ultralytics, cv2, onnxruntime)이
+로드되지 않는지 확인합니다. 예산을 넘거나 무거운 의존성이 로드되면 종료 코드
+1을 반환합니다.
+
+사용 예::
+
+    python benchmarks/startup.py --budget 1.0 --repeat 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# --help 로 측정할 CLI 진입점
+ENTRY_POINTS = ["infer.py", "prepare_deeppcb.py", "quantize.py", "serve.py", "yolo_train.py"]
+
+# 임포트만으로 로드되면 안 되는 모듈과 검사 대상 모듈
+HEAVY_MODULES = ["torch", "ultralytics", "cv2", "onnxruntime", "onnx"]
+IMPORT_TARGETS = [
+    "infer", "prepare_deeppcb", "quantize", "serve", "yolo_train", "test",
+    "modules.model_loader", "modules.data_loader", "modules.preprocessor",
+    "modules.inference", "modules.postprocessor", "modules.deeppcb_loader", "modules.dataset_stats",
+    "modules.metrics", "modules.quantizer", "modules.server", "modules.sharding", "modules.watcher", "modules.trainer",
+    "modules.train_cache", "modules.visualizer", "modules.crop_store", "modules.result_db",
+]
+
+
+def time_command(args: list, repeat: int) -> float:
+    """명령을 ``repeat`` 번 실행하여 중앙값 실행 시간(초)을 반환합니다."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = subprocess.run(args, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, text=True)
+        timings.append(time.perf_counter() - started)
+        if completed.returncode != 0:
+            raise RuntimeError(f"{' '.join(args)} 실패 (code {completed.returncode}): {completed.stderr.strip()}")
+    return statistics.median(timings)
+
+
+def heavy_imports(module: str) -> list:
+    """모듈을 새 인터프리터에서 임포트한 뒤 로드된 무거운 의존성 목록을 반환합니다."""
+    code = (
+        "import importlib, json, sys\n"
+        f"importlib.import_module({module!r})\n"
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{module} 임포트 실패: {completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CLI 콜드 스타트 벤치마크")
+    parser.add_argument("--budget", type=float, default=1.0, help="진입점별 허용 시간 (초, 기본값: 1.0)")
+    parser.add_argument("--repeat", type=int, default=5, help="진입점별 반복 횟수 (기본값: 5)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    # 파이썬 인터프리터 자체의 시작 시간 (기준선)
+    baseline = time_command([sys.executable, "-c", "pass"], args.repeat)
+    report = {"budget": args.budget, "interpreter": baseline, "entry_points": {}, "heavy_imports": {}}
+    failed = False
+
+    print(f"인터프리터 기준선: {baseline * 1000:.0f} ms")
+    print(f"{'진입점':24}{'median (ms)':>14}  결과")
+    for entry in ENTRY_POINTS:
+        elapsed = time_command([sys.executable, entry, "--help"], args.repeat)
+        ok = elapsed <= args.budget
+        failed |= not ok
+        report["entry_points"][entry] = elapsed
+        print(f"{entry + ' --help':24}{elapsed * 1000:>14.0f}  {'OK' if ok else '예산 초과'}")
+
+    for module in IMPORT_TARGETS:
+        loaded = heavy_imports(module)
+        report["heavy_imports"][module] = loaded
+        if loaded:
+            failed = True
+            print(f"import {module}: 무거운 의존성 로드됨 {loaded}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if failed:
+        print("실패: 콜드 스타트 예산을 초과했거나 임포트 시점에 무거운 의존성이 로드됩니다.")
+        sys.exit(1)
+    print("통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""학습 이미지 샤드/라벨 캐시 검증 벤치마크.
+
+데이터로더가 이미지 한 장을 얻는 비용을 JPEG 디코딩+축소(Ultralytics 기본
+``load_image`` 와 같은 계산)와 메모리 매핑 샤드 읽기(복사 포함)로 비교하고,
+샤드 생성 시간과 ``labels.cache`` 검증용 지문 계산 시간을 측정합니다.
+``--dataset`` 을 생략하면 고정 시드 합성 데이터셋을 임시 폴더에 만듭니다.
+
+사용 예::
+
+    python benchmarks/train_cache.py --dataset ./datasets/deeppcb --imgsz 640
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.train_cache import ImageShard, dataset_fingerprint, resized_shape  # noqa: E402
+
+
+def make_dataset(root: Path, num_images: int, image_size: int, seed: int) -> Path:
+    """``images/train`` 에 배선 패턴 JPEG, ``labels/train`` 에 라벨을 만듭니다."""
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    (root / "images" / "train").mkdir(parents=True)
+    (root / "labels" / "train").mkdir(parents=True)
+    for index in range(num_images):
+        image = np.full((image_size, image_size), 200, dtype=np.uint8)
+        for _ in range(int(rng.integers(20, 60))):
+            x, y = rng.integers(0, image_size - 40, size=2)
+            w, h = rng.integers(4, 40, size=2)
+            image[y:y + h, x:x + w] = 40
+        cv2.imwrite(str(root / "images" / "train" / f"{index:06d}.jpg"), image)
+        (root / "labels" / "train" / f"{index:06d}.txt").write_text("0 0.5 0.5 0.1 0.1\n")
+    return root
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="학습 이미지 샤드 벤치마크")
+    parser.add_argument("--dataset", help="준비된 데이터셋 폴더 (생략하면 합성 데이터셋)")
+    parser.add_argument("--split", default="train", help="측정할 분할")
+    parser.add_argument("--imgsz", type=int, default=640, help="학습 입력 크기")
+    parser.add_argument("--images", type=int, default=200, help="합성 이미지 수")
+    parser.add_argument("--image-size", type=int, default=1024, help="합성 이미지 한 변의 길이")
+    parser.add_argument("--workers", type=int, default=4, help="샤드 생성 스레드 수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    import cv2
+
+    with tempfile.TemporaryDirectory(prefix="liteaoi_shard_") as tmp:
+        dataset = Path(args.dataset) if args.dataset else make_dataset(
+            Path(tmp) / "dataset", args.images, args.image_size, seed=0)
+        if args.dataset:
+            # 기존 데이터셋의 샤드를 덮어쓰지 않도록 임시 폴더에 샤드를 만듦
+            shard_root = Path(tmp) / "dataset"
+            (shard_root / "images").mkdir(parents=True)
+            (shard_root / "images" / args.split).symlink_to((dataset / "images" / args.split).resolve())
+        else:
+            shard_root = dataset
+
+        started = time.perf_counter()
+        fingerprint, num_files = dataset_fingerprint(dataset)
+        fingerprint_sec = time.perf_counter() - started
+
+        started = time.perf_counter()
+        shard = ImageShard.build(shard_root, args.split, args.imgsz, args.workers)
+        build_sec = time.perf_counter() - started
+        files = [shard_root / "images" / args.split / name for name in shard.names.tolist()]
+
+        started = time.perf_counter()
+        for path in files:
+            image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+            h, w = resized_shape(*image.shape[:2], args.imgsz)
+            if image.shape[:2] != (h, w):
+                cv2.resize(image, (w, h), interpolation=cv2.INTER_LINEAR)
+        decode_sec = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for path in files:
+            np.array(shard.get(path)[0])
+        shard_sec = time.perf_counter() - started
+        shard_mb = shard.offsets[-1] / 1e6
+
+    report = {
+        "images": len(files),
+        "imgsz": args.imgsz,
+        "fingerprint_files": num_files,
+        "fingerprint_ms": fingerprint_sec * 1000.0,
+        "shard_build_sec": build_sec,
+        "shard_mb": shard_mb,
+        "decode_ms_per_image": decode_sec / len(files) * 1000.0,
+        "shard_ms_per_image": shard_sec / len(files) * 1000.0,
+        "speedup": decode_sec / shard_sec,
+    }
+    print(f"{len(files)}개 이미지, imgsz {args.imgsz}, 샤드 {shard_mb:.1f} MB (생성 {build_sec:.2f}s)")
+    print(f"  지문 계산: {num_files}개 파일 {report['fingerprint_ms']:.1f} ms")
+    print(f"  JPEG 디코딩+축소: {report['decode_ms_per_image']:.3f} ms/image")
+    print(f"  샤드 읽기:        {report['shard_ms_per_image']:.3f} ms/image ({report['speedup']:.1f}x)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
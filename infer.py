@@ -2,14 +2,9 @@
 import argparse
 import logging
 import sys
+from itertools import chain
 from pathlib import Path
 import yaml
-from modules.model_loader import load_model
-from modules.data_loader import load_images
-from modules.preprocessor import preprocess
-from modules.inference import run_inference
-from modules.postprocessor import summarize
-from modules.visualizer import visualize
 
 # 로깅 설정
 logging.basicConfig(
@@ -43,8 +38,12 @@ def load_config(config_path: str) -> dict:
 
 
 def validate_paths(input_dir: str, model_path: str) -> bool:
-    """입력 경로들을 검증합니다."""
-    if not Path(input_dir).exists():
+    """입력 경로들을 검증합니다.
+
+    이미지 파일 존재 여부는 ``load_images`` 가 디렉터리를 훑을 때 함께 확인하므로
+    여기서는 디렉터리를 다시 읽지 않습니다.
+    """
+    if not Path(input_dir).is_dir():
         logger.error(f"입력 디렉터리를 찾을 수 없습니다: {input_dir}")
         return False
         
@@ -52,41 +51,52 @@ def validate_paths(input_dir: str, model_path: str) -> bool:
         logger.error(f"모델 파일을 찾을 수 없습니다: {model_path}")
         return False
         
-    # 입력 디렉터리에 이미지 파일이 있는지 확인
-    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}
-    image_files = [f for f in Path(input_dir).iterdir() 
-                   if f.is_file() and f.suffix.lower() in image_extensions]
-    
-    if not image_files:
-        logger.error(f"입력 디렉터리에 이미지 파일이 없습니다: {input_dir}")
-        return False
-        
-    logger.info(f"발견된 이미지 파일 수: {len(image_files)}")
     return True
 
 
 def main() -> None:
     """추론을 실행합니다."""
+    metrics = None
+    metrics_paths = {}
+    result_db = None
     try:
         parser = argparse.ArgumentParser(description="LiteAOI 추론 스크립트")
         parser.add_argument("--input", type=str, help="입력 이미지 디렉터리")
         parser.add_argument("--model", type=str, help="모델 파일 경로")
+        parser.add_argument("--backend", type=str, help="추론 백엔드 (auto/torch/onnxruntime/openvino)")
         parser.add_argument("--config", default="config.yaml", help="설정 파일 경로")
         parser.add_argument("--save", default=None, help="결과 저장 폴더")
         parser.add_argument("--confidence", type=float, default=None, help="신뢰도 임계값")
+        parser.add_argument("--tiled", action="store_true", help="대형 패널 타일 추론 사용")
+        parser.add_argument("--recursive", action="store_true", help="하위 디렉터리 이미지까지 탐색")
+        parser.add_argument("--watch", action="store_true", help="입력 폴더를 감시하며 새 이미지를 계속 추론")
+        parser.add_argument("--workers", type=int, default=None, help="추론 워커 프로세스 수 (2 이상이면 샤딩 추론)")
+        parser.add_argument("--metrics", action="store_true", help="단계별 시간/처리 수 지표 기록")
+        parser.add_argument("--lot", default=None, help="결과 DB에 기록할 로트 이름 (기본값: 입력 디렉터리 이름)")
         args = parser.parse_args()
 
         # 설정 로드
         config = load_config(args.config)
         inference_config = config.get("inference", {})
         model_config = config.get("model", {})
+        metrics_config = config.get("metrics", {}) or {}
 
         # 기본값 설정
         input_dir = args.input or inference_config.get("input_dir", "./test_images")
         model_path = args.model or model_config.get("output", "./models/mymodel_v1.pt")
         save_dir = args.save or inference_config.get("output_dir", "./results")
+        metrics_paths = {
+            "prometheus_path": metrics_config.get("prometheus") or str(Path(save_dir) / "metrics.prom"),
+            "json_path": metrics_config.get("json") or str(Path(save_dir) / "metrics.json"),
+        }
         confidence = args.confidence or inference_config.get("confidence", 0.5)
         device = model_config.get("device", "cuda")
+        backend = args.backend or model_config.get("backend", "auto")
+        tiling_config = inference_config.get("tiling", {}) or {}
+        tiled = args.tiled or tiling_config.get("enabled", False)
+        sharding_config = inference_config.get("sharding", {}) or {}
+        shard_workers = args.workers or sharding_config.get("workers", 1)
+        sharded = shard_workers > 1 and not tiled and not args.watch
 
         logger.info("=== LiteAOI 추론 시작 ===")
         logger.info(f"입력 디렉터리: {input_dir}")
@@ -94,6 +104,12 @@ def main() -> None:
         logger.info(f"결과 저장: {save_dir}")
         logger.info(f"신뢰도 임계값: {confidence}")
         logger.info(f"장치: {device}")
+        logger.info(f"백엔드: {backend}")
+        if sharded:
+            logger.info(f"샤딩 추론: 워커 프로세스 {shard_workers}개")
+        if tiled:
+            logger.info(f"타일 추론: tile_size={tiling_config.get('tile_size', 640)}, "
+                        f"overlap={tiling_config.get('overlap', 0.2)}")
 
         # 경로 검증
         if not validate_paths(input_dir, model_path):
@@ -102,25 +118,232 @@ def main() -> None:
         # 결과 저장 디렉터리 생성
         Path(save_dir).mkdir(parents=True, exist_ok=True)
 
-        # 추론 파이프라인 실행
-        logger.info("모델 로딩...")
-        model = load_model(model_path, device=device)
+        # 파이프라인 모듈(NumPy/OpenCV/모델 백엔드)은 인자와 경로 검증이 끝난 뒤 로드
+        from modules.model_loader import load_model
+        from modules.data_loader import DecodedImageCache, load_images, validate_image_batch
+        from modules.preprocessor import prefilter, evaluate_prefilter
+        from modules.inference import run_inference, run_tiled_inference
+        from modules.postprocessor import summarize
+        from modules.visualizer import AsyncVisualizer
+        from modules.metrics import Metrics, TimedIterator
+
+        metrics = Metrics(enabled=args.metrics or metrics_config.get("enabled", False))
+
+        # 추론 파이프라인 실행 (샤딩 모드에서는 각 워커가 모델을 로드)
+        model = None
+        if not sharded:
+            logger.info("모델 로딩...")
+            with metrics.stage("load_model"):
+                model = load_model(
+                    model_path,
+                    device=device,
+                    backend=backend,
+                    imgsz=inference_config.get("imgsz", 640),
+                    intra_op_threads=model_config.get("intra_op_threads"),
+                )
+
+        image_cache = None
+        cache_config = inference_config.get("cache", {}) or {}
+        if cache_config.get("enabled", False):
+            image_cache = DecodedImageCache(
+                memory_bytes=int(cache_config.get("memory_mb", 1024) * 1024 ** 2),
+                disk_dir=cache_config.get("disk_dir") or None,
+                disk_bytes=int(cache_config.get("disk_mb", 20480) * 1024 ** 2),
+            )
+
+        # 시각화는 추론과 겹쳐 백그라운드 워커에서 렌더링/인코딩
+        visualizer = None
+        if inference_config.get("visualize", True):
+            vis_config = inference_config.get("visualization", {}) or {}
+            visualizer = AsyncVisualizer(
+                save_dir,
+                mode=vis_config.get("mode", "defects"),
+                jpeg_quality=vis_config.get("jpeg_quality", 90),
+                scale=vis_config.get("scale", 1.0),
+                num_workers=vis_config.get("num_workers", 2),
+                max_queue=vis_config.get("max_queue", 32),
+                names=getattr(model, "names", None) or config.get("classes", {}).get("names"),
+                cache=image_cache,
+                crop_padding=vis_config.get("crop_padding", 16),
+            )
+
+        # 검사 결과 DB는 추론 배치 단위로 기록
+        run_id = None
+        database_config = inference_config.get("database", {}) or {}
+        lot = args.lot or database_config.get("lot") or Path(input_dir).resolve().name
+        if database_config.get("enabled", False):
+            from modules.result_db import ResultDatabase
+
+            result_db = ResultDatabase(
+                database_config.get("path", "./results/inspections.db"),
+                names=getattr(model, "names", None) or config.get("classes", {}).get("names"),
+            )
+            run_id = result_db.start_run(lot=lot, model=str(model_path), input_dir=str(input_dir))
+            logger.info(f"결과 DB: {result_db.db_path} (로트 {lot})")
+
+        if args.watch:
+            # 핫 폴더 감시: 모델을 상주시킨 채 새 파일만 추론하고 결과를 JSONL에 덧붙임
+            from modules.watcher import watch_and_infer
+
+            watch_config = inference_config.get("watch", {}) or {}
+            results_path = Path(save_dir) / watch_config.get("results_file", "results.jsonl")
+            logger.info(f"폴더 감시 모드: {input_dir} -> {results_path} (Ctrl+C로 종료)")
+            metrics.start_flusher(metrics_config.get("flush_interval", 15), **metrics_paths)
+            try:
+                watch_and_infer(
+                    model,
+                    input_dir,
+                    str(results_path),
+                    mode=watch_config.get("mode", "auto"),
+                    poll_interval=watch_config.get("poll_interval", 0.5),
+                    settle_seconds=watch_config.get("settle_seconds", 1.0),
+                    max_batch=inference_config.get("batch_size", 8),
+                    max_wait_ms=watch_config.get("max_wait_ms", 50),
+                    num_workers=inference_config.get("num_workers", 4),
+                    imgsz=inference_config.get("imgsz", 640),
+                    confidence=confidence,
+                    report_every=watch_config.get("report_every", 100),
+                    cache=image_cache,
+                    metrics=metrics,
+                    visualizer=visualizer,
+                    result_db=result_db,
+                    run_id=run_id,
+                    lot=lot,
+                )
+            except KeyboardInterrupt:
+                pass
+            finally:
+                if visualizer is not None:
+                    visualizer.close()
+                if result_db is not None:
+                    result_db.close()
+                metrics.stop_flusher()
+            logger.info("=== 폴더 감시 종료 ===")
+            return
         
         logger.info("이미지 로딩...")
-        images = load_images(input_dir)
+        with metrics.stage("load_images"):
+            images = load_images(
+                input_dir,
+                recursive=args.recursive or inference_config.get("recursive", False),
+                stream=inference_config.get("stream_discovery", False),
+            )
+        
+        validation_config = inference_config.get("validation", {}) or {}
+        if validation_config.get("enabled", False):
+            logger.info("이미지 검증...")
+            cache_path = Path(save_dir) / "validation_cache.json" if validation_config.get("cache", True) else None
+            with metrics.stage("validate"):
+                images, invalid = validate_image_batch(
+                    list(images),
+                    mode=validation_config.get("mode", "header"),
+                    check_truncation=validation_config.get("check_truncation", True),
+                    num_workers=inference_config.get("num_workers", 4),
+                    cache_path=str(cache_path) if cache_path else None,
+                )
+            metrics.inc("images_skipped_total", len(invalid), reason="invalid")
         
-        logger.info("이미지 전처리...")
-        processed = preprocess(images)
+        # 레터박스 전처리는 추론 엔진의 디코딩 스레드에서 미리 할당된 배치 버퍼로 수행
+        imgsz = inference_config.get("imgsz", 640) if inference_config.get("letterbox", True) else None
+        if imgsz:
+            logger.info(f"이미지 전처리: 레터박스 {imgsz}x{imgsz} (배치 버퍼 재사용)")
+        processed = images
+
+        clean = []
+        prefilter_config = inference_config.get("prefilter", {}) or {}
+        if prefilter_config.get("enabled", False):
+            logger.info("템플릿 프리필터...")
+            processed = list(processed)
+            with metrics.stage("prefilter"):
+                candidates, clean = prefilter(
+                    processed,
+                    min_blob_area=prefilter_config.get("min_blob_area", 20),
+                    diff_threshold=prefilter_config.get("diff_threshold", 40),
+                    num_workers=inference_config.get("num_workers", 4),
+                    cache=image_cache,
+                )
+            metrics.inc("images_skipped_total", len(clean), reason="prefilter")
+            if prefilter_config.get("evaluate", False):
+                evaluate_prefilter(processed, [d.path for d in clean])
+            processed = candidates
         
         logger.info("추론 실행...")
-        results = run_inference(model, processed)
+        if tiled:
+            results = run_tiled_inference(
+                model,
+                processed,
+                tile_size=tiling_config.get("tile_size", 640),
+                overlap=tiling_config.get("overlap", 0.2),
+                batch_size=inference_config.get("batch_size", 8),
+                confidence=confidence,
+                cache=image_cache,
+                metrics=metrics,
+                with_images=visualizer is not None,
+            )
+        elif sharded:
+            from modules.sharding import run_sharded_inference
+
+            results = run_sharded_inference(
+                model_path,
+                processed,
+                workers=shard_workers,
+                threads_per_worker=sharding_config.get("threads_per_worker"),
+                batch_size=inference_config.get("batch_size", 8),
+                num_workers=inference_config.get("num_workers", 4),
+                imgsz=inference_config.get("imgsz", 640),
+                confidence=confidence,
+                cache=image_cache,
+                metrics=metrics,
+                with_images=visualizer is not None,
+                device=device,
+                backend=backend,
+            )
+        else:
+            results = run_inference(
+                model,
+                processed,
+                batch_size=inference_config.get("batch_size", 8),
+                prefetch=inference_config.get("prefetch", 2),
+                num_workers=inference_config.get("num_workers", 4),
+                confidence=confidence,
+                cache=image_cache,
+                imgsz=imgsz,
+                metrics=metrics,
+                with_images=visualizer is not None,
+            )
         
         logger.info("결과 후처리...")
-        summarized = summarize(results)
+        # 추론 결과는 제너레이터이므로 요약이 소비하는 동안 디코딩/추론이 진행됨.
+        # 결과를 꺼내는 시간은 inference, 나머지(시각화 큐, DB 기록, 병합/요약)는 summarize로 기록
+        produced = TimedIterator(chain(results, clean))
+        results = produced
+        if visualizer is not None:
+            results = visualizer.tap(results)
+        if result_db is not None:
+            results = result_db.tap(results, run_id, lot, batch_size=inference_config.get("batch_size", 8))
+        try:
+            with metrics.stage("summarize", exclude=produced):
+                summarized = summarize(results, merge_threshold=tiling_config.get("merge_threshold", 0.5))
+        finally:
+            metrics.observe("stage_seconds", produced.seconds, stage="inference")
+        logger.info(f"검출 결과: 이미지 {summarized.num_images}개, 결함 {len(summarized)}개")
+        if image_cache is not None:
+            logger.info(f"이미지 캐시: {image_cache.stats()}")
+        if result_db is not None:
+            result_db.close()
+
+        export_format = inference_config.get("export", "npz")
+        with metrics.stage("export"):
+            if export_format == "parquet":
+                summarized.to_parquet(Path(save_dir) / "detections.parquet")
+            elif export_format == "npz":
+                summarized.to_npz(Path(save_dir) / "detections.npz")
         
-        if inference_config.get("visualize", True):
-            logger.info("결과 시각화...")
-            visualize(summarized, save_dir)
+        if visualizer is not None:
+            # 남은 렌더링 작업만 기다림 (대부분은 추론 중에 끝남)
+            logger.info("결과 시각화 마무리...")
+            with metrics.stage("visualize"):
+                visualizer.close()
         
         logger.info("=== 추론 완료 ===")
         
@@ -130,6 +353,13 @@ def main() -> None:
     except Exception as e:
         logger.error(f"추론 중 예상치 못한 오류가 발생했습니다: {e}")
         sys.exit(1)
+    finally:
+        # 예외로 끝나도 결과 DB 연결은 닫음 (정상 경로에서는 이미 닫혀 있음)
+        if result_db is not None:
+            result_db.close()
+        # 실패한 실행도 어디까지 진행됐는지 남도록 항상 기록
+        if metrics is not None:
+            metrics.write(**metrics_paths)
 
 
 if __name__ == "__main__":
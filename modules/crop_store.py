@@ -0,0 +1,248 @@
+"""결함 크롭 내용 주소(content-addressed) 저장소 모듈.
+
+검출된 결함 영역을 여백과 함께 잘라 픽셀 내용의 해시를 이름으로 저장합니다.
+같은 크롭(예: 재검사로 다시 들어온 보드)은 해시가 같으므로 인코딩/쓰기 없이
+기존 객체를 가리키기만 합니다. 보드 경로와 검출 번호로 크롭을 찾을 수 있도록
+``index.jsonl`` 에 보드마다 한 줄씩 기록하여, 리뷰 화면이 디렉터리를 훑지 않고 바로
+열 수 있게 합니다. 같은 보드가 다시 기록되면 그 보드의 크롭 목록 전체를 마지막
+기록으로 바꾸므로, 재검사에서 검출이 줄거나 없어진 보드의 예전 크롭은 더 이상
+찾아지지 않습니다. 색인은 열 때 한 번 읽어 메모리에 두며, 대체된 줄이 살아 있는
+보드보다 많아지면 열거나 닫을 때 색인 파일을 다시 씁니다.
+
+저장 구조::
+
+    crops/
+    ├── index.jsonl                 # {"board", "crops": [{"det", "hash", "box", "cls", "conf"}, ...]} 보드마다 한 줄
+    └── objects/ab/abcdef....jpg    # 해시 앞 두 글자로 나눈 크롭 파일
+
+쓰기는 호출한 스레드에서 수행되므로 추론 스레드가 아닌 시각화 워커
+(``AsyncVisualizer``)에서 호출합니다.
+"""
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = 'index.jsonl'
+OBJECTS_DIR = 'objects'
+
+# 대체된 색인 줄이 이 수와 살아 있는 보드 수를 모두 넘으면 색인을 다시 씀
+COMPACT_MIN_STALE = 1000
+
+# 기본 설정 (config.yaml의 inference.visualization 섹션으로 덮어씀)
+DEFAULT_CROP_PADDING = 16
+DEFAULT_JPEG_QUALITY = 90
+
+
+def crop_hash(crop: np.ndarray) -> str:
+    """크롭 픽셀(모양, 자료형 포함)의 내용 해시를 반환합니다."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{crop.shape}{crop.dtype}".encode())
+    digest.update(np.ascontiguousarray(crop).data)
+    return digest.hexdigest()
+
+
+def crop_box(xyxy: Sequence[float], width: int, height: int, padding: int = DEFAULT_CROP_PADDING) -> List[int]:
+    """박스에 ``padding`` 픽셀 여백을 더해 이미지 안으로 자른 정수 좌표를 반환합니다."""
+    x1, y1, x2, y2 = xyxy
+    return [max(0, int(x1) - padding), max(0, int(y1) - padding),
+            min(width, int(np.ceil(x2)) + padding), min(height, int(np.ceil(y2)) + padding)]
+
+
+class CropStore:
+    """해시로 중복을 제거하는 결함 크롭 저장소.
+
+    Args:
+        root: 저장소 폴더
+        padding: 박스 주변 여백 (픽셀)
+        jpeg_quality: 크롭 JPEG 품질
+    """
+
+    def __init__(self, root: str, padding: int = DEFAULT_CROP_PADDING,
+                 jpeg_quality: int = DEFAULT_JPEG_QUALITY):
+        self.root = Path(root)
+        self.padding = int(padding)
+        self.jpeg_quality = int(jpeg_quality)
+        (self.root / OBJECTS_DIR).mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / INDEX_NAME
+
+        self._lock = threading.Lock()
+        # 보드 -> 검출 순서의 색인 항목, 색인에 기록된 크롭 해시
+        self._index: Dict[str, List[Dict[str, Any]]] = {}
+        self._known: Set[str] = set()
+        self._stale = 0
+        self._load_index()
+        if self._needs_compaction():
+            self._compact()
+        self._out = open(self.index_path, "a", encoding="utf-8")
+        self.stored = 0
+        self.deduplicated = 0
+        self.bytes = 0
+
+    def object_path(self, digest: str) -> Path:
+        """해시에 해당하는 크롭 파일 경로를 반환합니다."""
+        return self.root / OBJECTS_DIR / digest[:2] / f"{digest}.jpg"
+
+    def add(self, board: str, image: Optional[np.ndarray], xyxy: np.ndarray, conf: np.ndarray,
+            cls: np.ndarray) -> List[str]:
+        """보드 한 장의 검출 결과를 크롭하여 저장하고 검출 순서대로 해시 목록을 반환합니다.
+
+        색인에서 보드의 예전 크롭은 모두 이번 결과로 바뀝니다. 검출이 없는 보드도
+        호출하면 예전 크롭이 색인에서 지워집니다 (처음 보는 보드면 아무것도 쓰지 않음).
+
+        Args:
+            board: 보드 이미지 경로 (색인 키)
+            image: 디코딩된 원본 이미지 (읽기 전용이어도 됨, 크롭은 뷰로만 사용,
+                검출이 없으면 None이어도 됨)
+            xyxy: (N, 4) 원본 좌표 박스
+            conf: (N,) 신뢰도
+            cls: (N,) 클래스 ID
+
+        Returns:
+            검출별 크롭 해시 (빈 크롭은 빈 문자열)
+        """
+        import cv2
+
+        board = str(board)
+        if not len(xyxy):
+            self._replace(board, [])
+            return []
+        height, width = image.shape[:2]
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        records, digests = [], []
+        for det, (box, score, label) in enumerate(zip(np.asarray(xyxy, dtype=np.float32).tolist(),
+                                                      np.asarray(conf).tolist(),
+                                                      np.asarray(cls).astype(np.int64).tolist())):
+            left, top, right, bottom = crop_box(box, width, height, self.padding)
+            if right <= left or bottom <= top:
+                digests.append("")
+                continue
+            crop = image[top:bottom, left:right]
+            digest = crop_hash(crop)
+            with self._lock:
+                known = digest in self._known
+            if known:
+                with self._lock:
+                    self.deduplicated += 1
+            else:
+                size = self._write_object(digest, crop, params)
+                # 파일이 완성된 뒤에만 등록 (실패한 크롭을 중복으로 세지 않도록)
+                with self._lock:
+                    if digest in self._known:
+                        # 다른 스레드가 같은 크롭을 먼저 씀 (같은 내용으로 덮어씀)
+                        self.deduplicated += 1
+                    else:
+                        self._known.add(digest)
+                        self.stored += 1
+                        self.bytes += size
+            digests.append(digest)
+            records.append({"det": det, "hash": digest, "box": [left, top, right, bottom],
+                            "cls": label, "conf": round(score, 4)})
+
+        self._replace(board, records)
+        return digests
+
+    def _replace(self, board: str, records: List[Dict[str, Any]]) -> None:
+        """보드의 크롭 목록을 ``records`` 로 바꾸는 줄을 색인에 씁니다."""
+        line = json.dumps({"board": board, "crops": records}, ensure_ascii=False) + "\n"
+        with self._lock:
+            if not records and board not in self._index:
+                return
+            self._out.write(line)
+            self._add_record(board, records)
+
+    def _write_object(self, digest: str, crop: np.ndarray, params: List[int]) -> int:
+        """크롭을 JPEG로 인코딩하여 원자적으로 쓰고 바이트 수를 반환합니다."""
+        import cv2
+
+        ok, encoded = cv2.imencode(".jpg", crop, params)
+        if not ok:
+            raise ValueError(f"크롭 JPEG 인코딩 실패: {digest}")
+        path = self.object_path(digest)
+        path.parent.mkdir(exist_ok=True)
+        # 같은 크롭을 동시에 쓰는 스레드끼리 임시 파일이 겹치지 않도록 스레드별 이름 사용
+        tmp = path.with_name(f"{digest}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(encoded.tobytes())
+            tmp.replace(path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return int(encoded.size)
+
+    def _add_record(self, board: str, records: List[Dict[str, Any]]) -> None:
+        # 같은 보드가 다시 기록되면 마지막 기록이 우선 (예전 줄은 대체됨)
+        if self._index.pop(board, None) is not None:
+            self._stale += 1
+        if not records:
+            # 지우기만 하는 줄도 정리 대상
+            self._stale += 1
+            return
+        self._index[board] = [dict(record, board=board) for record in records]
+        self._known.update(record["hash"] for record in records)
+
+    def _load_index(self) -> None:
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    board, records = record["board"], record["crops"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # 중단된 실행의 마지막 줄은 건너뜀
+                    self._stale += 1
+                    continue
+                self._add_record(board, records)
+
+    def _needs_compaction(self) -> bool:
+        return self._stale > max(COMPACT_MIN_STALE, len(self._index))
+
+    def _compact(self) -> None:
+        """살아 있는 항목만 남기도록 색인 파일을 원자적으로 다시 씁니다."""
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for board, records in self._index.items():
+                crops = [{key: value for key, value in record.items() if key != "board"}
+                         for record in records]
+                f.write(json.dumps({"board": board, "crops": crops}, ensure_ascii=False) + "\n")
+        tmp.replace(self.index_path)
+        logger.info(f"크롭 색인 정리: 대체된 {self._stale}줄 제거 -> {self.index_path}")
+        self._stale = 0
+
+    def lookup(self, board: str, det: int) -> Optional[Path]:
+        """보드 경로와 검출 번호로 크롭 파일 경로를 찾습니다 (없으면 None)."""
+        det = int(det)
+        with self._lock:
+            record = next((r for r in self._index.get(str(board), ()) if r["det"] == det), None)
+        return self.object_path(record["hash"]) if record else None
+
+    def crops_for(self, board: str) -> List[Dict[str, Any]]:
+        """보드 한 장의 크롭 색인 항목을 검출 순서대로 반환합니다."""
+        with self._lock:
+            return list(self._index.get(str(board), ()))
+
+    def flush(self) -> None:
+        with self._lock:
+            self._out.flush()
+
+    def close(self) -> None:
+        """색인 파일을 닫습니다 (대체된 줄이 많으면 정리)."""
+        with self._lock:
+            if self._out.closed:
+                return
+            self._out.close()
+            if self._needs_compaction():
+                self._compact()
+        logger.info(f"크롭 저장소: {self.stored}개 저장, {self.deduplicated}개 중복 제거, "
+                    f"{self.bytes / 1e6:.1f} MB -> {self.root}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"stored": self.stored, "deduplicated": self.deduplicated, "bytes": self.bytes}
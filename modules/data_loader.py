@@ -1,8 +1,16 @@
 """데이터 로딩을 담당하는 모듈."""
+import hashlib
+import json
 import logging
-from typing import List, Tuple
+import os
+import struct
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
-import cv2
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -10,15 +18,60 @@ logger = logging.getLogger(__name__)
 # 지원하는 이미지 확장자
 SUPPORTED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.webp'}
 
+# 헤더 판별용 시그니처
+JPEG_SIGNATURE = b'\xff\xd8'
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_IEND = b'\x00\x00\x00\x00IEND\xaeB`\x82'
+BMP_SIGNATURE = b'BM'
+TIFF_SIGNATURES = (b'II*\x00', b'MM\x00*')
 
-def load_images(path: str) -> List[str]:
+# 검증 모드 및 캐시
+VALIDATION_MODES = ('header', 'decode')
+VALIDATION_CACHE_VERSION = 1
+
+# 크기 정보를 담은 JPEG SOF 마커 (DHT/JPG/DAC 제외)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# PNG 색상 타입별 채널 수
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+
+
+def iter_images(path: str, recursive: bool = False) -> Iterator[str]:
+    """디렉터리를 한 번만 훑으며 이미지 파일 경로를 발견 즉시 내보냅니다.
+
+    ``os.scandir`` 로 항목을 하나씩 읽으므로 전체 목록을 메모리에 올리지 않으며,
+    확장자는 대소문자를 구분하지 않습니다. 순서는 파일 시스템이 돌려주는
+    순서를 따릅니다.
+
+    Args:
+        path: 이미지 디렉터리 경로
+        recursive: 하위 디렉터리까지 탐색할지 여부 (심볼릭 링크 디렉터리는 제외)
+
+    Yields:
+        이미지 파일 경로
+    """
+    pending = [path]
+    while pending:
+        directory = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    if os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS:
+                        yield entry.path
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+
+
+def load_images(path: str, recursive: bool = False, stream: bool = False) -> Union[List[str], Iterator[str]]:
     """지정된 경로에서 이미지 파일 목록을 가져옵니다.
     
     Args:
         path: 이미지 디렉터리 경로
+        recursive: 하위 디렉터리까지 탐색할지 여부
+        stream: True이면 정렬하지 않고 발견 순서대로 내보내는 이터레이터를 반환
+            (수십만 장 규모의 디렉터리에서도 메모리 사용량이 일정)
         
     Returns:
-        이미지 파일 경로 리스트
+        정렬된 이미지 파일 경로 리스트, 또는 ``stream`` 이면 경로 이터레이터
         
     Raises:
         FileNotFoundError: 디렉터리가 존재하지 않을 때
@@ -35,19 +88,21 @@ def load_images(path: str) -> List[str]:
             
         logger.info(f"이미지 로딩 시작: {path}")
         
-        # 이미지 파일 검색
-        image_files = []
-        for ext in SUPPORTED_EXTENSIONS:
-            image_files.extend(path_obj.glob(f"*{ext}"))
-            image_files.extend(path_obj.glob(f"*{ext.upper()}"))
-            
-        # 중복 제거 및 정렬
-        image_files = sorted(list(set(image_files)))
+        image_paths = iter_images(str(path_obj), recursive=recursive)
+
+        if stream:
+            # 첫 항목만 확인하여 빈 디렉터리를 걸러냄
+            first = next(image_paths, None)
+            if first is None:
+                raise ValueError(f"이미지 파일을 찾을 수 없습니다: {path}")
+            logger.info("이미지 스트리밍 탐색 시작")
+            return chain([first], image_paths)
+
+        image_paths = sorted(image_paths)
         
-        if not image_files:
+        if not image_paths:
             raise ValueError(f"이미지 파일을 찾을 수 없습니다: {path}")
             
-        image_paths = [str(img) for img in image_files]
         logger.info(f"이미지 로딩 완료: {len(image_paths)}개 파일")
         
         return image_paths
@@ -57,11 +112,423 @@ def load_images(path: str) -> List[str]:
         raise
 
 
-def load_single_image(image_path: str) -> np.ndarray:
+def _read_jpeg_header(f: BinaryIO) -> Tuple[int, int, int]:
+    """SOI 이후의 JPEG 세그먼트를 건너뛰며 SOF 마커에서 크기를 읽습니다."""
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            raise ValueError("SOF 마커를 찾을 수 없습니다")
+
+        marker = byte[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            continue  # 길이 필드가 없는 마커
+        if marker == 0xD9:
+            raise ValueError("SOF 마커 이전에 EOI를 만났습니다")
+
+        length_bytes = f.read(2)
+        if len(length_bytes) != 2:
+            raise ValueError("JPEG 세그먼트가 잘려 있습니다")
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in _JPEG_SOF_MARKERS:
+            sof = f.read(6)
+            if len(sof) != 6:
+                raise ValueError("JPEG SOF 세그먼트가 잘려 있습니다")
+            _, height, width, channels = struct.unpack('>BHHB', sof)
+            return width, height, channels
+        f.seek(length - 2, 1)
+
+
+def _read_png_header(f: BinaryIO) -> Tuple[int, int, int]:
+    """시그니처 직후의 IHDR 청크에서 크기를 읽습니다."""
+    chunk = f.read(18)
+    if len(chunk) != 18 or chunk[4:8] != b'IHDR':
+        raise ValueError("PNG IHDR 청크를 찾을 수 없습니다")
+    width, height = struct.unpack('>II', chunk[8:16])
+    return width, height, _PNG_CHANNELS.get(chunk[17], 3)
+
+
+def _read_bmp_header(f: BinaryIO) -> Tuple[int, int, int]:
+    """BITMAPINFOHEADER(또는 OS/2 BITMAPCOREHEADER)에서 크기를 읽습니다."""
+    f.seek(14)
+    header = f.read(16)
+    if len(header) < 12:
+        raise ValueError("BMP 헤더가 잘려 있습니다")
+    dib_size = struct.unpack('<I', header[:4])[0]
+    if dib_size == 12:
+        width, height, _, bit_count = struct.unpack('<HHHH', header[4:12])
+    else:
+        if len(header) < 16:
+            raise ValueError("BMP 헤더가 잘려 있습니다")
+        width, height, _, bit_count = struct.unpack('<iiHH', header[4:16])
+    return abs(width), abs(height), 4 if bit_count == 32 else 3
+
+
+def _read_webp_header(f: BinaryIO) -> Tuple[int, int, int]:
+    """RIFF 컨테이너의 첫 청크(VP8/VP8L/VP8X)에서 크기를 읽습니다."""
+    f.seek(12)
+    chunk = f.read(20)
+    if len(chunk) < 20:
+        raise ValueError("WebP 헤더가 잘려 있습니다")
+    fourcc, data = chunk[:4], chunk[8:]
+    if fourcc == b'VP8X':
+        width = int.from_bytes(data[4:7], 'little') + 1
+        height = int.from_bytes(data[7:10], 'little') + 1
+        return width, height, 4 if data[0] & 0x10 else 3
+    if fourcc == b'VP8L':
+        if data[0] != 0x2F:
+            raise ValueError("VP8L 시그니처가 올바르지 않습니다")
+        bits = struct.unpack('<I', data[1:5])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1, 4 if (bits >> 28) & 1 else 3
+    if fourcc == b'VP8 ':
+        if data[3:6] != b'\x9d\x01\x2a':
+            raise ValueError("VP8 시작 코드가 올바르지 않습니다")
+        width, height = struct.unpack('<HH', data[6:10])
+        return width & 0x3FFF, height & 0x3FFF, 3
+    raise ValueError(f"알 수 없는 WebP 청크입니다: {fourcc!r}")
+
+
+def _read_tiff_header(f: BinaryIO, byte_order: str) -> Tuple[int, int, int]:
+    """첫 번째 IFD의 ImageWidth/ImageLength/SamplesPerPixel 태그를 읽습니다."""
+    f.seek(4)
+    ifd_offset = struct.unpack(byte_order + 'I', f.read(4))[0]
+    f.seek(ifd_offset)
+    count_bytes = f.read(2)
+    if len(count_bytes) != 2:
+        raise ValueError("TIFF IFD가 잘려 있습니다")
+    tags = {}
+    for _ in range(struct.unpack(byte_order + 'H', count_bytes)[0]):
+        entry = f.read(12)
+        if len(entry) != 12:
+            raise ValueError("TIFF IFD가 잘려 있습니다")
+        tag, value_type = struct.unpack(byte_order + 'HH', entry[:4])
+        if tag in (256, 257, 277):
+            fmt = 'H' if value_type == 3 else 'I'
+            tags[tag] = struct.unpack(byte_order + fmt, entry[8:8 + struct.calcsize(fmt)])[0]
+    if 256 not in tags or 257 not in tags:
+        raise ValueError("TIFF 크기 태그를 찾을 수 없습니다")
+    return tags[256], tags[257], tags.get(277, 1)
+
+
+def _read_header(f: BinaryIO) -> Tuple[str, Tuple[int, int, int]]:
+    """열린 파일의 시그니처로 형식을 판별하고 (형식, (너비, 높이, 채널))을 반환합니다."""
+    signature = f.read(12)
+    if signature.startswith(JPEG_SIGNATURE):
+        f.seek(2)
+        return 'jpeg', _read_jpeg_header(f)
+    if signature.startswith(PNG_SIGNATURE):
+        f.seek(8)
+        return 'png', _read_png_header(f)
+    if signature.startswith(BMP_SIGNATURE):
+        return 'bmp', _read_bmp_header(f)
+    if signature[:4] == b'RIFF' and signature[8:12] == b'WEBP':
+        return 'webp', _read_webp_header(f)
+    if signature[:4] in TIFF_SIGNATURES:
+        return 'tiff', _read_tiff_header(f, '<' if signature[:2] == b'II' else '>')
+    raise ValueError("헤더를 해석할 수 없는 이미지 형식입니다")
+
+
+def read_image_header(image_path: str) -> Tuple[int, int, int]:
+    """픽셀을 디코딩하지 않고 파일 헤더에서 이미지 크기를 읽습니다.
+
+    Args:
+        image_path: 이미지 파일 경로 (JPEG, PNG, BMP, WebP, TIFF)
+
+    Returns:
+        (너비, 높이, 채널 수)
+
+    Raises:
+        ValueError: 지원하지 않는 형식이거나 헤더가 손상되었을 때
+    """
+    with open(image_path, 'rb') as f:
+        try:
+            return _read_header(f)[1]
+        except (ValueError, struct.error) as e:
+            raise ValueError(f"{e}: {image_path}") from e
+
+
+def _is_truncated(f: BinaryIO, image_format: str, file_size: int) -> bool:
+    """파일 끝 마커/선언된 크기로 잘린 파일인지 확인합니다."""
+    if image_format == 'jpeg':
+        # 일부 장비는 EOI 뒤에 0 패딩을 붙이므로 끝부분에서 EOI를 찾음
+        f.seek(max(0, file_size - 1024))
+        return b'\xff\xd9' not in f.read().rstrip(b'\x00')
+    if image_format == 'png':
+        f.seek(max(0, file_size - len(PNG_IEND)))
+        return f.read() != PNG_IEND
+    if image_format == 'bmp':
+        f.seek(2)
+        return struct.unpack('<I', f.read(4))[0] > file_size
+    if image_format == 'webp':
+        f.seek(4)
+        return struct.unpack('<I', f.read(4))[0] + 8 > file_size
+    return False
+
+
+def check_image_header(image_path: str, check_truncation: bool = False) -> Optional[str]:
+    """시그니처와 헤더만으로 이미지 파일이 정상인지 확인합니다.
+
+    Args:
+        image_path: 이미지 파일 경로
+        check_truncation: True이면 파일 끝 마커(JPEG EOI, PNG IEND 등)까지 확인
+
+    Returns:
+        정상이면 ``None``, 아니면 실패 사유
+    """
+    try:
+        file_size = os.path.getsize(image_path)
+        with open(image_path, 'rb') as f:
+            image_format, (width, height, _) = _read_header(f)
+            if width <= 0 or height <= 0:
+                return f"잘못된 이미지 크기: {width}x{height}"
+            if check_truncation and _is_truncated(f, image_format, file_size):
+                return "파일이 잘려 있습니다"
+        return None
+    except (OSError, ValueError, struct.error) as e:
+        return str(e)
+
+
+def read_label_arrays(
+    label_paths: List[Union[str, Path]],
+    dtype: type = np.float64,
+    columns: int = 5,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """공백으로 구분된 라벨 텍스트 파일들을 하나의 (N, columns) 배열로 읽습니다.
+
+    모든 파일의 내용을 이어 붙여 ``np.fromstring`` 한 번으로 변환하므로 값마다
+    파이썬 객체를 만들지 않습니다. 각 줄의 앞 ``columns`` 개 값만 사용하며, 값이
+    그보다 적거나 ``dtype`` 으로 읽을 수 없는 줄은 건너뛰고 파일별로 개수를
+    셉니다 (빈 줄은 세지 않음). 읽을 수 없는 파일은 빈 파일로 처리합니다.
+
+    Args:
+        label_paths: 라벨 파일 경로 목록
+        dtype: 값 자료형 (예: ``np.int64``, ``np.float64``)
+        columns: 한 줄에서 사용할 값 개수
+
+    Returns:
+        (전체 행 (N, columns) 배열, 파일별 행 수 (F,), 파일별 잘못된 줄 수 (F,))
+    """
+    chunks, valid_rows = [], []
+    malformed = np.zeros(len(label_paths), dtype=np.int64)
+    for index, path in enumerate(label_paths):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            logger.error(f"Failed to load annotation {path}: {e}")
+            data = b''
+        rows = [row for row in (line.split() for line in data.splitlines()) if row]
+        valid = [row[:columns] for row in rows if len(row) >= columns]
+        malformed[index] = len(rows) - len(valid)
+        valid_rows.append(valid)
+        # 모든 줄의 값 개수가 맞으면 파일 내용을 그대로 사용
+        chunks.append(data if len(valid) == len(rows) and all(len(row) == columns for row in rows)
+                      else b' '.join(b' '.join(row) for row in valid))
+
+    counts = np.array([len(valid) for valid in valid_rows], dtype=np.int64)
+    try:
+        with warnings.catch_warnings():
+            # numpy 버전에 따라 읽다 만 경우 경고 또는 ValueError
+            warnings.simplefilter('error', DeprecationWarning)
+            values = np.fromstring(b' '.join(chunks), dtype=dtype, sep=' ')
+    except (ValueError, DeprecationWarning):
+        values = None
+    if values is None or values.size != counts.sum() * columns:
+        # 읽을 수 없는 값이 있으면 줄 단위로 다시 변환하여 해당 줄만 제외
+        parsed = []
+        for index, valid in enumerate(valid_rows):
+            kept = 0
+            for row in valid:
+                try:
+                    parsed.append(np.array(row, dtype=dtype))
+                except ValueError:
+                    continue
+                kept += 1
+            malformed[index] += counts[index] - kept
+            counts[index] = kept
+        values = np.array(parsed, dtype=dtype)
+
+    return values.reshape(-1, columns), counts, malformed
+
+
+class DecodedImageCache:
+    """디코딩된 이미지를 재사용하기 위한 2계층 LRU 캐시.
+
+    메모리 계층은 바이트 예산 안에서 최근 사용 순으로 배열을 보관하고,
+    ``disk_dir`` 가 주어지면 디코딩 결과를 ``.npy`` 파일로도 저장해 두었다가
+    메모리 매핑으로 다시 읽습니다. 디스크 계층은 프로세스가 끝나도 남으므로
+    같은 로트를 임계값/모델만 바꿔 다시 검사할 때 JPEG 디코딩을 건너뜁니다.
+    항목은 경로와 파일 크기, 수정 시각으로 식별되어 원본이 바뀌면 자동으로
+    무효화됩니다. 디스크 계층 적중은 복사 없이 읽기 전용 메모리 매핑 배열을
+    반환하고 메모리 계층으로 올리지 않습니다 (운영체제 페이지 캐시가 대신함).
+    여러 디코딩 스레드에서 동시에 사용할 수 있으며, 반환되는 배열은 공유되므로
+    읽기 전용입니다 (수정이 필요하면 복사해서 사용).
+
+    Args:
+        memory_bytes: 메모리 계층 바이트 예산
+        disk_dir: 디스크 계층 디렉터리 (None이면 메모리 계층만 사용)
+        disk_bytes: 디스크 계층 바이트 예산 (None이면 제한 없음)
+    """
+
+    def __init__(self, memory_bytes: int = 512 * 1024 ** 2, disk_dir: Optional[str] = None,
+                 disk_bytes: Optional[int] = None):
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+
+        self._memory: "OrderedDict[str, Tuple[Tuple[int, int], np.ndarray]]" = OrderedDict()
+        self._memory_used = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_used = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            # 오래된 파일부터 LRU 순서로 등록
+            entries = sorted(
+                (entry for entry in os.scandir(self.disk_dir) if entry.name.endswith('.npy')),
+                key=lambda entry: entry.stat().st_mtime,
+            )
+            for entry in entries:
+                size = entry.stat().st_size
+                self._disk[entry.name] = size
+                self._disk_used += size
+
+    @staticmethod
+    def _signature(image_path: str) -> Tuple[int, int]:
+        stat = os.stat(image_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _disk_name(image_path: str, signature: Tuple[int, int]) -> str:
+        key = f"{os.path.abspath(image_path)}|{signature[0]}|{signature[1]}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest() + '.npy'
+
+    def _put_memory(self, image_path: str, signature: Tuple[int, int], image: np.ndarray) -> None:
+        """메모리 계층에 넣고 예산을 넘으면 오래된 항목을 내보냅니다 (잠금 보유 상태에서 호출)."""
+        if image.nbytes > self.memory_bytes:
+            return
+        # 여러 호출자가 공유하므로 제자리 수정을 막음
+        image.setflags(write=False)
+        previous = self._memory.pop(image_path, None)
+        if previous is not None:
+            self._memory_used -= previous[1].nbytes
+        self._memory[image_path] = (signature, image)
+        self._memory_used += image.nbytes
+        while self._memory_used > self.memory_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_used -= evicted.nbytes
+            self.evictions += 1
+
+    def _write_disk(self, name: str, image: np.ndarray) -> None:
+        """디스크 계층에 원자적으로 저장하고 예산을 넘으면 오래된 파일을 지웁니다."""
+        target = self.disk_dir / name
+        tmp_path = target.with_name(f"{name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, image)
+        os.replace(tmp_path, target)
+        size = target.stat().st_size
+
+        with self._lock:
+            self._disk_used += size - self._disk.pop(name, 0)
+            self._disk[name] = size
+            stale = []
+            while self.disk_bytes is not None and self._disk_used > self.disk_bytes and len(self._disk) > 1:
+                old_name, old_size = self._disk.popitem(last=False)
+                self._disk_used -= old_size
+                stale.append(old_name)
+        for old_name in stale:
+            try:
+                (self.disk_dir / old_name).unlink()
+            except OSError:
+                # 이미 지워졌거나 (Windows에서) 다른 곳에서 매핑 중인 파일
+                pass
+
+    def load(self, image_path: str) -> np.ndarray:
+        """캐시에서 이미지를 가져오고, 없으면 디코딩하여 캐시에 넣습니다.
+
+        Raises:
+            FileNotFoundError: 이미지 파일이 존재하지 않을 때
+            ValueError: 이미지 디코딩 실패 시
+        """
+        try:
+            signature = self._signature(image_path)
+        except FileNotFoundError:
+            self.invalidate(image_path)
+            raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {image_path}")
+
+        with self._lock:
+            cached = self._memory.get(image_path)
+            if cached is not None and cached[0] == signature:
+                self._memory.move_to_end(image_path)
+                self.hits += 1
+                return cached[1]
+
+        if self.disk_dir is not None:
+            name = self._disk_name(image_path, signature)
+            with self._lock:
+                on_disk = name in self._disk
+                if on_disk:
+                    self._disk.move_to_end(name)
+            if on_disk:
+                try:
+                    image = np.load(self.disk_dir / name, mmap_mode='r')
+                except (OSError, ValueError):
+                    image = None
+                if image is not None:
+                    with self._lock:
+                        self.disk_hits += 1
+                    return image
+
+        import cv2
+
+        image = cv2.imread(image_path)
+        if image is None:
+            raise ValueError(f"이미지 로딩 실패: {image_path}")
+
+        with self._lock:
+            self.misses += 1
+            self._put_memory(image_path, signature, image)
+        if self.disk_dir is not None:
+            self._write_disk(self._disk_name(image_path, signature), image)
+        return image
+
+    def invalidate(self, image_path: str) -> None:
+        """메모리 계층에서 경로 항목을 제거합니다 (디스크 항목은 서명이 달라 자동 무효)."""
+        with self._lock:
+            cached = self._memory.pop(image_path, None)
+            if cached is not None:
+                self._memory_used -= cached[1].nbytes
+
+    def stats(self) -> Dict[str, int]:
+        """적중/실패/축출 카운터와 계층별 사용량을 반환합니다."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_used,
+                "disk_items": len(self._disk),
+                "disk_bytes": self._disk_used,
+            }
+
+
+def load_single_image(image_path: str, cache: Optional[DecodedImageCache] = None) -> np.ndarray:
     """단일 이미지를 로드합니다.
     
     Args:
         image_path: 이미지 파일 경로
+        cache: 전달되면 디코딩된 이미지를 캐시에서 재사용
         
     Returns:
         로드된 이미지 (BGR 형식)
@@ -71,9 +538,14 @@ def load_single_image(image_path: str) -> np.ndarray:
         ValueError: 이미지 로딩 실패 시
     """
     try:
+        if cache is not None:
+            return cache.load(image_path)
+
         if not Path(image_path).exists():
             raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {image_path}")
-            
+
+        import cv2
+
         image = cv2.imread(image_path)
         
         if image is None:
@@ -88,6 +560,8 @@ def load_single_image(image_path: str) -> np.ndarray:
 
 def get_image_info(image_path: str) -> dict:
     """이미지 정보를 반환합니다.
+
+    픽셀을 디코딩하지 않고 파일 헤더에서 크기와 채널 수를 읽습니다.
     
     Args:
         image_path: 이미지 파일 경로
@@ -96,8 +570,7 @@ def get_image_info(image_path: str) -> dict:
         이미지 정보 딕셔너리 (크기, 채널 수 등)
     """
     try:
-        image = load_single_image(image_path)
-        height, width, channels = image.shape
+        width, height, channels = read_image_header(image_path)
         
         info = {
             "path": image_path,
@@ -115,39 +588,107 @@ def get_image_info(image_path: str) -> dict:
         return {"path": image_path, "error": str(e)}
 
 
-def validate_image_batch(image_paths: List[str]) -> Tuple[List[str], List[str]]:
+def _load_validation_cache(cache_path: Optional[str]) -> Dict[str, list]:
+    """검증 캐시를 읽습니다. 없거나 손상되었으면 빈 딕셔너리를 반환합니다."""
+    if not cache_path or not Path(cache_path).exists():
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") == VALIDATION_CACHE_VERSION:
+            return data.get("entries", {})
+    except (OSError, ValueError) as e:
+        logger.warning(f"검증 캐시를 무시합니다 ({cache_path}): {e}")
+    return {}
+
+
+def _save_validation_cache(cache_path: str, entries: Dict[str, list]) -> None:
+    """검증 캐시를 임시 파일에 쓴 뒤 원자적으로 교체합니다."""
+    Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": VALIDATION_CACHE_VERSION, "entries": entries}, f, separators=(',', ':'))
+    os.replace(tmp_path, cache_path)
+
+
+def _validate_one(image_path: str, mode: str, check_truncation: bool) -> Tuple[Optional[os.stat_result], bool]:
+    """이미지 한 장을 검증하고 (stat 결과, 유효 여부)를 반환합니다."""
+    try:
+        stat = os.stat(image_path)
+    except OSError:
+        return None, False
+
+    if mode == 'decode':
+        import cv2
+
+        return stat, cv2.imread(image_path) is not None
+    return stat, check_image_header(image_path, check_truncation) is None
+
+
+def validate_image_batch(
+    image_paths: List[str],
+    mode: str = 'header',
+    check_truncation: bool = False,
+    num_workers: int = 8,
+    cache_path: Optional[str] = None,
+) -> Tuple[List[str], List[str]]:
     """이미지 배치를 검증하고 유효한 파일과 무효한 파일을 분리합니다.
+
+    기본 ``header`` 모드는 픽셀을 디코딩하지 않고 시그니처와 헤더만 확인하며,
+    ``decode`` 모드는 실제로 디코딩해 봅니다. 검증은 스레드 풀에서 병렬로
+    수행되고, ``cache_path`` 가 주어지면 경로+크기+수정 시각별 판정을 저장해
+    같은 로트를 다시 검증할 때 파일을 열지 않습니다.
     
     Args:
         image_paths: 이미지 파일 경로 리스트
+        mode: 'header' 또는 'decode'
+        check_truncation: header 모드에서 파일 끝 마커까지 확인할지 여부
+        num_workers: 검증 스레드 수
+        cache_path: 검증 캐시 JSON 파일 경로
         
     Returns:
         (유효한 이미지 경로 리스트, 무효한 이미지 경로 리스트)
     """
-    valid_images = []
-    invalid_images = []
-    
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"지원하지 않는 검증 모드입니다: {mode}")
+    mode_key = f"{mode}+eof" if mode == 'header' and check_truncation else mode
+
+    cache = _load_validation_cache(cache_path)
+    verdicts: Dict[str, bool] = {}
+    to_check = []
     for image_path in image_paths:
-        try:
-            # 파일 존재 여부 확인
-            if not Path(image_path).exists():
-                invalid_images.append(image_path)
+        cached = cache.get(image_path)
+        if cached is not None and cached[2] == mode_key:
+            try:
+                stat = os.stat(image_path)
+            except OSError:
+                verdicts[image_path] = False
                 continue
-                
-            # 이미지 로딩 테스트
-            image = cv2.imread(image_path)
-            if image is None:
-                invalid_images.append(image_path)
+            if cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                verdicts[image_path] = cached[3]
                 continue
-                
-            valid_images.append(image_path)
-            
-        except Exception:
-            invalid_images.append(image_path)
+        to_check.append(image_path)
+
+    if to_check:
+        with ThreadPoolExecutor(max_workers=max(1, num_workers), thread_name_prefix="validate") as executor:
+            checked = executor.map(lambda p: _validate_one(p, mode, check_truncation), to_check)
+            for image_path, (stat, is_valid) in zip(to_check, checked):
+                verdicts[image_path] = is_valid
+                if stat is not None:
+                    cache[image_path] = [stat.st_size, stat.st_mtime_ns, mode_key, is_valid]
+                else:
+                    cache.pop(image_path, None)
+
+    valid_images = [p for p in image_paths if verdicts[p]]
+    invalid_images = [p for p in image_paths if not verdicts[p]]
             
-    logger.info(f"이미지 검증 완료: 유효 {len(valid_images)}개, 무효 {len(invalid_images)}개")
+    logger.info(f"이미지 검증 완료: 유효 {len(valid_images)}개, 무효 {len(invalid_images)}개 "
+                f"(캐시 적중 {len(image_paths) - len(to_check)}개)")
     
     if invalid_images:
         logger.warning(f"무효한 이미지 파일들: {invalid_images}")
+
+    if cache_path and to_check:
+        _save_validation_cache(cache_path, cache)
         
-    return valid_images, invalid_images
\ No newline at end of file
+    return valid_images, invalid_images
@@ -0,0 +1,379 @@
+"""준비된 YOLO 데이터셋의 통계 색인 모듈.
+
+클래스 분포, 박스 크기 분포, 그룹별 결함 밀도처럼 ``imgsz``/타일링을 정할 때
+보는 수치를 라벨 파일을 매번 다시 읽지 않고 바로 얻을 수 있도록, 데이터셋
+폴더에 두 파일을 둡니다.
+
+    datasets/deeppcb/
+    ├── stats.npz     # 이미지/박스 단위 배열 (DatasetStats)
+    └── stats.json    # 요약 (stats.npz 없이 바로 읽을 수 있음)
+
+``prepare_dataset`` 은 변환하면서 만든 박스 배열로 색인을 갱신하고,
+``update_dataset_stats`` 는 라벨 파일의 크기/수정 시각이 색인과 같은 이미지는
+다시 읽지 않으므로 새 그룹이 추가되어도 새 파일만 읽습니다.
+
+사용 예::
+
+    stats = DatasetStats.from_npz("datasets/deeppcb/stats.npz")
+    stats.class_counts(split="train")
+    stats.small_box_fraction(imgsz=640)
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from modules.data_loader import read_image_header, read_label_arrays
+
+logger = logging.getLogger(__name__)
+
+STATS_NAME = 'stats.npz'
+SUMMARY_NAME = 'stats.json'
+STATS_VERSION = 1
+
+SPLITS = ('train', 'val')
+
+# 학습 입력 크기로 줄였을 때 이보다 짧은 변의 박스는 검출이 어려운 것으로 봄 (픽셀)
+SMALL_BOX_PIXELS = 8
+# 요약에 작은 박스 비율을 계산할 imgsz 후보
+IMGSZ_CANDIDATES = (320, 480, 640, 800, 1024, 1280)
+
+# 그룹 정보가 없는 이미지의 그룹 이름
+UNKNOWN_GROUP = ''
+
+
+class DatasetStats:
+    """이미지/박스 단위 통계를 열 단위 NumPy 배열로 보관하는 색인.
+
+    박스는 이미지 순서대로 연속 배열에 저장되며 (``DetectionStore`` 와 같은
+    구조), 집계는 모두 배열 연산으로 수행합니다.
+
+    Attributes:
+        labels: (M,) 데이터셋 폴더 기준 라벨 파일 경로 (``labels/train/xxx.txt``)
+        splits: (M,) 분할 이름
+        groups: (M,) 원본 그룹 폴더 이름 (모르면 빈 문자열)
+        shapes: (M, 2) 이미지 (높이, 너비)
+        sources: (M, 2) 라벨 파일 (크기, 수정 시각 ns), 증분 갱신 판단용
+        image_index: (N,) 박스가 속한 이미지 인덱스 (오름차순)
+        xywh: (N, 4) 정규화된 YOLO 박스
+        cls: (N,) 클래스 ID
+        names: (C,) 클래스 이름
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        splits: Sequence[str],
+        groups: Sequence[str],
+        shapes: np.ndarray,
+        sources: np.ndarray,
+        image_index: np.ndarray,
+        xywh: np.ndarray,
+        cls: np.ndarray,
+        names: Sequence[str] = (),
+    ):
+        self.labels = np.asarray(labels, dtype=str)
+        self.splits = np.asarray(splits, dtype=str)
+        self.groups = np.asarray(groups, dtype=str)
+        self.shapes = np.ascontiguousarray(shapes, dtype=np.int32).reshape(-1, 2)
+        self.sources = np.ascontiguousarray(sources, dtype=np.int64).reshape(-1, 2)
+        self.image_index = np.ascontiguousarray(image_index, dtype=np.int32)
+        self.xywh = np.ascontiguousarray(xywh, dtype=np.float32).reshape(-1, 4)
+        self.cls = np.ascontiguousarray(cls, dtype=np.int16)
+        self.names = np.asarray(names, dtype=str)
+
+    def __len__(self) -> int:
+        """색인된 박스 수를 반환합니다."""
+        return len(self.cls)
+
+    def __repr__(self) -> str:
+        return f"DatasetStats(images={self.num_images}, boxes={len(self)})"
+
+    @property
+    def num_images(self) -> int:
+        """색인된 이미지 수를 반환합니다."""
+        return len(self.labels)
+
+    @property
+    def num_classes(self) -> int:
+        """클래스 수 (이름이 없으면 가장 큰 클래스 ID + 1) 를 반환합니다."""
+        return max(len(self.names), int(self.cls.max()) + 1 if len(self.cls) else 0)
+
+    @classmethod
+    def empty(cls, names: Sequence[str] = ()) -> "DatasetStats":
+        """비어 있는 색인을 만듭니다."""
+        return cls([], [], [], np.zeros((0, 2)), np.zeros((0, 2)), np.zeros(0), np.zeros((0, 4)),
+                   np.zeros(0), names)
+
+    def counts_per_image(self) -> np.ndarray:
+        """이미지별 박스 수 (M,) 를 반환합니다."""
+        return np.bincount(self.image_index, minlength=self.num_images)
+
+    def box_pixels(self) -> np.ndarray:
+        """박스별 원본 픽셀 (너비, 높이) (N, 2) 를 반환합니다."""
+        return self.xywh[:, 2:] * self.shapes[self.image_index][:, ::-1]
+
+    def _box_mask(self, split: Optional[str] = None, group: Optional[str] = None,
+                  cls: Optional[int] = None) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if split is not None:
+            mask &= (self.splits == split)[self.image_index]
+        if group is not None:
+            mask &= (self.groups == group)[self.image_index]
+        if cls is not None:
+            mask &= self.cls == cls
+        return mask
+
+    def class_counts(self, split: Optional[str] = None) -> np.ndarray:
+        """클래스별 박스 수를 반환합니다 (``split`` 을 주면 해당 분할만)."""
+        cls = self.cls[self._box_mask(split=split)].astype(np.int64)
+        return np.bincount(cls, minlength=self.num_classes)
+
+    def box_sizes(self, cls: Optional[int] = None, split: Optional[str] = None) -> np.ndarray:
+        """조건에 맞는 박스의 원본 픽셀 (너비, 높이) (K, 2) 를 반환합니다."""
+        return self.box_pixels()[self._box_mask(split=split, cls=cls)]
+
+    def small_box_fraction(self, imgsz: int, min_pixels: float = SMALL_BOX_PIXELS) -> float:
+        """이미지를 ``imgsz`` 로 레터박스했을 때 짧은 변이 ``min_pixels`` 보다 작아지는 박스 비율."""
+        if not len(self):
+            return 0.0
+        scale = imgsz / np.maximum(self.shapes.max(axis=1), 1)
+        min_side = self.box_pixels().min(axis=1) * scale[self.image_index]
+        return float(np.mean(min_side < min_pixels))
+
+    def group_density(self) -> Dict[str, Dict[str, Any]]:
+        """그룹별 이미지 수, 결함 이미지 수, 박스 수, 이미지당 결함 수를 반환합니다."""
+        names, inverse = np.unique(self.groups, return_inverse=True)
+        per_image = self.counts_per_image()
+        images = np.bincount(inverse, minlength=len(names))
+        defective = np.bincount(inverse, weights=per_image > 0, minlength=len(names))
+        boxes = np.bincount(inverse, weights=per_image, minlength=len(names))
+        return {
+            str(name): {
+                "images": int(images[i]),
+                "defective_images": int(defective[i]),
+                "boxes": int(boxes[i]),
+                "defects_per_image": float(boxes[i] / images[i]) if images[i] else 0.0,
+            }
+            for i, name in enumerate(names)
+        }
+
+    def summary(self, imgsz_candidates: Sequence[int] = IMGSZ_CANDIDATES) -> Dict[str, Any]:
+        """JSON으로 저장할 요약 딕셔너리를 반환합니다.
+
+        분할별 이미지/박스 수, 분할별 클래스 분포, 박스 픽셀 크기 분위수(전체와
+        클래스별), 이미지 크기 분포, ``imgsz`` 후보별 작은 박스 비율, 그룹별 결함
+        밀도를 담습니다.
+        """
+        names = [str(name) for name in self.names] or [str(i) for i in range(self.num_classes)]
+        per_image = self.counts_per_image()
+        pixels = self.box_pixels()
+        class_counts = {split: self.class_counts(split) for split in SPLITS}
+
+        def quantiles(values: np.ndarray) -> Dict[str, float]:
+            if not len(values):
+                return {}
+            p5, p50, p95 = np.percentile(values, [5, 50, 95])
+            return {"min": round(float(values.min()), 2), "p5": round(float(p5), 2),
+                    "p50": round(float(p50), 2), "p95": round(float(p95), 2),
+                    "max": round(float(values.max()), 2)}
+
+        def sizes(mask: np.ndarray) -> Dict[str, Dict[str, float]]:
+            return {"width": quantiles(pixels[mask, 0]), "height": quantiles(pixels[mask, 1]),
+                    "min_side": quantiles(pixels[mask].min(axis=1) if mask.any() else pixels[:0, 0])}
+
+        shapes, shape_counts = np.unique(self.shapes, axis=0, return_counts=True)
+        return {
+            "version": STATS_VERSION,
+            "images": self.num_images,
+            "boxes": len(self),
+            "defective_images": int(np.count_nonzero(per_image)),
+            "splits": {
+                split: {"images": int(np.count_nonzero(self.splits == split)),
+                        "boxes": int(self._box_mask(split=split).sum())}
+                for split in SPLITS
+            },
+            "classes": {
+                name: {split: int(class_counts[split][i]) for split in SPLITS}
+                for i, name in enumerate(names)
+            },
+            "box_size_px": sizes(np.ones(len(self), dtype=bool)),
+            "box_size_px_by_class": {name: sizes(self.cls == i) for i, name in enumerate(names)},
+            "image_sizes": {f"{w}x{h}": int(n) for (h, w), n in zip(shapes.tolist(), shape_counts.tolist())},
+            "small_box_fraction": {
+                str(imgsz): self.small_box_fraction(imgsz) for imgsz in imgsz_candidates
+            },
+            "small_box_pixels": SMALL_BOX_PIXELS,
+            "groups": self.group_density(),
+        }
+
+    def to_npz(self, path: Union[str, Path]) -> None:
+        """``.npz`` 파일로 저장합니다 (임시 파일에 쓴 뒤 교체)."""
+        path = Path(path)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(
+                f,
+                version=np.int32(STATS_VERSION),
+                labels=self.labels, splits=self.splits, groups=self.groups, shapes=self.shapes,
+                sources=self.sources, image_index=self.image_index, xywh=self.xywh, cls=self.cls,
+                names=self.names,
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def from_npz(cls, path: Union[str, Path]) -> "DatasetStats":
+        """``to_npz`` 로 저장한 파일을 읽습니다.
+
+        Raises:
+            ValueError: 지원하지 않는 색인 버전일 때
+        """
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != STATS_VERSION:
+                raise ValueError(f"Unsupported stats version: {int(data['version'])}")
+            return cls(
+                data["labels"], data["splits"], data["groups"], data["shapes"], data["sources"],
+                data["image_index"], data["xywh"], data["cls"], data["names"],
+            )
+
+
+def _file_source(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _image_shape(dataset_dir: Path, label: str) -> Tuple[int, int]:
+    """라벨에 대응하는 ``images/<split>/<stem>.*`` 의 (높이, 너비), 찾지 못하면 (0, 0)."""
+    _, split, name = label.split('/')
+    for path in sorted((dataset_dir / 'images' / split).glob(f"{Path(name).stem}.*")):
+        try:
+            width, height, _ = read_image_header(str(path))
+            return height, width
+        except (OSError, ValueError):
+            continue
+    return 0, 0
+
+
+def update_dataset_stats(
+    dataset_dir: Union[str, Path],
+    groups: Optional[Dict[str, str]] = None,
+    fresh: Optional[Dict[str, Dict[str, Any]]] = None,
+    names: Sequence[str] = (),
+) -> DatasetStats:
+    """데이터셋 폴더의 통계 색인(``stats.npz``, ``stats.json``)을 증분 갱신합니다.
+
+    ``labels/<split>/*.txt`` 를 나열하여 기존 색인의 (크기, 수정 시각)이 같은
+    이미지는 그대로 쓰고, ``fresh`` 에 있는 이미지는 변환 중 만든 배열을 쓰며,
+    나머지(새로 생기거나 바뀐 라벨)만 라벨 파일과 이미지 헤더를 읽습니다.
+    사라진 라벨의 항목은 제거합니다.
+
+    Args:
+        dataset_dir: 준비된 데이터셋 폴더
+        groups: 라벨 경로 -> 원본 그룹 이름 (없으면 기존 색인 값 유지)
+        fresh: 라벨 경로 -> {"source", "shape", "xywh", "cls"} (방금 기록한 라벨)
+        names: 클래스 이름
+
+    Returns:
+        갱신된 ``DatasetStats``
+    """
+    dataset_dir = Path(dataset_dir)
+    groups = groups or {}
+    fresh = fresh or {}
+    stats_path = dataset_dir / STATS_NAME
+    previous = DatasetStats.empty()
+    if stats_path.exists():
+        try:
+            previous = DatasetStats.from_npz(stats_path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable stats index {stats_path}: {e}")
+    known = {label: i for i, label in enumerate(previous.labels.tolist())}
+
+    labels, sources = [], []
+    for split in SPLITS:
+        for path in sorted((dataset_dir / 'labels' / split).glob('*.txt')):
+            labels.append(path.relative_to(dataset_dir).as_posix())
+            sources.append(_file_source(path))
+
+    reused, changed = [], []
+    for label, source in zip(labels, sources):
+        record = fresh.get(label)
+        if record is not None and tuple(record['source']) == source:
+            continue
+        row = known.get(label)
+        if row is not None and tuple(previous.sources[row].tolist()) == source:
+            reused.append(row)
+        else:
+            changed.append(label)
+
+    # 바뀐 라벨만 한 번에 읽음 (class_id x_center y_center width height)
+    values, counts, _ = read_label_arrays([dataset_dir / label for label in changed], dtype=np.float64)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    parsed = {
+        label: {'shape': _image_shape(dataset_dir, label),
+                'xywh': values[offsets[i]:offsets[i + 1], 1:],
+                'cls': values[offsets[i]:offsets[i + 1], 0]}
+        for i, label in enumerate(changed)
+    }
+
+    # 색인 조립: 기존 행은 배열 연산으로 옮기고, 새 행은 이어 붙임
+    reused = np.asarray(sorted(reused), dtype=np.int64)
+    keep = np.zeros(previous.num_images, dtype=bool)
+    keep[reused] = True
+    box_keep = keep[previous.image_index]
+    remap = np.cumsum(keep) - 1
+
+    reused_labels = previous.labels[reused].tolist()
+    skip = set(reused_labels)
+    new_labels = [label for label in labels if label not in skip]
+    new_records = [parsed[label] if label in parsed else fresh[label] for label in new_labels]
+    source_of = dict(zip(labels, sources))
+
+    all_labels = reused_labels + new_labels
+    old_groups = previous.groups[reused].tolist() + [UNKNOWN_GROUP] * len(new_labels)
+    stats = DatasetStats(
+        all_labels,
+        [label.split('/')[1] for label in all_labels],
+        [groups.get(label, group) for label, group in zip(all_labels, old_groups)],
+        # 새 행도 색인과 같은 dtype으로 만듦: 새 행이 없을 때 빈 float64 배열과 이어 붙이면
+        # int64 수정 시각(ns)이 float64로 바뀌어 정밀도를 잃고 다음 실행에서 모두 바뀐 것으로 보임
+        np.concatenate([previous.shapes[reused],
+                        np.asarray([record['shape'] for record in new_records],
+                                   dtype=np.int32).reshape(-1, 2)]),
+        np.concatenate([previous.sources[reused],
+                        np.asarray([source_of[label] for label in new_labels],
+                                   dtype=np.int64).reshape(-1, 2)]),
+        np.concatenate([remap[previous.image_index[box_keep]],
+                        np.repeat(np.arange(len(reused), len(all_labels)),
+                                  [len(record['cls']) for record in new_records])]),
+        np.concatenate([previous.xywh[box_keep]]
+                       + [np.asarray(record['xywh'], dtype=np.float32).reshape(-1, 4)
+                          for record in new_records]),
+        np.concatenate([previous.cls[box_keep]]
+                       + [np.asarray(record['cls'], dtype=np.int16).reshape(-1)
+                          for record in new_records]),
+        names if len(names) else previous.names,
+    )
+
+    stats.to_npz(stats_path)
+    summary = stats.summary()
+    tmp = dataset_dir / (SUMMARY_NAME + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, dataset_dir / SUMMARY_NAME)
+
+    logger.info(f"Stats index: {stats.num_images} images ({len(reused)} reused, "
+                f"{len(new_labels) - len(changed)} from conversion, {len(changed)} re-read), "
+                f"{len(stats)} boxes -> {stats_path}")
+    return stats
+
+
+def load_summary(dataset_dir: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """데이터셋 폴더의 ``stats.json`` 요약을 읽습니다 (없으면 None)."""
+    path = Path(dataset_dir) / SUMMARY_NAME
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -1,13 +1,209 @@
 """DeepPCB 데이터셋 로더 모듈"""
+import errno
+import hashlib
+import json
 import logging
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Tuple
-import numpy as np
-import cv2
+from typing import List, Dict, Optional, Sequence, Tuple
 import shutil
 
+import numpy as np
+
+from modules.data_loader import read_image_header, read_label_arrays
+from modules.dataset_stats import DatasetStats, update_dataset_stats
+
 logger = logging.getLogger(__name__)
 
+# 증분 변환용 매니페스트
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# DeepPCB 클래스 이름 (1-6을 0-5로 변환한 순서)
+CLASS_NAMES = ['open', 'short', 'mousebite', 'spur', 'copper', 'pin-hole']
+
+# YOLO 라벨 한 줄 (class_id x_center y_center width height)
+YOLO_LABEL_FORMAT = '%d %.6f %.6f %.6f %.6f'
+
+# (이미지 경로, 라벨 경로 또는 None, 분할)
+Sample = Tuple[Path, Optional[Path], str]
+
+# 이미지 배치 방식
+LINK_MODES = ('copy', 'hardlink', 'symlink', 'reflink')
+# linux/fs.h의 FICLONE ioctl 번호
+_FICLONE = 0x40049409
+# 링크/리플링크를 만들 수 없어 복사로 대체할 오류들
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL, errno.ENOTTY}
+
+
+def _reflink(src: Path, dst: Path):
+    """copy-on-write 복제 (Linux FICLONE, Btrfs/XFS 등에서 지원)"""
+    if not sys.platform.startswith('linux'):
+        raise OSError(errno.EOPNOTSUPP, "reflink is only supported on Linux")
+    import fcntl
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            dst.unlink()
+            raise
+    shutil.copystat(src, dst)
+
+
+def materialize(src: Path, dst: Path, link_mode: str = 'copy') -> Tuple[str, int]:
+    """원본 이미지를 출력 위치에 배치
+
+    ``hardlink``/``reflink`` 가 불가능하면 (다른 파일 시스템 등) 자동으로 복사합니다.
+    기존 출력은 먼저 삭제하므로, 이전 실행의 하드 링크를 통해 원본이 덮어써지지 않습니다.
+
+    Args:
+        src: 원본 파일
+        dst: 출력 파일
+        link_mode: 'copy', 'hardlink', 'symlink', 'reflink' 중 하나
+
+    Returns:
+        (실제로 사용된 방식, 새로 기록된 바이트 수)
+    """
+    if link_mode not in LINK_MODES:
+        raise ValueError(f"Unsupported link mode: {link_mode}")
+
+    if dst.is_symlink() or dst.exists():
+        dst.unlink()
+
+    try:
+        if link_mode == 'hardlink':
+            os.link(src, dst)
+            return link_mode, 0
+        if link_mode == 'symlink':
+            os.symlink(src.resolve(), dst)
+            return link_mode, 0
+        if link_mode == 'reflink':
+            _reflink(src, dst)
+            return link_mode, 0
+    except OSError as e:
+        if e.errno not in _FALLBACK_ERRNOS:
+            raise
+
+    shutil.copy2(src, dst)
+    return 'copy', dst.stat().st_size
+
+
+def _file_record(path: Path) -> Dict:
+    """파일의 크기, 수정 시각, SHA-1 해시를 기록"""
+    stat = path.stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': _file_digest(path)}
+
+
+def _file_digest(path: Path) -> str:
+    """파일 내용의 SHA-1 해시"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _same_source(record: Optional[Dict], path: Optional[Path]) -> bool:
+    """매니페스트 기록과 현재 원본 파일이 같은지 확인
+
+    크기와 수정 시각이 같으면 바로 같다고 보고, 수정 시각만 바뀐 경우에는
+    해시를 비교합니다 (내용이 같으면 기록의 수정 시각을 갱신).
+    """
+    if record is None or path is None:
+        return record is None and path is None
+    try:
+        stat = path.stat()
+    except OSError:
+        return False
+    if stat.st_size != record['size']:
+        return False
+    if stat.st_mtime_ns == record['mtime_ns']:
+        return True
+    if _file_digest(path) != record['sha1']:
+        return False
+    record['mtime_ns'] = stat.st_mtime_ns
+    return True
+
+
+def parse_deeppcb_labels(label_paths: Sequence) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """여러 DeepPCB 라벨 파일을 하나의 (N, 5) 정수 배열로 읽음
+
+    DeepPCB 형식: x1 y1 x2 y2 class_id (class_id는 YOLO와 같은 0-5로 바꿈)
+
+    모든 파일을 한 번의 배열 변환으로 읽으므로 박스마다 파이썬 객체를 만들지
+    않습니다 (``read_label_arrays`` 참고). 값이 다섯 개보다 적거나 정수가 아닌
+    줄은 건너뛰고 파일별로 개수를 셉니다. 읽을 수 없는 파일은 박스가 없는 것으로
+    처리합니다.
+
+    Args:
+        label_paths: 라벨 파일 경로 목록
+
+    Returns:
+        (전체 박스 (N, 5) int64 배열, 파일별 박스 수 (F,), 파일별 잘못된 줄 수 (F,))
+    """
+    boxes, counts, malformed = read_label_arrays(label_paths, dtype=np.int64, columns=5)
+    boxes[:, 4] -= 1  # DeepPCB는 1-6, YOLO는 0-5
+    return boxes, counts, malformed
+
+
+def deeppcb_to_yolo(boxes: np.ndarray, image_width, image_height) -> np.ndarray:
+    """(N, 5) [x1, y1, x2, y2, class_id] 배열을 YOLO [class_id, x_center, y_center, width, height] 로 변환
+
+    모든 박스를 한 번의 배열 연산으로 이미지 크기로 정규화합니다.
+
+    Args:
+        boxes: (N, 5) DeepPCB 박스
+        image_width: 이미지 너비 (스칼라 또는 박스별 (N,) 배열)
+        image_height: 이미지 높이 (스칼라 또는 박스별 (N,) 배열)
+
+    Returns:
+        (N, 5) float64 YOLO 라벨
+    """
+    xyxy = boxes[:, :4].astype(np.float64)
+    size = np.empty((len(boxes), 2), dtype=np.float64)
+    size[:, 0] = image_width
+    size[:, 1] = image_height
+    labels = np.empty((len(boxes), 5), dtype=np.float64)
+    labels[:, 0] = boxes[:, 4]
+    labels[:, 1:3] = (xyxy[:, :2] + xyxy[:, 2:]) / 2.0 / size
+    labels[:, 3:5] = (xyxy[:, 2:] - xyxy[:, :2]) / size
+    return labels
+
+
+def format_yolo_labels(labels: np.ndarray, counts: Sequence[int]) -> List[str]:
+    """YOLO 라벨 배열을 파일별 라벨 파일 내용으로 변환 (한 줄에 박스 하나, 소수점 6자리)
+
+    박스마다 f-string을 만드는 대신 전체 배열을 하나의 서식 연산으로 만든 뒤
+    ``counts`` 에 따라 파일별로 나눕니다.
+
+    Args:
+        labels: (N, 5) YOLO 라벨 (``deeppcb_to_yolo`` 결과)
+        counts: 파일별 박스 수 (합계가 N)
+
+    Returns:
+        파일별 라벨 파일 내용
+    """
+    if not len(labels):
+        return [''] * len(counts)
+    text = '\n'.join([YOLO_LABEL_FORMAT] * len(labels)) % tuple(labels.ravel().tolist())
+    lines = text.split('\n')
+    contents, start = [], 0
+    for count in counts:
+        contents.append('\n'.join(lines[start:start + count]))
+        start += count
+    return contents
+
+
+def label_groups(samples: Dict[str, Dict]) -> Dict[str, str]:
+    """매니페스트 항목에서 출력 라벨 경로 -> 원본 그룹 폴더 이름 매핑을 만듦"""
+    return {entry['outputs'][1]: key.split('/', 1)[0] for key, entry in samples.items() if entry['outputs']}
+
 
 class DeepPCBLoader:
     """DeepPCB 데이터셋을 로드하고 처리하는 클래스"""
@@ -78,8 +274,181 @@ class DeepPCBLoader:
             
         return yolo_labels
     
-    def prepare_dataset(self, output_path: str):
-        """DeepPCB 데이터셋을 YOLO 학습용으로 준비"""
+    def _collect_samples(self, group_folders: List[Path]) -> List[List[Sample]]:
+        """그룹별 (이미지, 라벨, 분할) 목록 수집"""
+        samples_by_group = []
+
+        for group_idx, group_folder in enumerate(group_folders):
+            # 80% train, 20% val 분할 (그룹 단위로)
+            split = 'train' if group_idx < len(group_folders) * 0.8 else 'val'
+            samples = []
+
+            # 그룹 내의 하위 폴더 찾기
+            sub_folders = [d for d in group_folder.iterdir() if d.is_dir() and not d.name.endswith('_not')]
+
+            for sub_folder in sub_folders:
+                # 대응하는 라벨 폴더
+                label_folder = group_folder / f"{sub_folder.name}_not"
+
+                if not label_folder.exists():
+                    logger.warning(f"Label folder not found: {label_folder}")
+                    continue
+
+                # 이미지 파일들 찾기
+                image_files = list(sub_folder.glob('*.jpg')) + list(sub_folder.glob('*.JPG'))
+                for img_path in image_files:
+                    label_path = label_folder / f"{img_path.stem}.txt"
+                    samples.append((img_path, label_path if label_path.exists() else None, split))
+
+            samples_by_group.append(samples)
+
+        return samples_by_group
+
+    def _convert_samples(self, samples: List[Sample], output_path: Path,
+                         link_mode: str = 'copy') -> Tuple[List[Tuple[str, Dict]], Dict, Dict]:
+        """샘플 목록을 YOLO 형식으로 변환
+
+        이미지 크기는 픽셀을 디코딩하지 않고 JPEG/PNG 헤더에서 읽습니다.
+        프로세스 풀 작업 단위로도 사용되며, 샘플별 매니페스트 항목, 이미지 배치
+        통계(소요 시간, 기록 바이트, 방식별 개수), 통계 색인용 라벨별 박스 배열을
+        반환합니다.
+        변환하지 못한 샘플은 ``outputs`` 가 빈 항목으로 기록되어 원본이 바뀔 때까지
+        다시 시도하지 않습니다. 라벨 파일의 잘못된 줄 수는 항목의 ``malformed`` 에 기록합니다.
+        """
+        pcb_data_path = self.dataset_path / 'PCBData'
+        entries = []
+        stats = {'seconds': 0.0, 'bytes': 0, 'modes': Counter()}
+        pending = []
+
+        for img_path, label_path, split in samples:
+            key = img_path.relative_to(pcb_data_path).as_posix()
+            entry = {
+                'split': split,
+                'image': _file_record(img_path),
+                'label': _file_record(label_path) if label_path is not None else None,
+                'outputs': [],
+            }
+            entries.append((key, entry))
+
+            if label_path is None:
+                logger.warning(f"Label file not found for: {img_path}")
+                continue
+
+            # 헤더에서 이미지 크기 확인
+            try:
+                width, height, _ = read_image_header(str(img_path))
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to read image header: {img_path} ({e})")
+                continue
+            pending.append((entry, img_path, label_path, split, width, height))
+
+        # 라벨 로드 및 변환 (작업 단위 전체를 한 번에)
+        boxes, counts, malformed = parse_deeppcb_labels([item[2] for item in pending])
+        widths = np.repeat([item[4] for item in pending], counts)
+        heights = np.repeat([item[5] for item in pending], counts)
+        yolo_labels = deeppcb_to_yolo(boxes, widths, heights)
+        contents = format_yolo_labels(yolo_labels, counts)
+        offsets = np.concatenate([[0], np.cumsum(counts)]).tolist()
+        label_stats = {}
+
+        for index, ((entry, img_path, label_path, split, width, height), count, bad, content) in enumerate(zip(
+                pending, counts.tolist(), malformed.tolist(), contents)):
+            if bad:
+                logger.warning(f"Skipped {bad} malformed label lines in: {label_path}")
+                entry['malformed'] = bad
+
+            if not count:
+                logger.warning(f"No valid labels for: {img_path}")
+                continue
+
+            # 파일 복사
+            dst_img = Path('images') / split / f"{img_path.stem}.jpg"
+            dst_label = Path('labels') / split / f"{img_path.stem}.txt"
+
+            # 이미지 배치 (복사 또는 링크)
+            started = time.perf_counter()
+            used_mode, written = materialize(img_path, output_path / dst_img, link_mode)
+            stats['seconds'] += time.perf_counter() - started
+            stats['bytes'] += written
+            stats['modes'][used_mode] += 1
+
+            # YOLO 형식 라벨 저장
+            with open(output_path / dst_label, 'w') as f:
+                f.write(content)
+
+            entry['outputs'] = [dst_img.as_posix(), dst_label.as_posix()]
+            label_stat = (output_path / dst_label).stat()
+            rows = yolo_labels[offsets[index]:offsets[index + 1]]
+            label_stats[dst_label.as_posix()] = {
+                'source': (label_stat.st_size, label_stat.st_mtime_ns),
+                'shape': (height, width),
+                'xywh': rows[:, 1:].astype(np.float32),
+                'cls': rows[:, 0].astype(np.int16),
+            }
+
+        return entries, stats, label_stats
+
+    @staticmethod
+    def _load_manifest(manifest_path: Path) -> Dict[str, Dict]:
+        """매니페스트의 샘플 항목을 읽음 (없거나 버전이 다르면 빈 딕셔너리)"""
+        if not manifest_path.exists():
+            return {}
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable manifest {manifest_path}: {e}")
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            logger.warning(f"Ignoring manifest with unsupported version: {manifest_path}")
+            return {}
+        return manifest.get('samples', {})
+
+    @staticmethod
+    def _save_manifest(manifest_path: Path, samples: Dict[str, Dict]):
+        """매니페스트를 임시 파일에 쓴 뒤 원자적으로 교체"""
+        tmp_path = manifest_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'samples': samples}, f, separators=(',', ':'))
+        os.replace(tmp_path, manifest_path)
+
+    @classmethod
+    def update_stats(cls, output_path: str) -> DatasetStats:
+        """변환하지 않고 준비된 데이터셋의 통계 색인만 증분 갱신
+
+        매니페스트에서 라벨별 원본 그룹을 찾고, 색인 이후 새로 생기거나 바뀐
+        라벨 파일만 읽습니다.
+        """
+        output_path = Path(output_path)
+        samples = cls._load_manifest(output_path / MANIFEST_NAME)
+        return update_dataset_stats(output_path, groups=label_groups(samples), names=CLASS_NAMES)
+
+    @staticmethod
+    def _remove_outputs(output_path: Path, entry: Dict):
+        """매니페스트 항목이 만든 출력 파일 삭제"""
+        for rel_path in entry.get('outputs', []):
+            try:
+                (output_path / rel_path).unlink()
+            except FileNotFoundError:
+                pass
+
+    def prepare_dataset(self, output_path: str, workers: Optional[int] = 1, incremental: bool = True,
+                        link_mode: str = 'copy'):
+        """DeepPCB 데이터셋을 YOLO 학습용으로 준비
+
+        출력 폴더의 ``manifest.json`` 에 원본 이미지/라벨의 크기, 수정 시각, 해시와
+        생성한 출력 파일을 기록합니다. 다음 실행에서는 새로 생기거나 바뀐 샘플만
+        변환하고, 원본이 사라진 샘플의 출력은 삭제합니다. 변환하면서 만든 박스
+        배열로 통계 색인(``stats.npz``, ``stats.json``)도 함께 갱신합니다.
+
+        Args:
+            output_path: 출력 경로
+            workers: 변환 프로세스 수 (1이면 현재 프로세스에서 순차 처리, None이면 CPU 수)
+            incremental: False이면 매니페스트와 관계없이 모든 샘플을 다시 변환
+            link_mode: 이미지 배치 방식 ('copy', 'hardlink', 'symlink', 'reflink')
+        """
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Unsupported link mode: {link_mode}")
         output_path = Path(output_path)
         
         # 출력 디렉터리 생성
@@ -90,8 +459,6 @@ class DeepPCBLoader:
         
         # DeepPCB 구조 탐색
         pcb_data_path = self.dataset_path / 'PCBData'
-        total_images = 0
-        processed_images = 0
         
         # 모든 그룹 폴더 탐색
         group_folders = sorted([d for d in pcb_data_path.iterdir() if d.is_dir() and d.name.startswith('group')])
@@ -100,74 +467,93 @@ class DeepPCBLoader:
             raise ValueError(f"No group folders found in {pcb_data_path}")
         
         logger.info(f"Found {len(group_folders)} group folders")
-        
-        # 각 그룹 폴더 처리
-        for group_idx, group_folder in enumerate(group_folders):
-            # 그룹 내의 하위 폴더 찾기
-            sub_folders = [d for d in group_folder.iterdir() if d.is_dir() and not d.name.endswith('_not')]
-            
-            for sub_folder in sub_folders:
-                # 이미지 파일들 찾기
-                image_files = list(sub_folder.glob('*.jpg')) + list(sub_folder.glob('*.JPG'))
-                
-                # 대응하는 라벨 폴더
-                label_folder = group_folder / f"{sub_folder.name}_not"
-                
-                if not label_folder.exists():
-                    logger.warning(f"Label folder not found: {label_folder}")
+
+        if link_mode in ('hardlink', 'reflink') and pcb_data_path.stat().st_dev != output_path.stat().st_dev:
+            logger.warning(f"Source and output are on different filesystems; falling back from {link_mode} to copy")
+            link_mode = 'copy'
+
+        manifest_path = output_path / MANIFEST_NAME
+        previous = self._load_manifest(manifest_path)
+        samples_by_group = self._collect_samples(group_folders)
+        total_images = sum(len(samples) for samples in samples_by_group)
+
+        # 매니페스트와 비교하여 변환이 필요한 샘플만 남김
+        current: Dict[str, Dict] = {}
+        tasks: List[List[Sample]] = []
+        seen = set()
+        for samples in samples_by_group:
+            todo = []
+            for img_path, label_path, split in samples:
+                key = img_path.relative_to(pcb_data_path).as_posix()
+                seen.add(key)
+                entry = previous.get(key)
+                if (incremental and entry is not None
+                        and entry['split'] == split
+                        and _same_source(entry['image'], img_path)
+                        and _same_source(entry['label'], label_path)
+                        and all((output_path / rel).exists() for rel in entry['outputs'])):
+                    current[key] = entry
                     continue
-                
-                for img_path in image_files:
-                    total_images += 1
-                    
-                    # 대응하는 라벨 파일
-                    label_path = label_folder / f"{img_path.stem}.txt"
-                    
-                    if not label_path.exists():
-                        logger.warning(f"Label file not found: {label_path}")
-                        continue
-                    
-                    # 80% train, 20% val 분할 (그룹 단위로)
-                    split = 'train' if group_idx < len(group_folders) * 0.8 else 'val'
-                    
-                    # 이미지 읽어서 크기 확인
-                    img = cv2.imread(str(img_path))
-                    if img is None:
-                        logger.error(f"Failed to read image: {img_path}")
-                        continue
-                    
-                    height, width = img.shape[:2]
-                    
-                    # 라벨 로드 및 변환
-                    annotations = self.load_deeppcb_annotation(str(label_path))
-                    yolo_labels = self.convert_to_yolo_format(annotations, width, height)
-                    
-                    if not yolo_labels:
-                        logger.warning(f"No valid labels for: {img_path}")
-                        continue
-                    
-                    # 파일 복사
-                    dst_img = output_path / 'images' / split / f"{img_path.stem}.jpg"
-                    dst_label = output_path / 'labels' / split / f"{img_path.stem}.txt"
-                    
-                    # 이미지 복사
-                    shutil.copy2(img_path, dst_img)
-                    
-                    # YOLO 형식 라벨 저장
-                    with open(dst_label, 'w') as f:
-                        f.write('\n'.join(yolo_labels))
-                    
-                    processed_images += 1
-                    
-                    if processed_images % 100 == 0:
-                        logger.info(f"Processed {processed_images}/{total_images} images")
-        
+                if entry is not None:
+                    self._remove_outputs(output_path, entry)
+                todo.append((img_path, label_path, split))
+            if todo:
+                tasks.append(todo)
+
+        removed = [key for key in previous if key not in seen]
+        for key in removed:
+            self._remove_outputs(output_path, previous[key])
+
+        pending = sum(len(todo) for todo in tasks)
+        logger.info(f"Samples: {total_images} found, {len(current)} unchanged, "
+                    f"{pending} to convert, {len(removed)} removed")
+
+        converted = 0
+        totals = {'seconds': 0.0, 'bytes': 0, 'modes': Counter()}
+        label_stats: Dict[str, Dict] = {}
+
+        def merge(result):
+            entries, stats, labels = result
+            current.update(entries)
+            label_stats.update(labels)
+            totals['seconds'] += stats['seconds']
+            totals['bytes'] += stats['bytes']
+            totals['modes'].update(stats['modes'])
+
+        workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+        if workers <= 1:
+            for done, todo in enumerate(tasks, 1):
+                merge(self._convert_samples(todo, output_path, link_mode))
+                converted += len(todo)
+                logger.info(f"Processed {converted}/{pending} images ({done}/{len(tasks)} groups)")
+        else:
+            logger.info(f"Converting with {workers} worker processes")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(self._convert_samples, todo, output_path, link_mode): todo
+                           for todo in tasks}
+                for done, future in enumerate(as_completed(futures), 1):
+                    merge(future.result())
+                    converted += len(futures[future])
+                    logger.info(f"Processed {converted}/{pending} images ({done}/{len(tasks)} groups)")
+
+        if totals['modes']:
+            modes = ', '.join(f"{mode}={count}" for mode, count in sorted(totals['modes'].items()))
+            logger.info(f"Materialized images ({modes}) in {totals['seconds']:.2f}s, "
+                        f"{totals['bytes'] / 1e6:.1f} MB written")
+
+        self._save_manifest(manifest_path, current)
+        update_dataset_stats(output_path, groups=label_groups(current), fresh=label_stats, names=CLASS_NAMES)
+
+        processed_images = sum(1 for entry in current.values() if entry['outputs'])
         logger.info(f"Processing complete!")
         logger.info(f"Total images found: {total_images}")
         logger.info(f"Successfully processed: {processed_images}")
+        malformed_lines = sum(entry.get('malformed', 0) for entry in current.values())
+        if malformed_lines:
+            logger.info(f"Malformed label lines: {malformed_lines}")
         
-        train_count = len(list((output_path / 'images' / 'train').glob('*.jpg')))
-        val_count = len(list((output_path / 'images' / 'val').glob('*.jpg')))
+        train_count = sum(1 for entry in current.values() if entry['outputs'] and entry['split'] == 'train')
+        val_count = sum(1 for entry in current.values() if entry['outputs'] and entry['split'] == 'val')
         logger.info(f"Train: {train_count} images")
         logger.info(f"Val: {val_count} images")
         
@@ -202,4 +588,4 @@ nc: 6
         
     def get_class_names(self) -> List[str]:
         """DeepPCB 클래스 이름 반환"""
-        return ['open', 'short', 'mousebite', 'spur', 'copper', 'pin-hole']
+        return list(CLASS_NAMES)
@@ -1,8 +1,357 @@
 """추론을 실행하는 모듈."""
-from typing import Any, List
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 
-def run_inference(model: Any, images: List[str]) -> List[Any]:
-    """모델과 전처리된 이미지로 추론을 수행합니다."""
-    print("추론 실행 ...")
-    return []
+from modules.data_loader import DecodedImageCache, load_single_image
+from modules.metrics import NULL_METRICS, Metrics
+from modules.postprocessor import Detections, result_arrays, scale_boxes
+from modules.preprocessor import LetterboxBatch
+
+logger = logging.getLogger(__name__)
+
+# 기본 배치/프리페치 설정 (config.yaml의 inference 섹션으로 덮어씀)
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_PREFETCH = 2
+DEFAULT_NUM_WORKERS = 4
+
+# 타일 추론 기본 설정
+DEFAULT_TILE_SIZE = 640
+DEFAULT_TILE_OVERLAP = 0.2
+
+
+def _batched(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    """이터러블을 ``size`` 개씩 묶어 반환합니다."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _try_load(image_path: str, cache: Optional[DecodedImageCache] = None) -> Optional[np.ndarray]:
+    """이미지를 디코딩하고 실패하면 ``None`` 을 반환합니다."""
+    try:
+        return load_single_image(image_path, cache=cache)
+    except Exception:
+        return None
+
+
+def _load_into(image_path: str, batch: LetterboxBatch, slot: int,
+               cache: Optional[DecodedImageCache] = None) -> Optional[np.ndarray]:
+    """이미지를 디코딩하여 레터박스 버퍼 ``slot`` 에 채우고 원본 이미지를 반환합니다 (실패하면 None)."""
+    image = _try_load(image_path, cache)
+    if image is not None:
+        batch.fill(slot, image)
+    return image
+
+
+def tile_offsets(height: int, width: int, tile_size: int, overlap: float) -> List[Tuple[int, int]]:
+    """겹치는 타일들의 좌상단 좌표 (y, x) 목록을 계산합니다.
+
+    마지막 행/열 타일은 이미지 가장자리에 맞춰 정렬되므로 모든 타일이
+    이미지 내부에 위치합니다. 이미지가 타일보다 작으면 타일 하나만 반환합니다.
+
+    Args:
+        height: 이미지 높이
+        width: 이미지 너비
+        tile_size: 타일 한 변의 길이 (픽셀)
+        overlap: 인접 타일 간 겹침 비율 (0 이상 1 미만)
+
+    Returns:
+        (y, x) 좌표 리스트
+    """
+    if not 0 <= overlap < 1:
+        raise ValueError(f"overlap은 0 이상 1 미만이어야 합니다: {overlap}")
+    stride = max(1, int(round(tile_size * (1 - overlap))))
+
+    def starts(length: int) -> List[int]:
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, stride))
+        positions.append(length - tile_size)
+        return positions
+
+    return [(y, x) for y in starts(height) for x in starts(width)]
+
+
+def run_tiled_inference(
+    model: Any,
+    images: Iterable[str],
+    tile_size: int = DEFAULT_TILE_SIZE,
+    overlap: float = DEFAULT_TILE_OVERLAP,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    confidence: float = 0.5,
+    stats: Optional[Dict[str, Any]] = None,
+    cache: Optional[DecodedImageCache] = None,
+    metrics: Optional[Metrics] = None,
+    with_images: bool = False,
+) -> Iterator[Union[Detections, Tuple[Detections, np.ndarray]]]:
+    """대형 패널 이미지를 겹치는 타일로 나누어 추론합니다.
+
+    타일은 디코딩된 패널 배열의 뷰(view)이며 복사되지 않습니다. 한 패널의
+    타일들은 ``batch_size`` 단위로 모델에 들어가고, 검출 박스는 패널 좌표계로
+    옮겨집니다. 패널 하나를 처리하는 동안 다음 패널을 백그라운드에서
+    디코딩합니다.
+
+    Args:
+        model: ``model_loader.load_model`` 로 로드한 모델 백엔드
+        images: 패널 이미지 파일 경로 이터러블
+        tile_size: 타일 한 변의 길이 (픽셀)
+        overlap: 인접 타일 간 겹침 비율
+        batch_size: 한 번에 모델에 넣을 타일 수
+        confidence: 신뢰도 임계값
+        stats: 전달되면 처리량/지연 통계를 채워 넣을 딕셔너리
+        cache: 전달되면 디코딩된 이미지를 캐시에서 재사용
+        metrics: 전달되면 배치 지연과 처리/실패 수를 기록할 계측기
+        with_images: True이면 (``Detections``, 디코딩된 패널) 쌍을 내보냄 (시각화/크롭이 다시 디코딩하지 않도록)
+
+    Yields:
+        패널별 ``Detections`` (``tiled=True``, 타일 경계 병합 전)
+    """
+    metrics = metrics or NULL_METRICS
+    batch_size = max(1, int(batch_size))
+    batch_latencies: List[float] = []
+    num_images = 0
+    num_tiles = 0
+    num_failed = 0
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="decode") as executor:
+        paths = iter(images)
+        next_path = next(paths, None)
+        next_future = executor.submit(_try_load, next_path, cache) if next_path is not None else None
+
+        while next_future is not None:
+            path, panel = next_path, next_future.result()
+            next_path = next(paths, None)
+            next_future = executor.submit(_try_load, next_path, cache) if next_path is not None else None
+
+            if panel is None:
+                num_failed += 1
+                metrics.inc("images_failed_total", stage="decode")
+                logger.warning(f"디코딩 실패로 패널을 건너뜁니다: {path}")
+                continue
+
+            height, width = panel.shape[:2]
+            offsets = tile_offsets(height, width, tile_size, overlap)
+            xyxy_parts, conf_parts, cls_parts = [], [], []
+
+            for start in range(0, len(offsets), batch_size):
+                batch_offsets = offsets[start:start + batch_size]
+                tiles = [panel[y:y + tile_size, x:x + tile_size] for y, x in batch_offsets]
+
+                batch_start = time.perf_counter()
+                results = model(tiles, conf=confidence, verbose=False)
+                batch_latencies.append(time.perf_counter() - batch_start)
+                metrics.observe("batch_seconds", batch_latencies[-1], stage="model")
+                metrics.observe("batch_size", len(tiles))
+                metrics.inc("batches_total")
+
+                for (y, x), result in zip(batch_offsets, results):
+                    xyxy, conf, cls = result_arrays(result)
+                    if len(xyxy):
+                        xyxy_parts.append(xyxy + np.array([x, y, x, y], dtype=np.float32))
+                        conf_parts.append(conf)
+                        cls_parts.append(cls)
+
+            num_images += 1
+            num_tiles += len(offsets)
+            metrics.inc("images_processed_total")
+            logger.debug(f"패널 {path}: {len(offsets)}개 타일, "
+                         f"{sum(len(c) for c in conf_parts)}개 박스")
+
+            det = Detections(
+                path=path,
+                xyxy=np.concatenate(xyxy_parts) if xyxy_parts else np.zeros((0, 4), np.float32),
+                conf=np.concatenate(conf_parts) if conf_parts else np.zeros(0, np.float32),
+                cls=np.concatenate(cls_parts) if cls_parts else np.zeros(0, np.int64),
+                orig_shape=(height, width),
+                tiled=True,
+            )
+            yield (det, panel) if with_images else det
+
+    elapsed = time.perf_counter() - started
+    throughput = num_tiles / elapsed if elapsed > 0 else 0.0
+    latencies_ms = np.asarray(batch_latencies) * 1000.0
+
+    if stats is not None:
+        stats.update({
+            "images": num_images,
+            "tiles": num_tiles,
+            "failed": num_failed,
+            "batches": len(batch_latencies),
+            "elapsed": elapsed,
+            "tiles_per_sec": throughput,
+            "batch_latency_ms": latencies_ms.tolist(),
+        })
+
+    if batch_latencies:
+        logger.info(f"타일 추론 완료: 패널 {num_images}개, 타일 {num_tiles}개, "
+                    f"{throughput:.2f} tiles/s, 배치 지연 p50 "
+                    f"{np.percentile(latencies_ms, 50):.1f} ms / max {latencies_ms.max():.1f} ms")
+    else:
+        logger.info("타일 추론 완료: 처리된 패널이 없습니다.")
+
+
+def run_inference(
+    model: Any,
+    images: Iterable[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    prefetch: int = DEFAULT_PREFETCH,
+    num_workers: int = DEFAULT_NUM_WORKERS,
+    confidence: float = 0.5,
+    stats: Optional[Dict[str, Any]] = None,
+    cache: Optional[DecodedImageCache] = None,
+    imgsz: Optional[int] = None,
+    metrics: Optional[Metrics] = None,
+    with_images: bool = False,
+) -> Iterator[Union[Detections, Tuple[Detections, np.ndarray]]]:
+    """모델과 전처리된 이미지로 배치 추론을 수행합니다.
+
+    이미지를 ``batch_size`` 단위로 묶고, 현재 배치가 모델을 통과하는 동안
+    다음 ``prefetch`` 개 배치를 스레드 풀에서 미리 디코딩합니다. 결과는
+    리스트로 모으지 않고 이미지 단위로 순서대로 내보냅니다.
+
+    ``imgsz`` 가 주어지면 디코딩 스레드가 이미지를 곧바로 레터박스하여
+    미리 할당된 배치 버퍼(``prefetch + 1`` 개를 돌려 씀)에 채우고, 박스는
+    원본 좌표로 되돌립니다.
+
+    Args:
+        model: ``model_loader.load_model`` 로 로드한 모델 백엔드
+        images: 이미지 파일 경로 이터러블
+        batch_size: 한 번에 모델에 넣을 이미지 수
+        prefetch: 미리 디코딩해 둘 배치 수
+        num_workers: 디코딩 스레드 수
+        confidence: 신뢰도 임계값
+        stats: 전달되면 처리량/지연 통계를 채워 넣을 딕셔너리
+        cache: 전달되면 디코딩된 이미지를 캐시에서 재사용
+        imgsz: 레터박스 입력 크기 (None이면 모델 자체 전처리 사용)
+        metrics: 전달되면 배치별 디코딩 대기/모델 시간과 처리/실패 수를 기록할 계측기
+        with_images: True이면 (``Detections``, 디코딩된 원본 이미지) 쌍을 내보냄 (시각화/크롭이 다시 디코딩하지 않도록)
+
+    Yields:
+        이미지별 ``Detections`` (원본 이미지 좌표계)
+    """
+    metrics = metrics or NULL_METRICS
+    batch_size = max(1, int(batch_size))
+    prefetch = max(1, int(prefetch))
+    num_workers = max(1, int(num_workers))
+
+    batch_latencies: List[float] = []
+    num_images = 0
+    num_failed = 0
+    started = time.perf_counter()
+
+    # 디코딩 중인 배치 ``prefetch`` 개 + 모델을 통과 중인 배치 1개
+    free_buffers: deque = deque(
+        LetterboxBatch(batch_size, imgsz) for _ in range(prefetch + 1)
+    ) if imgsz else deque()
+
+    with ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="decode") as executor:
+        pending: deque = deque()
+        batches = _batched(images, batch_size)
+
+        def submit_next() -> bool:
+            chunk = next(batches, None)
+            if chunk is None:
+                return False
+            if imgsz:
+                buffer = free_buffers.popleft()
+                futures = [executor.submit(_load_into, p, buffer, slot, cache) for slot, p in enumerate(chunk)]
+            else:
+                buffer = None
+                futures = [executor.submit(_try_load, p, cache) for p in chunk]
+            pending.append((chunk, futures, buffer))
+            return True
+
+        for _ in range(prefetch):
+            if not submit_next():
+                break
+
+        while pending:
+            paths, futures, buffer = pending.popleft()
+            # 현재 배치를 기다리는 동안 다음 배치 디코딩을 예약
+            submit_next()
+
+            wait_start = time.perf_counter()
+            outcomes = [f.result() for f in futures]
+            # 디코딩이 모델보다 느리면 이 대기 시간이 커짐
+            metrics.observe("batch_seconds", time.perf_counter() - wait_start, stage="decode_wait")
+            batch_paths = [p for p, img in zip(paths, outcomes) if img is not None]
+            decoded = [img for img in outcomes if img is not None]
+            if buffer is None:
+                batch_images = decoded
+            else:
+                # 실패한 슬롯을 건너뛰도록 앞으로 당김
+                ok_slots = [slot for slot, img in enumerate(outcomes) if img is not None]
+                for new_slot, old_slot in enumerate(ok_slots):
+                    if new_slot != old_slot:
+                        buffer.move(old_slot, new_slot)
+                batch_images = buffer.images[:len(ok_slots)]
+
+            failed = len(paths) - len(batch_paths)
+            if failed:
+                num_failed += failed
+                metrics.inc("images_failed_total", failed, stage="decode")
+                logger.warning(f"디코딩 실패로 {failed}개 이미지를 건너뜁니다: "
+                               f"{[p for p in paths if p not in batch_paths]}")
+            if not batch_paths:
+                if buffer is not None:
+                    free_buffers.append(buffer)
+                continue
+
+            batch_start = time.perf_counter()
+            results = model(batch_images, conf=confidence, verbose=False)
+            detections = []
+            for slot, (path, result) in enumerate(zip(batch_paths, results)):
+                xyxy, conf, cls = result_arrays(result)
+                if buffer is None:
+                    orig_shape = batch_images[slot].shape[:2]
+                else:
+                    meta = buffer.meta[slot]
+                    xyxy = scale_boxes(xyxy, meta)
+                    orig_shape = (int(meta[3]), int(meta[4]))
+                detections.append(Detections(path=path, xyxy=xyxy, conf=conf, cls=cls,
+                                             orig_shape=orig_shape))
+            if buffer is not None:
+                free_buffers.append(buffer)
+            latency = time.perf_counter() - batch_start
+            batch_latencies.append(latency)
+            num_images += len(batch_paths)
+            metrics.observe("batch_seconds", latency, stage="model")
+            metrics.observe("batch_size", len(batch_paths))
+            metrics.inc("batches_total")
+            metrics.inc("images_processed_total", len(batch_paths))
+
+            logger.debug(f"배치 {len(batch_latencies)}: {len(batch_paths)}개 이미지, "
+                         f"{latency * 1000:.1f} ms")
+
+            yield from zip(detections, decoded) if with_images else detections
+
+    elapsed = time.perf_counter() - started
+    throughput = num_images / elapsed if elapsed > 0 else 0.0
+    latencies_ms = np.asarray(batch_latencies) * 1000.0
+
+    if stats is not None:
+        stats.update({
+            "images": num_images,
+            "failed": num_failed,
+            "batches": len(batch_latencies),
+            "elapsed": elapsed,
+            "images_per_sec": throughput,
+            "batch_latency_ms": latencies_ms.tolist(),
+        })
+
+    if batch_latencies:
+        logger.info(f"추론 완료: {num_images}개 이미지, {throughput:.2f} images/s, "
+                    f"배치 지연 p50 {np.percentile(latencies_ms, 50):.1f} ms / "
+                    f"max {latencies_ms.max():.1f} ms")
+    else:
+        logger.info("추론 완료: 처리된 이미지가 없습니다.")
@@ -0,0 +1,316 @@
+"""파이프라인 계측(카운터, 지연 히스토그램) 모듈.
+
+추론 파이프라인의 단계와 배치마다 처리/건너뜀/실패 이미지 수와 소요 시간을
+기록하고, 실행이 끝날 때 또는 감시/서버 모드에서 주기적으로 Prometheus 텍스트
+형식과 JSON 파일로 내보냅니다.
+
+값 하나를 기록하는 비용은 잠금 한 번과 딕셔너리 조회, 버킷 이분 탐색뿐이며,
+배치/단계 단위로만 기록하므로 이미지 단위 처리에 비해 무시할 수 있습니다.
+``Metrics(enabled=False)`` 는 모든 기록을 즉시 반환하는 빈 계측기입니다.
+
+사용 예::
+
+    metrics = Metrics()
+    with metrics.stage("load_images"):
+        images = load_images(input_dir)
+    metrics.inc("images_processed_total", len(images))
+    metrics.write(prometheus_path="results/metrics.prom", json_path="results/metrics.json")
+"""
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 모든 지표 이름 앞에 붙는 접두사
+NAMESPACE = "liteaoi"
+
+# 지연 히스토그램 기본 버킷 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# 배치 크기 히스토그램 버킷
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+# 주기적 내보내기 기본 간격 (초)
+DEFAULT_FLUSH_INTERVAL = 15.0
+
+# 지표 설명 (Prometheus ``# HELP`` 줄)
+METRIC_HELP = {
+    "images_processed_total": "추론을 마친 이미지 수",
+    "images_skipped_total": "추론하지 않고 건너뛴 이미지 수 (reason별)",
+    "images_failed_total": "디코딩/추론에 실패한 이미지 수 (stage별)",
+    "batches_total": "모델에 넣은 배치 수",
+    "requests_total": "서버가 받은 추론 요청 수",
+    "stage_seconds": "파이프라인 단계 소요 시간 (초)",
+    "batch_seconds": "배치 단위 처리 시간 (초, stage별)",
+    "batch_size": "모델에 넣은 배치 크기",
+    "request_seconds": "서버 요청 큐 대기부터 결과까지의 지연 (초)",
+    "arrival_to_result_seconds": "감시 모드의 파일 도착부터 결과 기록까지의 지연 (초)",
+    "queue_depth": "배치를 기다리는 이미지 수",
+    "in_flight": "처리 중인 이미지 수",
+}
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram과 같은 구조)."""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """버킷 안에서 선형 보간한 분위수를 반환합니다 (``histogram_quantile`` 과 같은 방식)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if cumulative + n >= rank and n:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - cumulative) / n, self.max)
+            cumulative += n
+        return self.max
+
+
+def _format_labels(labels: _Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for _, value in items)
+    body = ",".join(f'{key}="{value}"' for (key, _), value in zip(items, escaped))
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _write_atomic(path: str, text: str) -> None:
+    """임시 파일에 쓴 뒤 교체하여 수집기가 반쯤 쓴 파일을 읽지 않도록 합니다."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class TimedIterator:
+    """항목을 꺼내는 데 걸린 시간의 합(``seconds``)을 재는 이터레이터 래퍼.
+
+    제너레이터 파이프라인에서는 앞 단계(디코딩/추론)가 뒤 단계(요약 등)의
+    반복 안에서 실행되므로, 앞 단계를 이 래퍼로 감싸고 뒤 단계는
+    ``Metrics.stage(..., exclude=...)`` 로 재면 두 시간을 나누어 기록할 수 있습니다.
+    """
+
+    def __init__(self, iterable: Iterable[Any]):
+        self._iterator = iter(iterable)
+        self.seconds = 0.0
+
+    def __iter__(self) -> "TimedIterator":
+        return self
+
+    def __next__(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return next(self._iterator)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+
+class Metrics:
+    """카운터, 게이지, 히스토그램을 모으는 스레드 안전 계측기.
+
+    Args:
+        enabled: False이면 모든 기록을 무시
+        namespace: 내보낼 때 지표 이름 앞에 붙일 접두사
+    """
+
+    def __init__(self, enabled: bool = True, namespace: str = NAMESPACE):
+        self.enabled = enabled
+        self.namespace = namespace
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[_Labels, float]] = {}
+        self._gauges: Dict[str, Dict[_Labels, float]] = {}
+        self._histograms: Dict[str, Dict[_Labels, _Histogram]] = {}
+        self._buckets: Dict[str, Sequence[float]] = {"batch_size": BATCH_SIZE_BUCKETS}
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """카운터를 ``value`` 만큼 증가시킵니다."""
+        if not self.enabled:
+            return
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        """게이지 값을 설정합니다."""
+        if not self.enabled:
+            return
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """히스토그램에 값을 기록합니다 (버킷은 ``set_buckets`` 또는 지연 기본값)."""
+        if not self.enabled:
+            return
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self._buckets.get(name, LATENCY_BUCKETS))
+            histogram.observe(value)
+
+    def set_buckets(self, name: str, buckets: Sequence[float]) -> None:
+        """히스토그램 ``name`` 의 버킷을 지정합니다 (첫 기록 전에 호출)."""
+        self._buckets[name] = tuple(buckets)
+
+    @contextmanager
+    def stage(self, name: str, exclude: Optional[TimedIterator] = None, **labels: Any) -> Iterator[None]:
+        """블록 실행 시간을 ``stage_seconds{stage=name}`` 에 기록합니다.
+
+        ``exclude`` 가 주어지면 블록 안에서 그 이터레이터가 항목을 꺼내는 데 쓴 시간은 뺍니다.
+        """
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        excluded = exclude.seconds if exclude is not None else 0.0
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if exclude is not None:
+                elapsed -= exclude.seconds - excluded
+            self.observe("stage_seconds", elapsed, stage=name, **labels)
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식 문자열을 반환합니다."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str) -> str:
+            full = f"{self.namespace}_{name}"
+            if name in METRIC_HELP:
+                lines.append(f"# HELP {full} {METRIC_HELP[name]}")
+            lines.append(f"# TYPE {full} {kind}")
+            return full
+
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = header(name, "counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{full}{_format_labels(labels)} {_format_value(value)}")
+            for name, series in sorted(self._gauges.items()):
+                full = header(name, "gauge")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{full}{_format_labels(labels)} {_format_value(value)}")
+            for name, series in sorted(self._histograms.items()):
+                full = header(name, "histogram")
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, n in zip(histogram.buckets, histogram.counts):
+                        cumulative += n
+                        lines.append(f"{full}_bucket{_format_labels(labels, ('le', repr(float(bound))))} "
+                                     f"{cumulative}")
+                    lines.append(f"{full}_bucket{_format_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{full}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{full}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON으로 저장할 수 있는 요약 딕셔너리를 반환합니다.
+
+        히스토그램은 개수, 합계, 평균, p50/p95(버킷 보간), 최댓값으로 요약합니다.
+        시리즈 키는 ``이름{라벨=값,...}`` 형식입니다.
+        """
+        def key(name: str, labels: _Labels) -> str:
+            return name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "uptime_sec": time.time() - self.started,
+                "counters": {key(name, labels): value
+                             for name, series in self._counters.items() for labels, value in series.items()},
+                "gauges": {key(name, labels): value
+                           for name, series in self._gauges.items() for labels, value in series.items()},
+                "histograms": {
+                    key(name, labels): {
+                        "count": h.count,
+                        "sum": h.sum,
+                        "mean": h.sum / h.count if h.count else 0.0,
+                        "p50": h.quantile(0.5),
+                        "p95": h.quantile(0.95),
+                        "max": h.max,
+                    }
+                    for name, series in self._histograms.items() for labels, h in series.items()
+                },
+            }
+
+    def write(self, prometheus_path: Optional[str] = None, json_path: Optional[str] = None) -> None:
+        """지표를 Prometheus 텍스트 파일과/또는 JSON 파일로 저장합니다."""
+        if not self.enabled:
+            return
+        if prometheus_path:
+            _write_atomic(prometheus_path, self.to_prometheus())
+        if json_path:
+            _write_atomic(json_path, json.dumps(self.to_dict(), indent=2, ensure_ascii=False))
+
+    def start_flusher(self, interval: float = DEFAULT_FLUSH_INTERVAL,
+                      prometheus_path: Optional[str] = None, json_path: Optional[str] = None) -> None:
+        """``interval`` 초마다 지표 파일을 다시 쓰는 백그라운드 스레드를 시작합니다.
+
+        감시/서버 모드처럼 끝나지 않는 실행에서 사용하며, ``stop_flusher`` 가
+        마지막으로 한 번 더 기록합니다.
+        """
+        if not self.enabled or self._flusher is not None or not (prometheus_path or json_path):
+            return
+
+        def run() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.write(prometheus_path, json_path)
+                except OSError as e:
+                    logger.warning(f"지표 파일 기록 실패: {e}")
+            self.write(prometheus_path, json_path)
+
+        self._stop.clear()
+        self._flusher = threading.Thread(target=run, name="metrics-flush", daemon=True)
+        self._flusher.start()
+
+    def stop_flusher(self) -> None:
+        """주기적 기록 스레드를 멈추고 마지막 지표를 기록합니다."""
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+
+
+# ``metrics`` 인자가 없을 때 사용하는 비활성 계측기
+NULL_METRICS = Metrics(enabled=False)
@@ -1,23 +1,220 @@
-"""학습된 모델을 로드하는 모듈."""
+"""학습된 모델을 로드하는 모듈.
+
+모델은 백엔드 레지스트리를 통해 로드됩니다. 모든 백엔드는
+``model(images, conf=..., verbose=...)`` 형태로 호출되며, 이미지 리스트(BGR 배열)
+또는 ``preprocessor.LetterboxBatch`` 로 전처리된 (B, 3, H, W) float32 배치를
+받아 ``postprocessor.result_arrays`` 로 읽을 수 있는 이미지별 결과를 반환합니다.
+"""
+import ast
 import logging
-from typing import Any, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type, Union
 from pathlib import Path
-import torch
-from ultralytics import YOLO
+import numpy as np
+
+from modules.postprocessor import Detections, nms, scale_boxes
+from modules.preprocessor import DEFAULT_IMGSZ, LetterboxBatch, preprocess
 
 logger = logging.getLogger(__name__)
 
+# 백엔드 이름 → 클래스, 확장자 → 기본 백엔드 이름
+BACKENDS: Dict[str, Type] = {}
+EXTENSION_BACKENDS: Dict[str, str] = {}
+
+# ONNX 후처리 기본값 (ultralytics 예측 기본값과 동일)
+DEFAULT_IOU = 0.7
+DEFAULT_MAX_DET = 300
+
+
+def register_backend(name: str, extensions: Sequence[str] = ()) -> Callable[[Type], Type]:
+    """모델 백엔드 클래스를 레지스트리에 등록하는 데코레이터.
+
+    Args:
+        name: 백엔드 이름 (config.yaml의 ``model.backend`` 값)
+        extensions: 이 백엔드를 기본으로 사용할 모델 파일 확장자
+    """
+    def decorator(cls: Type) -> Type:
+        cls.name = name
+        BACKENDS[name] = cls
+        for ext in extensions:
+            EXTENSION_BACKENDS[ext.lower()] = name
+        return cls
+    return decorator
+
+
+@register_backend("torch", extensions=(".pt",))
+class TorchBackend:
+    """ultralytics YOLO (PyTorch) 백엔드."""
+
+    def __init__(self, model_path: str, device: str = "cuda", **options: Any):
+        import torch
+        from ultralytics import YOLO
+
+        # 장치 설정
+        if device == "cuda" and not torch.cuda.is_available():
+            logger.warning("CUDA를 사용할 수 없습니다. CPU로 전환합니다.")
+            device = "cpu"
+
+        # YOLO 모델 로드
+        self.model = YOLO(str(model_path))
+        self.model.to(device)
+        self.device = device
+
+    @property
+    def names(self) -> Dict[int, str]:
+        return self.model.names
+
+    def __call__(self, images: Union[List[np.ndarray], np.ndarray], conf: float = 0.5,
+                 verbose: bool = False) -> List[Any]:
+        # 전처리된 배치는 텐서로 넘기면 ultralytics가 자체 전처리를 건너뜀
+        if isinstance(images, np.ndarray) and images.ndim == 4:
+            import torch
+
+            images = torch.from_numpy(images)
+        return self.model(images, conf=conf, verbose=verbose)
+
+
+@register_backend("onnxruntime", extensions=(".onnx",))
+class OnnxRuntimeBackend:
+    """ONNX Runtime 백엔드 (ultralytics YOLOv8 detect ONNX 내보내기 형식).
+
+    레터박스 전처리와 클래스별 NMS를 NumPy로 수행하며, 결과는 ``Detections``
+    로 반환합니다. 전처리된 배치가 들어오면 박스는 레터박스 좌표계로,
+    이미지 리스트가 들어오면 원본 좌표계로 반환됩니다.
+    """
+
+    # 우선순위 순서대로 시도할 실행 공급자
+    PROVIDERS = ("CPUExecutionProvider",)
+
+    def __init__(self, model_path: str, device: str = "cpu", imgsz: Optional[int] = None,
+                 iou: float = DEFAULT_IOU, max_det: int = DEFAULT_MAX_DET,
+                 intra_op_threads: Optional[int] = None, **options: Any):
+        import onnxruntime as ort
+
+        available = ort.get_available_providers()
+        providers = [p for p in self._providers(device) if p in available] or ["CPUExecutionProvider"]
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            session_options.intra_op_num_threads = int(intra_op_threads)
+
+        self.session = ort.InferenceSession(str(model_path), sess_options=session_options, providers=providers)
+        self.input_name = self.session.get_inputs()[0].name
+        self.device = self.session.get_providers()[0]
+        self.iou = iou
+        self.max_det = max_det
+
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self._names = ast.literal_eval(metadata["names"]) if "names" in metadata else {}
+        if imgsz is None:
+            imgsz = ast.literal_eval(metadata["imgsz"])[0] if "imgsz" in metadata else DEFAULT_IMGSZ
+        self.imgsz = int(imgsz)
+        self._batch: Optional[LetterboxBatch] = None
+
+    def _providers(self, device: str) -> Sequence[str]:
+        if str(device).startswith("cuda"):
+            return ("CUDAExecutionProvider",) + tuple(self.PROVIDERS)
+        return self.PROVIDERS
+
+    @property
+    def names(self) -> Dict[int, str]:
+        return self._names
+
+    def _decode(self, output: np.ndarray, conf: float) -> List[Detections]:
+        """(B, 4 + nc, N) 출력을 이미지별 ``Detections`` (입력 좌표계)로 변환합니다."""
+        detections = []
+        for pred in output.transpose(0, 2, 1):
+            scores = pred[:, 4:]
+            cls = scores.argmax(axis=1)
+            best = scores[np.arange(len(scores)), cls]
+            keep = best >= conf
+            xywh, best, cls = pred[keep, :4], best[keep], cls[keep]
+
+            xyxy = np.empty_like(xywh)
+            xyxy[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+            xyxy[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+
+            keep = nms(xyxy, best, cls, self.iou)[:self.max_det]
+            detections.append(Detections(
+                path="",
+                xyxy=xyxy[keep].astype(np.float32, copy=False),
+                conf=best[keep].astype(np.float32, copy=False),
+                cls=cls[keep].astype(np.int64, copy=False),
+                orig_shape=(self.imgsz, self.imgsz),
+            ))
+        return detections
 
-def load_model(model_path: str, device: str = "cuda") -> YOLO:
+    def __call__(self, images: Union[List[np.ndarray], np.ndarray], conf: float = 0.5,
+                 verbose: bool = False) -> List[Detections]:
+        if isinstance(images, np.ndarray) and images.ndim == 4:
+            output = self.session.run(None, {self.input_name: images})[0]
+            return self._decode(output, conf)
+
+        # 이미지 리스트는 내부 버퍼에 레터박스한 뒤 원본 좌표로 되돌림
+        self._batch = preprocess(images, self.imgsz, self._batch)
+        output = self.session.run(None, {self.input_name: self._batch.images[:len(images)]})[0]
+        results = []
+        for slot, det in enumerate(self._decode(output, conf)):
+            meta = self._batch.meta[slot]
+            results.append(det._replace(xyxy=scale_boxes(det.xyxy, meta),
+                                        orig_shape=(int(meta[3]), int(meta[4]))))
+        return results
+
+
+@register_backend("openvino")
+class OpenVinoBackend(OnnxRuntimeBackend):
+    """ONNX Runtime의 OpenVINO 실행 공급자를 우선 사용하는 CPU 백엔드.
+
+    onnxruntime-openvino가 설치되어 있지 않으면 CPU 실행 공급자로 동작합니다.
+    """
+
+    PROVIDERS = ("OpenVINOExecutionProvider", "CPUExecutionProvider")
+
+
+def export_onnx(model_path: str, imgsz: int = DEFAULT_IMGSZ) -> Path:
+    """``.pt`` 모델을 ONNX로 내보내고 결과를 캐시합니다.
+
+    같은 폴더에 ``.onnx`` 파일이 이미 있고 원본보다 최신이면 다시 내보내지
+    않습니다. 배치 크기를 바꿀 수 있도록 동적 입력으로 내보냅니다.
+
+    Args:
+        model_path: ``.pt`` 모델 경로
+        imgsz: 내보낼 입력 크기
+
+    Returns:
+        ONNX 모델 경로
+    """
+    from ultralytics import YOLO
+
+    model_path = Path(model_path)
+    onnx_path = model_path.with_suffix(".onnx")
+    if onnx_path.exists() and onnx_path.stat().st_mtime >= model_path.stat().st_mtime:
+        logger.info(f"캐시된 ONNX 모델 사용: {onnx_path}")
+        return onnx_path
+
+    logger.info(f"ONNX 내보내기: {model_path} -> {onnx_path} (imgsz={imgsz})")
+    exported = YOLO(str(model_path)).export(format="onnx", imgsz=imgsz, dynamic=True)
+    exported = Path(exported)
+    if exported != onnx_path:
+        exported.replace(onnx_path)
+    return onnx_path
+
+
+def load_model(model_path: str, device: str = "cuda", backend: Optional[str] = None,
+               **options: Any) -> Any:
     """모델 파일을 읽어 로드합니다.
-    
+
     Args:
-        model_path: 모델 파일 경로 (.pt 파일)
+        model_path: 모델 파일 경로 (.pt 또는 .onnx)
         device: 사용할 장치 ('cuda', 'cpu', 또는 장치 번호)
-        
+        backend: 백엔드 이름 ('torch', 'onnxruntime', 'openvino'). None 또는 'auto'이면
+            파일 확장자로 결정하며, ``.pt`` 모델에 ONNX 계열 백엔드를 지정하면
+            ONNX로 내보낸 뒤 (캐시) 로드합니다.
+        **options: 백엔드별 옵션 (예: imgsz, iou, intra_op_threads)
+
     Returns:
-        로드된 YOLO 모델
-        
+        로드된 모델 백엔드
+
     Raises:
         FileNotFoundError: 모델 파일이 존재하지 않을 때
         RuntimeError: 모델 로딩 실패 시
@@ -26,57 +223,61 @@ def load_model(model_path: str, device: str = "cuda") -> YOLO:
         model_path = Path(model_path)
         if not model_path.exists():
             raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {model_path}")
-            
-        logger.info(f"모델 로딩 시작: {model_path}")
-        
-        # 장치 설정
-        if device == "cuda" and not torch.cuda.is_available():
-            logger.warning("CUDA를 사용할 수 없습니다. CPU로 전환합니다.")
-            device = "cpu"
-            
-        # YOLO 모델 로드
-        model = YOLO(str(model_path))
-        model.to(device)
-        
-        logger.info(f"모델 로딩 완료: {model_path} (device={device})")
+
+        suffix = model_path.suffix.lower()
+        if backend in (None, "auto"):
+            backend = EXTENSION_BACKENDS.get(suffix)
+            if backend is None:
+                raise ValueError(f"확장자로 백엔드를 결정할 수 없습니다: {model_path}")
+        if backend not in BACKENDS:
+            raise ValueError(f"지원하지 않는 백엔드입니다: {backend} (가능: {sorted(BACKENDS)})")
+
+        if backend != "torch" and suffix == ".pt":
+            model_path = export_onnx(str(model_path), imgsz=options.get("imgsz") or DEFAULT_IMGSZ)
+
+        logger.info(f"모델 로딩 시작: {model_path} (backend={backend})")
+        model = BACKENDS[backend](str(model_path), device=device, **options)
+
+        logger.info(f"모델 로딩 완료: {model_path} (backend={backend}, device={model.device})")
         return model
-        
+
     except Exception as e:
         logger.error(f"모델 로딩 실패: {e}")
         raise RuntimeError(f"모델 로딩 중 오류 발생: {e}")
 
 
-def load_pretrained(model_path: str, device: str = "cuda") -> YOLO:
+def load_pretrained(model_path: str, device: str = "cuda") -> Any:
     """사전 학습 모델을 로드합니다.
-    
+
     Args:
         model_path: 사전 학습 모델 경로
         device: 사용할 장치
-        
+
     Returns:
-        로드된 사전 학습 YOLO 모델
+        로드된 사전 학습 모델 (PyTorch 백엔드)
     """
     logger.info(f"사전 학습 모델 로딩: {model_path}")
-    return load_model(model_path, device)
+    return load_model(model_path, device, backend="torch")
 
 
-def get_model_info(model: YOLO) -> dict:
+def get_model_info(model: Any) -> dict:
     """모델 정보를 반환합니다.
-    
+
     Args:
-        model: YOLO 모델
-        
+        model: ``load_model`` 로 로드한 모델 백엔드
+
     Returns:
         모델 정보 딕셔너리
     """
     try:
         info = {
             "model_type": type(model).__name__,
-            "device": str(model.device) if hasattr(model, 'device') else "unknown",
-            "num_classes": getattr(model.model, 'nc', 'unknown') if hasattr(model, 'model') else 'unknown',
-            "input_size": getattr(model.model, 'imgsz', 'unknown') if hasattr(model, 'model') else 'unknown'
+            "backend": getattr(model, "name", "unknown"),
+            "device": str(getattr(model, "device", "unknown")),
+            "num_classes": len(model.names) if getattr(model, "names", None) else "unknown",
+            "input_size": getattr(model, "imgsz", "unknown"),
         }
         return info
     except Exception as e:
         logger.warning(f"모델 정보 추출 실패: {e}")
-        return {"error": str(e)}
\ No newline at end of file
+        return {"error": str(e)}
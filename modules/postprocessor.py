@@ -1,8 +1,384 @@
 """추론 결과를 정리하는 모듈."""
-from typing import Any, List
+import logging
+from pathlib import Path
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
 
+import numpy as np
 
-def summarize(results: List[Any]) -> List[Any]:
-    """추론 결과를 요약합니다."""
-    print("결과 요약 ...")
-    return results
+logger = logging.getLogger(__name__)
+
+# 타일 경계 병합 기본 임계값
+DEFAULT_MERGE_THRESHOLD = 0.5
+
+
+class Detections(NamedTuple):
+    """이미지 한 장의 검출 결과 (원본 이미지 좌표계).
+
+    ``tiled`` 가 참이면 타일 경계에서 중복/분할된 박스가 아직 병합되지 않은
+    상태이며, ``summarize`` 에서 병합됩니다.
+    """
+    path: str
+    xyxy: np.ndarray          # (N, 4) float32
+    conf: np.ndarray          # (N,) float32
+    cls: np.ndarray           # (N,) int64
+    orig_shape: Tuple[int, int]
+    tiled: bool = False
+
+
+def result_arrays(result: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """모델 백엔드의 결과(YOLO 결과 객체 또는 ``Detections``)에서 (xyxy, conf, cls) 배열을 꺼냅니다."""
+    if isinstance(result, Detections):
+        return result.xyxy, result.conf, result.cls
+    boxes = result.boxes
+    return (
+        boxes.xyxy.cpu().numpy().astype(np.float32, copy=False),
+        boxes.conf.cpu().numpy().astype(np.float32, copy=False),
+        boxes.cls.cpu().numpy().astype(np.int64, copy=False),
+    )
+
+
+def scale_boxes(xyxy: np.ndarray, meta: np.ndarray) -> np.ndarray:
+    """레터박스 입력 좌표의 박스를 원본 이미지 좌표로 되돌립니다.
+
+    Args:
+        xyxy: (N, 4) 레터박스 좌표계 박스
+        meta: ``LetterboxBatch.meta`` 의 한 행 (scale, pad_x, pad_y, 원본 높이, 원본 너비)
+
+    Returns:
+        (N, 4) 원본 좌표계 박스 (이미지 경계로 잘림)
+    """
+    scale, pad_x, pad_y, height, width = meta
+    boxes = (xyxy - np.array([pad_x, pad_y, pad_x, pad_y], dtype=np.float32)) / np.float32(scale)
+    np.clip(boxes[:, 0::2], 0, width, out=boxes[:, 0::2])
+    np.clip(boxes[:, 1::2], 0, height, out=boxes[:, 1::2])
+    return boxes
+
+
+def box_overlap(box: np.ndarray, boxes: np.ndarray, metric: str = "iou") -> np.ndarray:
+    """박스 하나와 여러 박스 사이의 겹침 정도를 계산합니다.
+
+    Args:
+        box: 기준 박스 (4,) xyxy
+        boxes: 비교 대상 박스 (N, 4) xyxy
+        metric: ``"iou"`` (합집합 대비) 또는 ``"ios"`` (작은 박스 대비)
+
+    Returns:
+        (N,) 겹침 비율 배열
+    """
+    top_left = np.maximum(box[:2], boxes[:, :2])
+    bottom_right = np.minimum(box[2:], boxes[:, 2:])
+    inter = np.prod(np.clip(bottom_right - top_left, 0, None), axis=1)
+
+    area = np.prod(box[2:] - box[:2])
+    areas = np.prod(boxes[:, 2:] - boxes[:, :2], axis=1)
+    if metric == "iou":
+        denom = area + areas - inter
+    elif metric == "ios":
+        denom = np.minimum(area, areas)
+    else:
+        raise ValueError(f"지원하지 않는 metric입니다: {metric}")
+    return inter / np.maximum(denom, 1e-9)
+
+
+def nms(
+    xyxy: np.ndarray,
+    conf: np.ndarray,
+    cls: np.ndarray,
+    iou_threshold: float,
+) -> np.ndarray:
+    """클래스별 NMS(Non-Maximum Suppression)를 수행합니다.
+
+    Args:
+        xyxy: (N, 4) 박스 좌표
+        conf: (N,) 신뢰도
+        cls: (N,) 클래스 ID
+        iou_threshold: 이 값을 넘게 겹치는 같은 클래스 박스를 제거
+
+    Returns:
+        남길 박스 인덱스 (신뢰도 내림차순)
+    """
+    if len(xyxy) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # 클래스마다 좌표를 멀리 떨어뜨려 한 번의 NMS로 클래스별 처리
+    offset = cls.astype(np.float32)[:, None] * (float(xyxy.max()) + 1.0)
+    boxes = xyxy + offset
+    order = np.argsort(-conf, kind="stable")
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        order = rest[box_overlap(boxes[i], boxes[rest], "iou") <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def pairwise_overlap(boxes: np.ndarray, metric: str = "iou") -> np.ndarray:
+    """박스들 사이의 겹침 정도 행렬을 계산합니다 (``box_overlap`` 의 전체 쌍 버전).
+
+    Args:
+        boxes: (N, 4) xyxy 박스
+        metric: ``"iou"`` (합집합 대비) 또는 ``"ios"`` (작은 박스 대비)
+
+    Returns:
+        (N, N) 겹침 비율 행렬
+    """
+    top_left = np.maximum(boxes[:, None, :2], boxes[None, :, :2])
+    bottom_right = np.minimum(boxes[:, None, 2:], boxes[None, :, 2:])
+    inter = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+
+    areas = np.prod(boxes[:, 2:] - boxes[:, :2], axis=1)
+    if metric == "iou":
+        denom = areas[:, None] + areas[None, :] - inter
+    elif metric == "ios":
+        denom = np.minimum(areas[:, None], areas[None, :])
+    else:
+        raise ValueError(f"지원하지 않는 metric입니다: {metric}")
+    return inter / np.maximum(denom, 1e-9)
+
+
+def merge_boxes(
+    xyxy: np.ndarray,
+    conf: np.ndarray,
+    cls: np.ndarray,
+    threshold: float = DEFAULT_MERGE_THRESHOLD,
+    metric: str = "ios",
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """같은 클래스의 겹치는 박스들을 하나로 병합합니다 (greedy NMM).
+
+    신뢰도가 높은 박스부터 순서대로, 겹침이 ``threshold`` 를 넘는 같은 클래스
+    박스들을 흡수하여 외접 박스로 넓힙니다. 타일 경계에서 잘려 두 조각으로
+    검출된 결함은 작은 박스 대비 겹침(``ios``)으로 하나로 합쳐지고, 겹침
+    영역에서 중복 검출된 박스는 제거됩니다.
+
+    겹침은 클래스별로 한 번에 행렬(``pairwise_overlap``)로 계산하고, 반복은 다른
+    박스와 겹치는 박스에 대해서만 돌며, 외접 박스는 배열 연산으로 모읍니다.
+
+    Args:
+        xyxy: (N, 4) 박스 좌표
+        conf: (N,) 신뢰도
+        cls: (N,) 클래스 ID
+        threshold: 병합 임계값
+        metric: 겹침 계산 방식 (``"iou"`` 또는 ``"ios"``)
+
+    Returns:
+        병합된 (xyxy, conf, cls)
+    """
+    if len(xyxy) == 0:
+        return xyxy, conf, cls
+
+    order = np.argsort(-conf, kind="stable")
+    xyxy, conf, cls = xyxy[order], conf[order], cls[order]
+    owner = np.arange(len(xyxy))
+    done = np.zeros(len(xyxy), dtype=bool)
+
+    for label in np.unique(cls):
+        members = np.flatnonzero(cls == label)
+        if members.size < 2:
+            continue
+        linked = pairwise_overlap(xyxy[members].astype(np.float64), metric) > threshold
+        np.fill_diagonal(linked, False)
+        # 다른 박스와 겹치지 않는 박스는 그대로 남으므로 겹치는 박스만 신뢰도 순으로 처리
+        for i in np.flatnonzero(linked.any(axis=1)).tolist():
+            if done[members[i]]:
+                continue
+            absorbed = members[linked[i] & ~done[members]]
+            owner[absorbed] = members[i]
+            done[absorbed] = True
+            done[members[i]] = True
+
+    keep = np.flatnonzero(owner == np.arange(len(xyxy)))
+    merged = xyxy.copy()
+    np.minimum.at(merged[:, :2], owner, xyxy[:, :2])
+    np.maximum.at(merged[:, 2:], owner, xyxy[:, 2:])
+    return merged[keep], conf[keep], cls[keep]
+
+
+class DetectionStore:
+    """검출 결과를 열(column) 단위 NumPy 배열로 보관하는 컨테이너.
+
+    모든 박스는 이미지 순서대로 연속 배열에 저장되며, 이미지 경로와 원본
+    크기는 별도의 테이블로 관리합니다. 필터링과 집계는 배열 연산으로
+    수행되고, 파이썬 객체를 거치지 않고 ``.npz``/Parquet으로 내보낼 수
+    있습니다.
+
+    Attributes:
+        paths: (M,) 이미지 경로 테이블
+        shapes: (M, 2) 이미지별 원본 (높이, 너비)
+        image_index: (N,) 박스가 속한 이미지 인덱스 (오름차순)
+        xyxy: (N, 4) 박스 좌표
+        conf: (N,) 신뢰도
+        cls: (N,) 클래스 ID
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        shapes: np.ndarray,
+        image_index: np.ndarray,
+        xyxy: np.ndarray,
+        conf: np.ndarray,
+        cls: np.ndarray,
+    ):
+        self.paths = np.asarray(paths, dtype=str)
+        self.shapes = np.ascontiguousarray(shapes, dtype=np.int32).reshape(-1, 2)
+        self.image_index = np.ascontiguousarray(image_index, dtype=np.int32)
+        self.xyxy = np.ascontiguousarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        self.conf = np.ascontiguousarray(conf, dtype=np.float32)
+        self.cls = np.ascontiguousarray(cls, dtype=np.int16)
+
+    def __len__(self) -> int:
+        """저장된 박스 수를 반환합니다."""
+        return len(self.conf)
+
+    def __repr__(self) -> str:
+        return f"DetectionStore(images={self.num_images}, detections={len(self)})"
+
+    @property
+    def num_images(self) -> int:
+        """경로 테이블에 등록된 이미지 수를 반환합니다."""
+        return len(self.paths)
+
+    @classmethod
+    def empty(cls) -> "DetectionStore":
+        """비어 있는 저장소를 만듭니다."""
+        return cls([], np.zeros((0, 2)), np.zeros(0), np.zeros((0, 4)), np.zeros(0), np.zeros(0))
+
+    def filter(
+        self,
+        min_conf: Optional[float] = None,
+        classes: Optional[Sequence[int]] = None,
+    ) -> "DetectionStore":
+        """신뢰도와 클래스로 박스를 걸러낸 새 저장소를 반환합니다.
+
+        이미지 경로 테이블은 그대로 유지되므로 결함이 모두 걸러진 이미지도
+        "결함 없음" 으로 남습니다.
+
+        Args:
+            min_conf: 최소 신뢰도
+            classes: 남길 클래스 ID 목록
+
+        Returns:
+            필터링된 ``DetectionStore``
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if min_conf is not None:
+            mask &= self.conf >= min_conf
+        if classes is not None:
+            mask &= np.isin(self.cls, np.asarray(classes, dtype=self.cls.dtype))
+        return DetectionStore(
+            self.paths, self.shapes,
+            self.image_index[mask], self.xyxy[mask], self.conf[mask], self.cls[mask],
+        )
+
+    def for_image(self, index: int) -> slice:
+        """이미지 ``index`` 에 속한 박스 구간을 반환합니다."""
+        start, stop = np.searchsorted(self.image_index, [index, index + 1])
+        return slice(int(start), int(stop))
+
+    def counts_per_image(self) -> np.ndarray:
+        """이미지별 검출 수 (M,) 를 반환합니다."""
+        return np.bincount(self.image_index, minlength=self.num_images)
+
+    def class_counts(self, num_classes: int = 0) -> np.ndarray:
+        """클래스별 검출 수를 반환합니다."""
+        return np.bincount(self.cls.astype(np.int64), minlength=num_classes)
+
+    def to_npz(self, path: Union[str, Path]) -> None:
+        """압축되지 않은 ``.npz`` 파일로 저장합니다."""
+        np.savez(
+            path,
+            paths=self.paths, shapes=self.shapes, image_index=self.image_index,
+            xyxy=self.xyxy, conf=self.conf, cls=self.cls,
+        )
+        logger.info(f"검출 결과 저장: {path} ({self.num_images}개 이미지, {len(self)}개 박스)")
+
+    @classmethod
+    def from_npz(cls, path: Union[str, Path]) -> "DetectionStore":
+        """``to_npz`` 로 저장한 파일을 읽습니다."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["paths"], data["shapes"], data["image_index"],
+                data["xyxy"], data["conf"], data["cls"],
+            )
+
+    def to_parquet(self, path: Union[str, Path]) -> None:
+        """박스 단위 Parquet 파일로 저장합니다.
+
+        이미지 경로는 ``image_index`` 를 인덱스로 하는 dictionary 열로 저장되어
+        행마다 문자열이 복제되지 않습니다. ``pyarrow`` 가 필요합니다.
+
+        Raises:
+            ImportError: pyarrow가 설치되어 있지 않을 때
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet 저장에는 pyarrow가 필요합니다: pip install pyarrow") from e
+
+        table = pa.table({
+            "image_index": self.image_index,
+            "path": pa.DictionaryArray.from_arrays(self.image_index, pa.array(self.paths)),
+            "x1": self.xyxy[:, 0],
+            "y1": self.xyxy[:, 1],
+            "x2": self.xyxy[:, 2],
+            "y2": self.xyxy[:, 3],
+            "conf": self.conf,
+            "cls": self.cls,
+        })
+        pq.write_table(table, str(path))
+        logger.info(f"검출 결과 저장: {path} ({len(self)}개 박스)")
+
+
+def summarize(
+    results: Iterable[Any],
+    merge_threshold: float = DEFAULT_MERGE_THRESHOLD,
+) -> DetectionStore:
+    """추론 결과를 요약합니다.
+
+    ``run_inference`` 가 반환하는 제너레이터를 끝까지 소비하여 이미지별
+    박스 배열을 하나의 ``DetectionStore`` 로 모읍니다. 타일 추론 결과
+    (``tiled=True``)는 타일 경계의 중복/분할 박스를 병합한 뒤 담습니다.
+
+    Args:
+        results: 이미지별 추론 결과 (YOLO 결과 객체 또는 ``Detections``)
+        merge_threshold: 타일 경계 박스 병합 임계값
+
+    Returns:
+        열 단위 검출 결과 저장소
+    """
+    logger.debug("결과 요약 ...")
+    paths: List[str] = []
+    shapes: List[Tuple[int, int]] = []
+    index_parts, xyxy_parts, conf_parts, cls_parts = [], [], [], []
+
+    for result in results:
+        if hasattr(result, "boxes"):
+            xyxy, conf, cls = result_arrays(result)
+        else:
+            xyxy, conf, cls = result.xyxy, result.conf, result.cls
+            if result.tiled:
+                xyxy, conf, cls = merge_boxes(xyxy, conf, cls, merge_threshold)
+
+        if len(conf):
+            index_parts.append(np.full(len(conf), len(paths), dtype=np.int32))
+            xyxy_parts.append(xyxy)
+            conf_parts.append(conf)
+            cls_parts.append(cls)
+        paths.append(str(result.path))
+        shapes.append(tuple(result.orig_shape[:2]))
+
+    if not paths:
+        return DetectionStore.empty()
+    if not conf_parts:
+        return DetectionStore(paths, np.asarray(shapes), np.zeros(0), np.zeros((0, 4)),
+                              np.zeros(0), np.zeros(0))
+    return DetectionStore(
+        paths,
+        np.asarray(shapes),
+        np.concatenate(index_parts),
+        np.concatenate(xyxy_parts),
+        np.concatenate(conf_parts),
+        np.concatenate(cls_parts),
+    )
@@ -1,8 +1,315 @@
 """이미지 전처리 모듈."""
-from typing import List
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 
-def preprocess(images: List[str]) -> List[str]:
-    """이미지를 전처리합니다."""
-    print("전처리 중 ...")
-    return images
+from modules.data_loader import DecodedImageCache
+from modules.postprocessor import Detections
+
+logger = logging.getLogger(__name__)
+
+# 레터박스 기본값 (YOLOv8 기본 입력 크기와 패딩 색)
+DEFAULT_IMGSZ = 640
+PAD_VALUE = 114
+
+# 골든 템플릿 차분 프리필터 기본값
+DEFAULT_DIFF_THRESHOLD = 40
+DEFAULT_MIN_BLOB_AREA = 20
+DEFAULT_KERNEL_SIZE = 3
+
+
+class LetterboxBatch:
+    """미리 할당해 두고 재사용하는 레터박스 배치 버퍼.
+
+    ``fill`` 은 이미지를 비율을 유지한 채 ``imgsz`` 정사각형에 맞춰 줄이고
+    회색(114)으로 패딩한 뒤, RGB/CHW/0-1 float32로 변환해 ``images[slot]``
+    에 기록합니다. 크기 조정과 패딩은 ``cv2.warpAffine`` 한 번으로 슬롯 전용
+    캔버스에 직접 쓰고, 이후 변환도 기존 버퍼에 제자리 연산으로 수행하므로
+    정상 상태에서는 이미지당 새 배열이 할당되지 않습니다. 서로 다른 슬롯은
+    여러 스레드에서 동시에 채울 수 있습니다.
+
+    Attributes:
+        images: (B, 3, imgsz, imgsz) float32 모델 입력 텐서
+        meta: (B, 5) 슬롯별 (scale, pad_x, pad_y, 원본 높이, 원본 너비) —
+            ``postprocessor.scale_boxes`` 로 박스를 원본 좌표로 되돌릴 때 사용
+
+    Args:
+        batch_size: 슬롯 수
+        imgsz: 정사각형 입력 한 변의 길이
+        pad_value: 패딩 픽셀 값
+        images: ``images`` 로 사용할 (B, 3, imgsz, imgsz) float32 배열
+            (예: 공유 메모리 뷰). None이면 새로 할당
+    """
+
+    def __init__(self, batch_size: int, imgsz: int = DEFAULT_IMGSZ, pad_value: int = PAD_VALUE,
+                 images: Optional[np.ndarray] = None):
+        self.batch_size = batch_size
+        self.imgsz = imgsz
+        if images is None:
+            images = np.empty((batch_size, 3, imgsz, imgsz), dtype=np.float32)
+        elif images.shape != (batch_size, 3, imgsz, imgsz) or images.dtype != np.float32:
+            raise ValueError(f"배치 버퍼 형상이 맞지 않습니다: {images.shape} {images.dtype}")
+        self.images = images
+        self.meta = np.zeros((batch_size, 5), dtype=np.float64)
+        self._canvas = np.empty((batch_size, imgsz, imgsz, 3), dtype=np.uint8)
+        self._matrices = np.zeros((batch_size, 2, 3), dtype=np.float64)
+        self._border = (pad_value, pad_value, pad_value)
+
+    def fill(self, slot: int, image: np.ndarray) -> None:
+        """BGR 이미지 한 장을 레터박스하여 ``slot`` 에 기록합니다."""
+        import cv2
+
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+        height, width = image.shape[:2]
+        scale = min(self.imgsz / height, self.imgsz / width)
+        pad_x = int(round((self.imgsz - round(width * scale)) / 2 - 0.1))
+        pad_y = int(round((self.imgsz - round(height * scale)) / 2 - 0.1))
+
+        # cv2.resize와 같은 픽셀 중심 정렬이 되도록 이동량을 보정
+        matrix = self._matrices[slot]
+        matrix[0, 0] = matrix[1, 1] = scale
+        matrix[0, 2] = pad_x + 0.5 * scale - 0.5
+        matrix[1, 2] = pad_y + 0.5 * scale - 0.5
+        canvas = self._canvas[slot]
+        cv2.warpAffine(image, matrix, (self.imgsz, self.imgsz), dst=canvas, flags=cv2.INTER_LINEAR,
+                       borderMode=cv2.BORDER_CONSTANT, borderValue=self._border)
+
+        # BGR HWC uint8 → RGB CHW float32 [0, 1]
+        target = self.images[slot]
+        np.copyto(target, canvas[:, :, ::-1].transpose(2, 0, 1))
+        target *= np.float32(1 / 255)
+
+        meta = self.meta[slot]
+        meta[0], meta[1], meta[2], meta[3], meta[4] = scale, pad_x, pad_y, height, width
+
+    def move(self, src: int, dst: int) -> None:
+        """``src`` 슬롯의 내용을 ``dst`` 슬롯으로 옮깁니다 (빈 슬롯 압축용)."""
+        self.images[dst] = self.images[src]
+        self.meta[dst] = self.meta[src]
+
+
+def preprocess(
+    images: Sequence[np.ndarray],
+    imgsz: int = DEFAULT_IMGSZ,
+    batch: Optional[LetterboxBatch] = None,
+) -> LetterboxBatch:
+    """디코딩된 이미지들을 레터박스하여 배치 버퍼에 채웁니다.
+
+    Args:
+        images: BGR 이미지 배열 목록
+        imgsz: 모델 입력 크기
+        batch: 재사용할 배치 버퍼 (크기가 맞지 않거나 없으면 새로 할당)
+
+    Returns:
+        앞쪽 ``len(images)`` 개 슬롯이 채워진 ``LetterboxBatch``
+    """
+    if batch is None or batch.batch_size < len(images) or batch.imgsz != imgsz:
+        batch = LetterboxBatch(max(1, len(images)), imgsz)
+    for slot, image in enumerate(images):
+        batch.fill(slot, image)
+    return batch
+
+
+def find_template(image_path: str) -> Optional[str]:
+    """DeepPCB 테스트 이미지에 대응하는 골든 템플릿 경로를 찾습니다.
+
+    ``XXXXXXXX_test.jpg`` 에 대해 같은 폴더의 ``XXXXXXXX_temp.jpg`` 를 반환하며,
+    없으면 ``None`` 을 반환합니다.
+    """
+    path = Path(image_path)
+    if not path.stem.endswith("_test"):
+        return None
+    template = path.with_name(f"{path.stem[:-len('_test')]}_temp{path.suffix}")
+    return str(template) if template.exists() else None
+
+
+def find_deeppcb_label(image_path: str) -> Optional[str]:
+    """DeepPCB 테스트 이미지의 라벨 파일 경로를 찾습니다.
+
+    ``groupX/X/NNN_test.jpg`` 의 라벨은 ``groupX/X_not/NNN.txt`` 에 있습니다.
+    """
+    path = Path(image_path)
+    stem = path.stem[:-len("_test")] if path.stem.endswith("_test") else path.stem
+    for name in (stem, path.stem):
+        label = path.parent.parent / f"{path.parent.name}_not" / f"{name}.txt"
+        if label.exists():
+            return str(label)
+    return None
+
+
+def template_difference_score(
+    test: np.ndarray,
+    template: np.ndarray,
+    diff_threshold: int = DEFAULT_DIFF_THRESHOLD,
+    kernel_size: int = DEFAULT_KERNEL_SIZE,
+) -> int:
+    """테스트 이미지와 골든 템플릿의 차이 영역 중 가장 큰 덩어리 면적을 계산합니다.
+
+    두 그레이스케일 이미지의 절대 차이를 임계값으로 이진화하고, 정렬 오차로
+    생기는 얇은 경계선은 모폴로지 열림 연산으로 제거한 뒤 연결 요소 중 최대
+    면적(픽셀 수)을 점수로 사용합니다.
+
+    Args:
+        test: 테스트 이미지 (그레이스케일)
+        template: 골든 템플릿 이미지 (그레이스케일)
+        diff_threshold: 차이로 간주할 최소 픽셀 값 차이 (0-255)
+        kernel_size: 열림 연산 커널 크기 (1 이하이면 생략)
+
+    Returns:
+        최대 차이 덩어리 면적 (픽셀)
+    """
+    import cv2
+
+    if template.shape != test.shape:
+        template = cv2.resize(template, (test.shape[1], test.shape[0]), interpolation=cv2.INTER_NEAREST)
+
+    mask = (cv2.absdiff(test, template) > diff_threshold).astype(np.uint8)
+    if kernel_size > 1:
+        kernel = np.ones((kernel_size, kernel_size), dtype=np.uint8)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+
+    num_labels, _, blob_stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    if num_labels <= 1:
+        return 0
+    return int(blob_stats[1:, cv2.CC_STAT_AREA].max())
+
+
+def _read_gray(image_path: str, cache: Optional[DecodedImageCache]) -> Optional[np.ndarray]:
+    """그레이스케일 이미지를 읽습니다. 캐시가 있으면 디코딩된 컬러 이미지를 재사용합니다."""
+    import cv2
+
+    if cache is None:
+        return cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    try:
+        return cv2.cvtColor(cache.load(image_path), cv2.COLOR_BGR2GRAY)
+    except (OSError, ValueError):
+        return None
+
+
+def _score_image(image_path: str, diff_threshold: int, kernel_size: int,
+                 cache: Optional[DecodedImageCache] = None) -> Tuple[Optional[int], Tuple[int, int]]:
+    """이미지 한 장의 템플릿 차분 점수와 크기를 계산합니다.
+
+    템플릿이 없거나 읽을 수 없으면 점수는 ``None`` 입니다.
+    """
+    template_path = find_template(image_path)
+    if template_path is None:
+        return None, (0, 0)
+
+    test = _read_gray(image_path, cache)
+    template = _read_gray(template_path, cache)
+    if test is None or template is None:
+        return None, (0, 0)
+    return template_difference_score(test, template, diff_threshold, kernel_size), test.shape[:2]
+
+
+def prefilter(
+    images: Sequence[str],
+    min_blob_area: int = DEFAULT_MIN_BLOB_AREA,
+    diff_threshold: int = DEFAULT_DIFF_THRESHOLD,
+    kernel_size: int = DEFAULT_KERNEL_SIZE,
+    num_workers: int = 4,
+    stats: Optional[Dict[str, Any]] = None,
+    cache: Optional[DecodedImageCache] = None,
+) -> Tuple[List[str], List[Detections]]:
+    """골든 템플릿과의 차이가 작은 보드를 검출기 없이 양품으로 분류합니다.
+
+    최대 차이 덩어리 면적이 ``min_blob_area`` 미만인 이미지는 결함 없음으로
+    판정되어 검출기를 거치지 않습니다. 템플릿이 없는 이미지는 판단할 수
+    없으므로 항상 검출 대상으로 남깁니다.
+
+    Args:
+        images: 이미지 파일 경로 목록
+        min_blob_area: 검출 대상으로 남길 최소 차이 덩어리 면적 (픽셀)
+        diff_threshold: 차이로 간주할 최소 픽셀 값 차이
+        kernel_size: 열림 연산 커널 크기
+        num_workers: 점수 계산 스레드 수
+        stats: 전달되면 건너뛴 비율과 점수를 채워 넣을 딕셔너리
+        cache: 전달되면 디코딩된 이미지를 캐시에서 재사용 (이후 검출 단계와 공유)
+
+    Returns:
+        (검출기로 보낼 이미지 경로 리스트, 양품으로 판정된 이미지의 빈 ``Detections`` 리스트)
+    """
+    images = list(images)
+    with ThreadPoolExecutor(max_workers=max(1, num_workers), thread_name_prefix="prefilter") as executor:
+        scored = list(executor.map(lambda p: _score_image(p, diff_threshold, kernel_size, cache), images))
+
+    to_detect: List[str] = []
+    clean: List[Detections] = []
+    no_template = 0
+    for path, (score, shape) in zip(images, scored):
+        if score is None:
+            no_template += 1
+            to_detect.append(path)
+        elif score < min_blob_area:
+            clean.append(Detections(
+                path=path,
+                xyxy=np.zeros((0, 4), np.float32),
+                conf=np.zeros(0, np.float32),
+                cls=np.zeros(0, np.int64),
+                orig_shape=shape,
+            ))
+        else:
+            to_detect.append(path)
+
+    skip_rate = len(clean) / len(images) if images else 0.0
+    if stats is not None:
+        stats.update({
+            "images": len(images),
+            "skipped": len(clean),
+            "no_template": no_template,
+            "skip_rate": skip_rate,
+            "scores": [s for s, _ in scored],
+        })
+
+    logger.info(f"템플릿 프리필터: {len(images)}개 중 {len(clean)}개 양품 판정 "
+                f"(건너뜀 {skip_rate:.1%}, 템플릿 없음 {no_template}개)")
+    return to_detect, clean
+
+
+def evaluate_prefilter(images: Sequence[str], clean_paths: Sequence[str]) -> Dict[str, Any]:
+    """DeepPCB 라벨을 기준으로 프리필터의 건너뜀 비율과 재현율 영향을 계산합니다.
+
+    라벨 파일에 박스가 하나라도 있는 이미지를 결함 보드로 보고, 그중
+    프리필터가 양품으로 판정해 건너뛴 비율을 재현율 손실로 보고합니다.
+
+    Args:
+        images: 프리필터에 입력된 전체 이미지 경로
+        clean_paths: 양품으로 판정된 이미지 경로
+
+    Returns:
+        건너뜀 비율, 결함 보드 수, 놓친 결함 보드 수, 보드 단위 재현율을 담은 딕셔너리
+    """
+    clean_set = set(clean_paths)
+    labeled = 0
+    defective = 0
+    missed = 0
+    for path in images:
+        label_path = find_deeppcb_label(path)
+        if label_path is None:
+            continue
+        labeled += 1
+        with open(label_path, "r") as f:
+            has_defect = any(line.strip() for line in f)
+        if has_defect:
+            defective += 1
+            if path in clean_set:
+                missed += 1
+
+    report = {
+        "images": len(images),
+        "skipped": len(clean_set),
+        "skip_rate": len(clean_set) / len(images) if images else 0.0,
+        "labeled": labeled,
+        "defective": defective,
+        "missed_defective": missed,
+        "board_recall": 1.0 - missed / defective if defective else 1.0,
+    }
+    logger.info(f"프리필터 평가: 건너뜀 {report['skip_rate']:.1%}, 라벨 있는 이미지 {labeled}개, "
+                f"결함 보드 {defective}개 중 {missed}개 누락 (보드 재현율 {report['board_recall']:.1%})")
+    return report
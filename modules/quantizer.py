@@ -0,0 +1,345 @@
+"""ONNX 모델 INT8 정적 양자화(PTQ) 및 FP32/INT8 비교 모듈.
+
+검증 이미지로 활성값 범위를 보정(calibration)하여 ONNX Runtime의 QDQ 형식
+INT8 모델을 만들고, 같은 검증 세트에서 mAP50과 지연 시간을 비교합니다.
+양자화된 모델은 일반 ``.onnx`` 파일이므로 ``model_loader.load_model`` 로 그대로
+로드됩니다.
+"""
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from modules.data_loader import load_images, load_single_image
+from modules.inference import run_inference
+from modules.model_loader import export_onnx, load_model
+from modules.postprocessor import Detections, box_overlap
+from modules.preprocessor import DEFAULT_IMGSZ, LetterboxBatch
+
+logger = logging.getLogger(__name__)
+
+# 양자화 기본 설정 (config.yaml의 quantization 섹션으로 덮어씀)
+DEFAULT_NUM_CALIBRATION = 200
+DEFAULT_MAX_MAP_DROP = 0.01
+
+# 검출 헤드의 박스 디코딩 연산은 INT8로 양자화하면 좌표 오차가 커지므로 제외
+_HEAD_FLOAT_OPS = {"Concat", "Split", "Reshape", "Transpose", "Softmax", "Sigmoid",
+                   "Mul", "Add", "Sub", "Div", "Slice", "Shape", "Gather"}
+_MODULE_INDEX = re.compile(r"^/model\.(\d+)/")
+
+
+class CalibrationReader:
+    """검증 이미지를 레터박스하여 한 장씩 보정 입력으로 공급하는 리더.
+
+    ``onnxruntime.quantization.CalibrationDataReader`` 와 같은 인터페이스
+    (``get_next``)를 제공합니다.
+
+    Args:
+        image_paths: 보정에 사용할 이미지 경로
+        input_name: 모델 입력 이름
+        imgsz: 레터박스 입력 크기
+    """
+
+    def __init__(self, image_paths: Sequence[str], input_name: str, imgsz: int = DEFAULT_IMGSZ):
+        self.image_paths = list(image_paths)
+        self.input_name = input_name
+        self._batch = LetterboxBatch(1, imgsz)
+        self._iterator = iter(self.image_paths)
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        for path in self._iterator:
+            try:
+                image = load_single_image(path)
+            except Exception as e:
+                logger.warning(f"보정 이미지 로드 실패, 건너뜁니다: {path} ({e})")
+                continue
+            self._batch.fill(0, image)
+            return {self.input_name: self._batch.images.copy()}
+        return None
+
+    def __iter__(self):
+        return iter(self.get_next, None)
+
+    def rewind(self) -> None:
+        self._iterator = iter(self.image_paths)
+
+
+def _sample_evenly(items: List[str], count: int) -> List[str]:
+    """리스트에서 ``count`` 개를 고르게 뽑습니다 (순서 유지)."""
+    if count <= 0 or count >= len(items):
+        return items
+    index = np.linspace(0, len(items) - 1, count).round().astype(int)
+    return [items[i] for i in index]
+
+
+def head_float_nodes(onnx_path: str) -> List[str]:
+    """ultralytics 검출 헤드(마지막 모듈)에서 부동소수점으로 남길 노드 이름을 찾습니다."""
+    import onnx
+
+    model = onnx.load(str(onnx_path), load_external_data=False)
+    indexed = [(int(m.group(1)), node) for node in model.graph.node
+               if (m := _MODULE_INDEX.match(node.name))]
+    if not indexed:
+        return []
+    head = max(index for index, _ in indexed)
+    return [node.name for index, node in indexed if index == head and node.op_type in _HEAD_FLOAT_OPS]
+
+
+def _copy_metadata(src: Path, dst: Path) -> None:
+    """클래스 이름/입력 크기 등 ultralytics 메타데이터를 양자화 모델로 복사합니다."""
+    import onnx
+
+    source = onnx.load(str(src), load_external_data=False)
+    target = onnx.load(str(dst))
+    existing = {prop.key for prop in target.metadata_props}
+    for prop in source.metadata_props:
+        if prop.key not in existing:
+            target.metadata_props.add(key=prop.key, value=prop.value)
+    onnx.save(target, str(dst))
+
+
+def quantize_model(
+    model_path: str,
+    calibration_dir: str,
+    output_path: Optional[str] = None,
+    imgsz: int = DEFAULT_IMGSZ,
+    num_calibration: int = DEFAULT_NUM_CALIBRATION,
+    per_channel: bool = False,
+    exclude_head: bool = True,
+) -> Path:
+    """모델을 INT8로 정적 양자화합니다.
+
+    Args:
+        model_path: ``.pt`` 또는 FP32 ``.onnx`` 모델 경로 (``.pt`` 는 ONNX로 먼저 내보냄)
+        calibration_dir: 보정 이미지 디렉터리 (예: datasets/deeppcb/images/val)
+        output_path: 결과 경로 (None이면 ``<이름>_int8.onnx``)
+        imgsz: 입력 크기
+        num_calibration: 보정에 사용할 이미지 수 (0이면 전체)
+        per_channel: 가중치를 채널별로 양자화할지 여부
+        exclude_head: 검출 헤드의 디코딩 연산을 FP32로 남길지 여부
+
+    Returns:
+        INT8 ONNX 모델 경로
+
+    Raises:
+        FileNotFoundError: 모델 또는 보정 이미지가 없을 때
+    """
+    from onnxruntime import InferenceSession
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+
+    model_path = Path(model_path)
+    if not model_path.exists():
+        raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {model_path}")
+    fp32_path = export_onnx(str(model_path), imgsz=imgsz) if model_path.suffix.lower() == ".pt" else model_path
+    output_path = Path(output_path) if output_path else fp32_path.with_name(f"{fp32_path.stem}_int8.onnx")
+
+    calibration_images = _sample_evenly(load_images(calibration_dir), num_calibration)
+    logger.info(f"보정 이미지: {len(calibration_images)}장 ({calibration_dir})")
+
+    # 양자화 전 형상 추론/그래프 정리 (실패해도 원본으로 진행)
+    source_path = fp32_path
+    prepared_path = fp32_path.with_name(f"{fp32_path.stem}_prep.onnx")
+    try:
+        try:
+            from onnxruntime.quantization.shape_inference import quant_pre_process
+
+            quant_pre_process(str(fp32_path), str(prepared_path))
+            source_path = prepared_path
+        except Exception as e:
+            logger.warning(f"양자화 전처리를 건너뜁니다: {e}")
+
+        input_name = InferenceSession(str(source_path), providers=["CPUExecutionProvider"]).get_inputs()[0].name
+        nodes_to_exclude = head_float_nodes(str(source_path)) if exclude_head else []
+        if nodes_to_exclude:
+            logger.info(f"FP32로 유지할 검출 헤드 노드: {len(nodes_to_exclude)}개")
+
+        logger.info(f"INT8 양자화 시작: {fp32_path} -> {output_path}")
+        quantize_static(
+            str(source_path),
+            str(output_path),
+            CalibrationReader(calibration_images, input_name, imgsz),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=per_channel,
+            calibrate_method=CalibrationMethod.MinMax,
+            nodes_to_exclude=nodes_to_exclude,
+        )
+        _copy_metadata(fp32_path, output_path)
+    finally:
+        # 중간 파일은 성공/실패와 관계없이 삭제 (전처리가 도중에 실패해 남긴 파일 포함)
+        prepared_path.unlink(missing_ok=True)
+
+    logger.info(f"INT8 양자화 완료: {output_path} "
+                f"({fp32_path.stat().st_size / 1e6:.1f} MB -> {output_path.stat().st_size / 1e6:.1f} MB)")
+    return output_path
+
+
+def _label_path(image_path: str) -> Path:
+    """YOLO 데이터셋 규칙(images → labels)으로 라벨 경로를 구합니다."""
+    path = Path(image_path)
+    parts = list(path.parts)
+    if "images" in parts:
+        parts[len(parts) - 1 - parts[::-1].index("images")] = "labels"
+    return Path(*parts).with_suffix(".txt")
+
+
+def load_yolo_labels(image_path: str, orig_shape: Sequence[int]) -> np.ndarray:
+    """YOLO 라벨을 (N, 5) [cls, x1, y1, x2, y2] 픽셀 좌표 배열로 읽습니다."""
+    label_path = _label_path(image_path)
+    if not label_path.exists():
+        return np.zeros((0, 5), dtype=np.float32)
+    rows = np.loadtxt(label_path, dtype=np.float32, ndmin=2)
+    if rows.size == 0:
+        return np.zeros((0, 5), dtype=np.float32)
+    height, width = orig_shape[:2]
+    cx, cy, w, h = rows[:, 1] * width, rows[:, 2] * height, rows[:, 3] * width, rows[:, 4] * height
+    return np.stack([rows[:, 0], cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+
+
+def average_precision(recall: np.ndarray, precision: np.ndarray) -> float:
+    """정밀도-재현율 곡선의 101점 보간 AP를 계산합니다 (COCO 방식).
+
+    재현율 0, 0.01, ..., 1 마다 그 이상의 재현율에서의 최대 정밀도를 평균합니다.
+    ``recall`` 은 검출을 신뢰도 순으로 누적한 값이므로 오름차순입니다.
+    """
+    if len(recall) == 0:
+        return 0.0
+    envelope = np.flip(np.maximum.accumulate(np.flip(precision)))
+    index = np.searchsorted(recall, np.linspace(0, 1, 101), side="left")
+    values = np.where(index < len(recall), envelope[np.minimum(index, len(recall) - 1)], 0.0)
+    return float(values.mean())
+
+
+def map50(detections: Iterable[Detections], iou_threshold: float = 0.5) -> Dict[str, Any]:
+    """검출 결과와 YOLO 라벨로 mAP@0.5를 계산합니다.
+
+    Args:
+        detections: 이미지별 검출 결과 (라벨은 ``path`` 로 찾음)
+        iou_threshold: 정답으로 인정할 IoU
+
+    Returns:
+        ``{"map50": float, "per_class": {cls: ap}, "images": int}``
+    """
+    scores: Dict[int, List[np.ndarray]] = {}
+    matches: Dict[int, List[np.ndarray]] = {}
+    num_gt: Dict[int, int] = {}
+    num_images = 0
+
+    for det in detections:
+        num_images += 1
+        labels = load_yolo_labels(det.path, det.orig_shape)
+        gt_cls = labels[:, 0].astype(np.int64)
+        for c in np.unique(gt_cls):
+            num_gt[int(c)] = num_gt.get(int(c), 0) + int((gt_cls == c).sum())
+
+        for c in np.unique(det.cls):
+            c = int(c)
+            mask = det.cls == c
+            boxes, conf = det.xyxy[mask], det.conf[mask]
+            order = np.argsort(-conf, kind="stable")
+            gt = labels[gt_cls == c, 1:]
+            used = np.zeros(len(gt), dtype=bool)
+            tp = np.zeros(len(order), dtype=bool)
+            for k, i in enumerate(order):
+                if len(gt) == 0:
+                    break
+                overlap = np.where(used, 0.0, box_overlap(boxes[i], gt, "iou"))
+                best = int(overlap.argmax())
+                if overlap[best] >= iou_threshold:
+                    used[best] = True
+                    tp[k] = True
+            scores.setdefault(c, []).append(conf[order])
+            matches.setdefault(c, []).append(tp)
+
+    per_class = {}
+    for c, total in sorted(num_gt.items()):
+        if c not in scores:
+            per_class[c] = 0.0
+            continue
+        conf = np.concatenate(scores[c])
+        tp = np.concatenate(matches[c])[np.argsort(-conf, kind="stable")]
+        true_pos = np.cumsum(tp)
+        recall = true_pos / total
+        precision = true_pos / np.arange(1, len(tp) + 1)
+        per_class[c] = average_precision(recall, precision)
+
+    return {
+        "map50": float(np.mean(list(per_class.values()))) if per_class else 0.0,
+        "per_class": per_class,
+        "images": num_images,
+    }
+
+
+def evaluate_model(
+    model_path: str,
+    image_dir: str,
+    imgsz: int = DEFAULT_IMGSZ,
+    batch_size: int = 1,
+    confidence: float = 0.001,
+    device: str = "cpu",
+    **options: Any,
+) -> Dict[str, Any]:
+    """검증 세트에서 모델의 mAP50과 지연 시간을 측정합니다.
+
+    Args:
+        model_path: 모델 경로 (백엔드는 확장자로 결정)
+        image_dir: 검증 이미지 디렉터리 (라벨은 images → labels 규칙으로 찾음)
+        imgsz: 레터박스 입력 크기
+        batch_size: 추론 배치 크기 (지연 측정은 배치 단위)
+        confidence: mAP 계산용 낮은 신뢰도 임계값
+        device: 사용할 장치
+        **options: ``load_model`` 에 전달할 백엔드 옵션
+
+    Returns:
+        mAP50, 클래스별 AP, 처리량, 배치 지연 p50/p95 (ms)를 담은 딕셔너리
+    """
+    model = load_model(model_path, device=device, imgsz=imgsz, **options)
+    stats: Dict[str, Any] = {}
+    detections = run_inference(model, load_images(image_dir), batch_size=batch_size,
+                               confidence=confidence, stats=stats, imgsz=imgsz)
+    result = map50(detections)
+    latencies = np.asarray(stats.get("batch_latency_ms") or [0.0])
+    result.update({
+        "model": str(model_path),
+        "images_per_sec": stats.get("images_per_sec", 0.0),
+        "latency_ms_p50": float(np.percentile(latencies, 50)),
+        "latency_ms_p95": float(np.percentile(latencies, 95)),
+    })
+    logger.info(f"평가 완료: {model_path} mAP50={result['map50']:.4f}, "
+                f"p50 {result['latency_ms_p50']:.1f} ms, {result['images_per_sec']:.2f} images/s")
+    return result
+
+
+def compare_models(
+    fp32_path: str,
+    int8_path: str,
+    image_dir: str,
+    max_map_drop: float = DEFAULT_MAX_MAP_DROP,
+    **options: Any,
+) -> Dict[str, Any]:
+    """FP32와 INT8 모델을 같은 검증 세트에서 비교하고 채택 여부를 판정합니다.
+
+    Args:
+        fp32_path: 기준 모델 경로
+        int8_path: 양자화 모델 경로
+        image_dir: 검증 이미지 디렉터리
+        max_map_drop: 허용하는 최대 mAP50 하락폭 (절대값)
+        **options: ``evaluate_model`` 옵션
+
+    Returns:
+        두 모델의 평가 결과, mAP50 하락폭, 속도 향상 배율, 채택 여부
+    """
+    fp32 = evaluate_model(fp32_path, image_dir, **options)
+    int8 = evaluate_model(int8_path, image_dir, **options)
+    map_drop = fp32["map50"] - int8["map50"]
+    speedup = fp32["latency_ms_p50"] / int8["latency_ms_p50"] if int8["latency_ms_p50"] > 0 else 0.0
+    return {
+        "fp32": fp32,
+        "int8": int8,
+        "map50_drop": map_drop,
+        "speedup": speedup,
+        "accepted": map_drop <= max_map_drop,
+    }
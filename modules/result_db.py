@@ -0,0 +1,279 @@
+"""검사 결과 SQLite 색인 모듈.
+
+추론 결과를 로컬 SQLite 데이터베이스(WAL 모드)에 누적하여 몇 달치 검사를
+보드, 로트, 클래스, 신뢰도로 조회할 수 있게 합니다. 결과는 추론 배치 단위로
+모아 한 트랜잭션에서 ``executemany`` 로 기록하므로 이미지 한 장당 비용이
+수 마이크로초 수준이며, WAL 모드라 기록 중에도 다른 프로세스가 조회할 수
+있습니다.
+
+스키마::
+
+    runs        (id, started, lot, model, input_dir)
+    classes     (id, name)
+    images      (id, run_id, lot, path, board, inspected, height, width, num_defects)
+    detections  (image_id, cls, conf, x1, y1, x2, y2)
+
+사용 예::
+
+    db = ResultDatabase("results/inspections.db")
+    run_id = db.start_run(lot="LOT-0001", model="deeppcb_best.onnx")
+    for det in db.tap(results, run_id, lot="LOT-0001", batch_size=8):
+        ...
+    db.defect_counts(lot="LOT-0001")
+"""
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules.postprocessor import Detections
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# 기본 커밋 단위 (추론 배치 크기와 맞춤)
+DEFAULT_BATCH_SIZE = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    lot TEXT,
+    model TEXT,
+    input_dir TEXT
+);
+CREATE TABLE IF NOT EXISTS classes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS images (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER REFERENCES runs(id),
+    lot TEXT,
+    path TEXT NOT NULL,
+    board TEXT NOT NULL,
+    inspected REAL NOT NULL,
+    height INTEGER,
+    width INTEGER,
+    num_defects INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS detections (
+    image_id INTEGER NOT NULL REFERENCES images(id),
+    cls INTEGER NOT NULL,
+    conf REAL NOT NULL,
+    x1 REAL, y1 REAL, x2 REAL, y2 REAL
+);
+CREATE INDEX IF NOT EXISTS idx_images_inspected ON images(inspected);
+CREATE INDEX IF NOT EXISTS idx_images_board ON images(board);
+CREATE INDEX IF NOT EXISTS idx_images_lot ON images(lot, inspected);
+CREATE INDEX IF NOT EXISTS idx_detections_image ON detections(image_id);
+CREATE INDEX IF NOT EXISTS idx_detections_cls ON detections(cls, conf);
+"""
+
+
+class ResultDatabase:
+    """검사 결과를 기록하고 조회하는 SQLite 데이터베이스.
+
+    연결 하나를 잠금으로 보호하여 여러 스레드(감시 모드의 결과 기록 등)에서
+    함께 사용할 수 있습니다.
+
+    Args:
+        db_path: 데이터베이스 파일 경로 (없으면 생성)
+        names: 클래스 ID → 이름 (``classes`` 테이블에 기록)
+    """
+
+    def __init__(self, db_path: str, names: Optional[Dict[int, str]] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL에서는 NORMAL이어도 정전 시 마지막 트랜잭션만 잃을 수 있고 손상되지 않음
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        if names:
+            with self._lock:
+                self._conn.executemany("INSERT OR REPLACE INTO classes (id, name) VALUES (?, ?)",
+                                       [(int(k), str(v)) for k, v in names.items()])
+        self.images = 0
+        self.detections = 0
+        self.seconds = 0.0
+        self._closed = False
+
+    def __enter__(self) -> "ResultDatabase":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """연결을 닫습니다 (여러 번 호출해도 됨)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._conn.close()
+        if self.images:
+            logger.info(f"결과 DB 기록: {self.images}개 이미지, {self.detections}개 결함, "
+                        f"{self.images / self.seconds if self.seconds else 0:.0f} images/s -> {self.db_path}")
+
+    def start_run(self, lot: Optional[str] = None, model: Optional[str] = None,
+                  input_dir: Optional[str] = None) -> int:
+        """검사 실행 한 건을 등록하고 ID를 반환합니다."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (started, lot, model, input_dir) VALUES (?, ?, ?, ?)",
+                (time.time(), lot, model, input_dir))
+            return int(cursor.lastrowid)
+
+    def insert(self, detections: Sequence[Detections], run_id: Optional[int] = None,
+               lot: Optional[str] = None, inspected: Optional[float] = None) -> None:
+        """이미지별 결과 묶음을 한 트랜잭션으로 기록합니다.
+
+        이미지 ID는 쓰기 잠금(``BEGIN IMMEDIATE``)을 잡은 뒤 현재 최댓값부터
+        직접 배정하므로, 이미지와 결함 행을 각각 ``executemany`` 한 번으로
+        넣을 수 있습니다.
+
+        Args:
+            detections: 이미지별 ``Detections`` (원본 좌표)
+            run_id: ``start_run`` 이 반환한 실행 ID
+            lot: 로트 이름
+            inspected: 검사 시각 (None이면 현재 시각)
+        """
+        if not detections:
+            return
+        started = time.perf_counter()
+        inspected = time.time() if inspected is None else inspected
+        counts = [len(det.conf) for det in detections]
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                first_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM images").fetchone()[0]
+                ids = range(first_id, first_id + len(detections))
+                self._conn.executemany(
+                    "INSERT INTO images (id, run_id, lot, path, board, inspected, height, width, num_defects) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(image_id, run_id, lot, str(det.path), Path(str(det.path)).stem, inspected,
+                      int(det.orig_shape[0]), int(det.orig_shape[1]), n)
+                     for image_id, det, n in zip(ids, detections, counts)])
+                if sum(counts):
+                    # 배치의 결함을 열 단위로 이어 붙여 한 번에 행 목록으로 변환
+                    with_boxes = [(image_id, det) for image_id, det, n in zip(ids, detections, counts) if n]
+                    image_ids = np.repeat([image_id for image_id, _ in with_boxes],
+                                          [len(det.conf) for _, det in with_boxes])
+                    cls = np.concatenate([np.asarray(det.cls) for _, det in with_boxes]).astype(np.int64)
+                    conf = np.concatenate([np.asarray(det.conf) for _, det in with_boxes]).astype(np.float64)
+                    xyxy = np.concatenate([np.asarray(det.xyxy).reshape(-1, 4) for _, det in with_boxes])
+                    rows = zip(image_ids.tolist(), cls.tolist(), np.round(conf, 4).tolist(),
+                               *np.round(xyxy.astype(np.float64), 1).T.tolist())
+                    self._conn.executemany(
+                        "INSERT INTO detections (image_id, cls, conf, x1, y1, x2, y2) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.images += len(detections)
+            self.detections += sum(counts)
+            self.seconds += time.perf_counter() - started
+
+    def tap(self, results: Iterable[Detections], run_id: Optional[int] = None, lot: Optional[str] = None,
+            batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Detections]:
+        """결과를 그대로 내보내면서 ``batch_size`` 장마다 데이터베이스에 기록합니다.
+
+        앞 단계에서 예외가 나거나 소비가 중단되어도 이미 받은 결과는 기록합니다.
+        """
+        batch_size = max(1, int(batch_size))
+        batch: List[Detections] = []
+        try:
+            for det in results:
+                batch.append(det)
+                if len(batch) >= batch_size:
+                    pending, batch = batch, []
+                    self.insert(pending, run_id, lot)
+                    yield from pending
+        finally:
+            if batch:
+                self.insert(batch, run_id, lot)
+        yield from batch
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _where(lot: Optional[str] = None, board: Optional[str] = None, cls: Optional[int] = None,
+               min_conf: Optional[float] = None, since: Optional[float] = None,
+               until: Optional[float] = None) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for clause, value in (("i.lot = ?", lot), ("i.board = ?", board), ("d.cls = ?", cls),
+                              ("d.conf >= ?", min_conf), ("i.inspected >= ?", since),
+                              ("i.inspected < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def defect_counts(self, lot: Optional[str] = None, min_conf: Optional[float] = None,
+                      since: Optional[float] = None, until: Optional[float] = None) -> List[Dict[str, Any]]:
+        """로트별, 클래스별 결함 수를 반환합니다.
+
+        Args:
+            lot: 특정 로트만 집계 (None이면 전체)
+            min_conf: 최소 신뢰도
+            since: 검사 시각 하한 (epoch 초, 포함)
+            until: 검사 시각 상한 (epoch 초, 미포함)
+
+        Returns:
+            ``{"lot", "cls", "name", "count"}`` 목록 (로트, 클래스 순)
+        """
+        where, params = self._where(lot=lot, min_conf=min_conf, since=since, until=until)
+        rows = self._query(
+            "SELECT i.lot, d.cls, c.name, COUNT(*) FROM detections d "
+            "JOIN images i ON i.id = d.image_id LEFT JOIN classes c ON c.id = d.cls"
+            f"{where} GROUP BY i.lot, d.cls ORDER BY i.lot, d.cls", params)
+        return [{"lot": lot_, "cls": cls, "name": name or str(cls), "count": count}
+                for lot_, cls, name, count in rows]
+
+    def find_detections(self, board: Optional[str] = None, lot: Optional[str] = None,
+                        cls: Optional[int] = None, min_conf: Optional[float] = None,
+                        since: Optional[float] = None, until: Optional[float] = None,
+                        limit: int = 1000) -> List[Dict[str, Any]]:
+        """조건에 맞는 결함을 최근 검사 순으로 반환합니다.
+
+        Args:
+            board: 보드 이름 (이미지 파일 이름에서 확장자를 뺀 것)
+            lot: 로트 이름
+            cls: 클래스 ID
+            min_conf: 최소 신뢰도
+            since: 검사 시각 하한 (epoch 초)
+            until: 검사 시각 상한 (epoch 초)
+            limit: 최대 행 수
+
+        Returns:
+            ``{"path", "board", "lot", "inspected", "cls", "conf", "box"}`` 목록
+        """
+        where, params = self._where(lot, board, cls, min_conf, since, until)
+        rows = self._query(
+            "SELECT i.path, i.board, i.lot, i.inspected, d.cls, d.conf, d.x1, d.y1, d.x2, d.y2 "
+            f"FROM detections d JOIN images i ON i.id = d.image_id{where} "
+            "ORDER BY i.inspected DESC LIMIT ?", params + [int(limit)])
+        return [{"path": path, "board": board_, "lot": lot_, "inspected": inspected, "cls": cls_,
+                 "conf": conf, "box": [x1, y1, x2, y2]}
+                for path, board_, lot_, inspected, cls_, conf, x1, y1, x2, y2 in rows]
+
+    def board_history(self, board: str) -> List[Dict[str, Any]]:
+        """보드 한 장의 검사 이력(검사 시각, 로트, 결함 수)을 오래된 순으로 반환합니다."""
+        rows = self._query(
+            "SELECT path, lot, inspected, num_defects FROM images WHERE board = ? ORDER BY inspected",
+            (board,))
+        return [{"path": path, "lot": lot, "inspected": inspected, "num_defects": n}
+                for path, lot, inspected, n in rows]
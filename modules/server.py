@@ -0,0 +1,371 @@
+"""모델을 한 번만 로드해 두고 HTTP 요청으로 추론하는 로컬 서버 모듈.
+
+동시에 들어온 요청의 이미지는 ``MicroBatcher`` 가 최대 ``max_batch`` 장까지,
+첫 이미지가 도착한 뒤 최대 ``max_wait_ms`` 동안 모아 한 번에 모델에 넣습니다.
+표준 라이브러리 ``http.server`` 만 사용하므로 외부 서비스 없이 localhost에서
+바로 테스트할 수 있습니다.
+
+엔드포인트:
+    POST /infer    이미지 바이트 업로드 또는 ``{"paths": [...]}`` JSON
+    GET  /health   상태 및 모델 정보
+    GET  /metrics  요청 지연(p50/p95/max), 큐 깊이, 배치 크기 통계
+                   (``?format=prometheus`` 이면 Prometheus 텍스트 형식)
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from modules.data_loader import DecodedImageCache, load_single_image
+from modules.metrics import NULL_METRICS, Metrics
+from modules.postprocessor import Detections, result_arrays, scale_boxes
+from modules.preprocessor import DEFAULT_IMGSZ, LetterboxBatch, preprocess
+
+logger = logging.getLogger(__name__)
+
+# 마이크로배치 기본 설정 (config.yaml의 server 섹션으로 덮어씀)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_MAX_BATCH = 8
+DEFAULT_MAX_WAIT_MS = 10.0
+DEFAULT_MAX_UPLOAD_MB = 50
+
+# 지연 통계를 계산할 최근 요청 수
+LATENCY_WINDOW = 1000
+
+
+class _Pending(NamedTuple):
+    """배치를 기다리는 이미지 한 장."""
+    path: str
+    image: np.ndarray
+    future: Future
+    enqueued: float
+
+
+class MicroBatcher:
+    """동시 요청을 모아 배치 추론하는 백그라운드 스레드.
+
+    Args:
+        model: ``model_loader.load_model`` 로 로드한 모델 백엔드
+        max_batch: 한 번에 모델에 넣을 최대 이미지 수
+        max_wait_ms: 첫 이미지 도착 후 배치를 채우기 위해 기다리는 최대 시간
+        imgsz: 레터박스 입력 크기
+        confidence: 신뢰도 임계값
+        metrics: 전달되면 배치 크기/지연과 처리/실패 수를 기록할 계측기
+    """
+
+    def __init__(self, model: Any, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS, imgsz: int = DEFAULT_IMGSZ,
+                 confidence: float = 0.5, metrics: Optional[Metrics] = None):
+        self.model = model
+        self.metrics = metrics or NULL_METRICS
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.imgsz = imgsz
+        self.confidence = confidence
+
+        self._queue: "queue.Queue[Optional[_Pending]]" = queue.Queue()
+        self._buffer: Optional[LetterboxBatch] = None
+        self._lock = threading.Lock()
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self.images = 0
+        self.batches = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: str, image: np.ndarray) -> Future:
+        """이미지 한 장을 큐에 넣고 ``Detections`` 를 돌려줄 Future를 반환합니다."""
+        future: Future = Future()
+        self._queue.put(_Pending(path, image, future, time.perf_counter()))
+        return future
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """남은 요청을 처리한 뒤 배치 스레드를 종료합니다 (``timeout`` 초까지만 기다림)."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _collect(self, first: _Pending) -> List[_Pending]:
+        """첫 요청부터 ``max_batch`` 장 또는 ``max_wait`` 까지 모읍니다."""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # 종료 신호는 현재 배치를 처리한 뒤 다시 꺼내도록 되돌려 놓음
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            batch_start = time.perf_counter()
+            try:
+                detections = self._infer(batch)
+            except Exception as e:
+                logger.error(f"배치 추론 실패 ({len(batch)}개 이미지): {e}")
+                self.metrics.inc("images_failed_total", len(batch), stage="inference")
+                with self._lock:
+                    self.failed += len(batch)
+                for item in batch:
+                    item.future.set_exception(e)
+                continue
+
+            finished = time.perf_counter()
+            self.metrics.observe("batch_seconds", finished - batch_start, stage="model")
+            self.metrics.observe("batch_size", len(batch))
+            self.metrics.inc("batches_total")
+            self.metrics.inc("images_processed_total", len(batch))
+            for item in batch:
+                self.metrics.observe("request_seconds", finished - item.enqueued)
+            with self._lock:
+                self.images += len(batch)
+                self.batches += 1
+                self._latencies.extend(finished - item.enqueued for item in batch)
+            for item, det in zip(batch, detections):
+                item.future.set_result(det)
+
+    def _infer(self, batch: List[_Pending]) -> List[Detections]:
+        # 배치 버퍼는 최대 크기로 한 번 할당하여 재사용
+        if self._buffer is None:
+            self._buffer = LetterboxBatch(self.max_batch, self.imgsz)
+        buffer = preprocess([item.image for item in batch], self.imgsz, self._buffer)
+        results = self.model(buffer.images[:len(batch)], conf=self.confidence, verbose=False)
+
+        detections = []
+        for slot, (item, result) in enumerate(zip(batch, results)):
+            xyxy, conf, cls = result_arrays(result)
+            meta = buffer.meta[slot]
+            detections.append(Detections(path=item.path, xyxy=scale_boxes(xyxy, meta), conf=conf,
+                                         cls=cls, orig_shape=(int(meta[3]), int(meta[4]))))
+        return detections
+
+    def stats(self) -> Dict[str, Any]:
+        """처리량, 요청 지연, 큐 깊이 통계를 반환합니다."""
+        with self._lock:
+            latencies_ms = np.asarray(self._latencies) * 1000.0
+            stats = {
+                "images": self.images,
+                "batches": self.batches,
+                "failed": self.failed,
+                "mean_batch_size": self.images / self.batches if self.batches else 0.0,
+            }
+        stats["queue_depth"] = self.queue_depth
+        if latencies_ms.size:
+            stats["latency_ms"] = {
+                "p50": float(np.percentile(latencies_ms, 50)),
+                "p95": float(np.percentile(latencies_ms, 95)),
+                "max": float(latencies_ms.max()),
+            }
+        return stats
+
+
+def detections_to_dict(det: Detections, names: Optional[Dict[int, str]] = None) -> Dict[str, Any]:
+    """``Detections`` 를 JSON 응답용 딕셔너리로 변환합니다."""
+    names = names or {}
+    return {
+        "path": det.path,
+        "orig_shape": list(det.orig_shape),
+        "detections": [
+            {"box": [round(v, 2) for v in box], "conf": round(conf, 4), "cls": cls,
+             "name": names.get(cls, str(cls))}
+            for box, conf, cls in zip(det.xyxy.tolist(), det.conf.tolist(), det.cls.tolist())
+        ],
+    }
+
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    """추론 서버 HTTP 핸들러. ``server.app`` 에서 배처와 설정을 참조합니다."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        app: InferenceServer = self.server.app
+        path, _, query = self.path.partition("?")
+        if path == "/health":
+            self._send_json(200, app.health())
+        elif path == "/metrics" and "format=prometheus" in query:
+            body = app.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif path == "/metrics":
+            self._send_json(200, app.metrics())
+        else:
+            self._send_json(404, {"error": f"알 수 없는 경로: {self.path}"})
+
+    def do_POST(self) -> None:
+        app: InferenceServer = self.server.app
+        if self.path != "/infer":
+            self._send_json(404, {"error": f"알 수 없는 경로: {self.path}"})
+            return
+
+        started = time.perf_counter()
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            self._send_json(400, {"error": "요청 본문이 비어 있습니다."})
+            return
+        if length > app.max_upload_bytes:
+            # 본문을 읽지 않았으므로 연결을 재사용하지 않음
+            self.close_connection = True
+            self._send_json(413, {"error": f"요청 본문이 너무 큽니다: {length} bytes"})
+            return
+        body = self.rfile.read(length)
+
+        try:
+            futures = app.submit(self.headers.get("Content-Type", ""), body,
+                                 self.headers.get("X-Image-Name", "upload"))
+        except (ValueError, KeyError, OSError) as e:
+            # JSON 문법 오류(JSONDecodeError)도 ValueError
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            results = [detections_to_dict(f.result(), app.names) for f in futures]
+        except Exception as e:
+            self._send_json(500, {"error": f"추론 실패: {e}"})
+            return
+        self._send_json(200, {"results": results,
+                              "latency_ms": (time.perf_counter() - started) * 1000.0})
+
+
+class InferenceServer:
+    """모델 백엔드와 마이크로배처를 감싼 HTTP 추론 서버.
+
+    Args:
+        model: ``model_loader.load_model`` 로 로드한 모델 백엔드
+        host: 바인딩할 주소
+        port: 포트 (0이면 임의의 빈 포트)
+        max_batch: 마이크로배치 최대 크기
+        max_wait_ms: 마이크로배치 최대 대기 시간
+        imgsz: 레터박스 입력 크기
+        confidence: 신뢰도 임계값
+        max_upload_mb: 요청 본문 최대 크기 (MB)
+        cache: 경로 요청에 사용할 디코딩 이미지 캐시
+        metrics: Prometheus 지표를 기록할 계측기 (None이면 새로 만듦)
+    """
+
+    def __init__(self, model: Any, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 max_batch: int = DEFAULT_MAX_BATCH, max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+                 imgsz: int = DEFAULT_IMGSZ, confidence: float = 0.5,
+                 max_upload_mb: float = DEFAULT_MAX_UPLOAD_MB,
+                 cache: Optional[DecodedImageCache] = None,
+                 metrics: Optional[Metrics] = None):
+        self.model = model
+        self.names = dict(getattr(model, "names", None) or {})
+        self.max_upload_bytes = int(max_upload_mb * 1024 * 1024)
+        self.cache = cache
+        # /metrics?format=prometheus 를 위해 계측은 항상 켜 둠
+        self.registry = metrics or Metrics()
+        self.batcher = MicroBatcher(model, max_batch, max_wait_ms, imgsz, confidence, self.registry)
+        self.requests = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), InferenceRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.app = self
+
+    @property
+    def address(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def submit(self, content_type: str, body: bytes, name: str) -> List[Future]:
+        """요청 본문을 디코딩하여 배처에 넣습니다.
+
+        Raises:
+            ValueError: 본문을 해석하거나 이미지를 디코딩할 수 없을 때
+            OSError: 요청한 경로의 파일을 읽을 수 없을 때
+        """
+        with self._lock:
+            self.requests += 1
+        self.registry.inc("requests_total")
+
+        if content_type.startswith("application/json"):
+            payload = json.loads(body)
+            if not isinstance(payload, dict):
+                raise ValueError("JSON 본문은 객체여야 합니다.")
+            paths = payload.get("paths") or ([payload["path"]] if "path" in payload else [])
+            if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+                raise ValueError("'path' 는 문자열, 'paths' 는 문자열 목록이어야 합니다.")
+            if not paths:
+                raise ValueError("'path' 또는 'paths' 가 필요합니다.")
+            images = [(path, load_single_image(path, cache=self.cache)) for path in paths]
+        else:
+            import cv2
+
+            image = cv2.imdecode(np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError("업로드된 이미지를 디코딩할 수 없습니다.")
+            images = [(name, image)]
+
+        return [self.batcher.submit(path, image) for path, image in images]
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "backend": getattr(self.model, "name", type(self.model).__name__),
+            "device": str(getattr(self.model, "device", "unknown")),
+            "uptime_sec": time.time() - self.started,
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        stats = self.batcher.stats()
+        stats["requests"] = self.requests
+        stats["max_batch"] = self.batcher.max_batch
+        stats["max_wait_ms"] = self.batcher.max_wait * 1000.0
+        return stats
+
+    def prometheus(self) -> str:
+        """Prometheus 텍스트 형식 지표를 반환합니다."""
+        self.registry.set("queue_depth", self.batcher.queue_depth)
+        return self.registry.to_prometheus()
+
+    def serve_forever(self) -> None:
+        logger.info(f"추론 서버 시작: {self.address} (max_batch={self.batcher.max_batch}, "
+                    f"max_wait={self.batcher.max_wait * 1000:.1f} ms)")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """서버 소켓을 닫고 남은 배치를 처리한 뒤 종료합니다."""
+        self.httpd.server_close()
+        self.batcher.close()
+        logger.info(f"추론 서버 종료: {self.metrics()}")
@@ -0,0 +1,72 @@
+"""이미지 샤드를 읽는 Ultralytics 학습 데이터셋/트레이너 모듈.
+
+``ShardDetectionTrainer`` 는 기본 ``DetectionTrainer`` 와 같게 데이터셋을
+만든 뒤, 해당 분할의 유효한 이미지 샤드(``modules.train_cache.ImageShard``)가
+있으면 JPEG 디코딩 대신 샤드에서 이미지를 읽도록 바꿉니다. 샤드가 없거나
+입력 크기가 다르면 기본 동작 그대로 학습합니다.
+
+Ultralytics를 임포트하므로 학습할 때만 임포트합니다::
+
+    from modules.shard_dataset import ShardDetectionTrainer
+    model.train(data=..., imgsz=640, trainer=ShardDetectionTrainer)
+"""
+import logging
+from pathlib import Path
+
+import numpy as np
+from ultralytics.data.dataset import YOLODataset
+from ultralytics.models.yolo.detect import DetectionTrainer
+
+from modules.train_cache import ImageShard
+
+logger = logging.getLogger(__name__)
+
+
+class ShardYOLODataset(YOLODataset):
+    """``load_image`` 가 이미지 샤드에서 축소된 이미지를 읽는 ``YOLODataset``."""
+
+    shard = None
+
+    def load_image(self, i, rect_mode=True):
+        """샤드에 있는 이미지는 디코딩/축소 없이 반환하고, 나머지는 기본 동작을 따릅니다.
+
+        샤드는 긴 변을 ``imgsz`` 에 맞춘 rect 모드 크기로 저장되어 있으므로
+        정사각형으로 늘리는 ``rect_mode=False`` 요청은 기본 동작으로 넘깁니다.
+        증강 학습에서는 기본 ``load_image`` 와 같게 이미지를 ``ims``/``buffer`` 에
+        등록합니다 (Mosaic이 ``buffer`` 에서 이웃 이미지를 고름).
+        """
+        if rect_mode and self.shard is not None and self.ims[i] is None:
+            found = self.shard.get(self.im_files[i])
+            if found is not None:
+                # 증강이 배열을 수정할 수 있으므로 읽기 전용 매핑 뷰를 복사
+                image, hw0 = np.array(found[0]), found[1]
+                if self.augment:
+                    self._add_to_buffer(i, image, hw0)
+                return image, hw0, image.shape[:2]
+        return super().load_image(i, rect_mode)
+
+    def _add_to_buffer(self, i, image, hw0):
+        """``BaseDataset.load_image`` 의 증강용 버퍼 관리와 같은 처리."""
+        self.ims[i], self.im_hw0[i], self.im_hw[i] = image, hw0, image.shape[:2]
+        self.buffer.append(i)
+        if 1 < len(self.buffer) >= self.max_buffer_length:
+            j = self.buffer.pop(0)
+            if self.cache != "ram":
+                self.ims[j], self.im_hw0[j], self.im_hw[j] = None, None, None
+
+
+class ShardDetectionTrainer(DetectionTrainer):
+    """분할별 이미지 샤드가 있으면 ``ShardYOLODataset`` 을 사용하는 검출 트레이너."""
+
+    def build_dataset(self, img_path, mode="train", batch=None):
+        dataset = super().build_dataset(img_path, mode, batch)
+        image_dir = Path(img_path)
+        shard = ImageShard.open(image_dir.parent.parent, image_dir.name, self.args.imgsz)
+        if shard is None:
+            logger.info(f"이미지 샤드 없음, JPEG 디코딩 사용: {img_path}")
+        elif type(dataset) is YOLODataset:
+            # 생성 인자는 Ultralytics 버전마다 달라 기본 데이터셋을 만든 뒤 클래스만 바꿈
+            dataset.__class__ = ShardYOLODataset
+            dataset.shard = shard
+            logger.info(f"이미지 샤드 사용: {shard.data_path} ({len(shard)}개 이미지)")
+        return dataset
@@ -0,0 +1,355 @@
+"""여러 프로세스에 추론을 나누어 실행하는 모듈.
+
+부모 프로세스가 이미지를 디코딩/레터박스하여 ``multiprocessing.shared_memory``
+배치 버퍼에 직접 쓰고, 각 워커 프로세스는 자기 모델로 버퍼를 읽어 추론합니다.
+프로세스 사이에는 슬롯 번호와 레터박스 메타데이터, 박스 배열만 오가므로
+픽셀 데이터는 피클링되지 않습니다. 워커마다 연산 스레드 수를 고정하여 여러
+프로세스가 코어를 나누어 쓰도록 하며, 결과는 입력 순서대로 내보냅니다.
+"""
+import logging
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from multiprocessing import get_context
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from modules.data_loader import DecodedImageCache
+from modules.inference import DEFAULT_BATCH_SIZE, DEFAULT_NUM_WORKERS, _load_into
+from modules.metrics import NULL_METRICS, Metrics
+from modules.postprocessor import Detections
+from modules.preprocessor import DEFAULT_IMGSZ, LetterboxBatch
+
+logger = logging.getLogger(__name__)
+
+# 워커당 공유 메모리 배치 슬롯 수 (하나는 추론 중, 하나는 채우는 중)
+SLOTS_PER_WORKER = 2
+
+# 워커 결과를 기다리는 동안 워커 프로세스 생존 여부를 확인하는 주기 (초)
+LIVENESS_INTERVAL = 1.0
+
+# 워커 프로세스에서 스레드 수를 고정할 때 설정하는 환경 변수
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+@contextmanager
+def _thread_env(threads: int) -> Iterator[None]:
+    """워커를 시작하는 동안 부모 환경 변수에 스레드 수를 설정합니다.
+
+    spawn 워커는 ``modules.sharding`` 을 언피클하면서 NumPy를 먼저 임포트하므로,
+    BLAS/OpenMP 스레드 수는 워커 안이 아니라 시작 전에 물려줄 환경에 있어야 적용됩니다.
+    """
+    saved = {var: os.environ.get(var) for var in _THREAD_ENV_VARS}
+    os.environ.update({var: str(threads) for var in _THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def _worker_main(worker_id: int, model_path: str, model_options: Dict[str, Any], threads: int,
+                 slot_names: List[str], batch_size: int, imgsz: int, confidence: float,
+                 tasks: Any, results: Any) -> None:
+    """워커 프로세스 본체: 공유 메모리 슬롯을 읽어 추론하고 박스만 돌려보냅니다."""
+    from modules.model_loader import load_model
+    from modules.postprocessor import result_arrays, scale_boxes
+
+    try:
+        try:
+            import torch
+
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+        model = load_model(model_path, intra_op_threads=threads, imgsz=imgsz, **model_options)
+    except Exception as e:
+        results.put(("error", worker_id, None, f"모델 로딩 실패: {e}"))
+        return
+
+    # spawn 워커는 부모의 resource_tracker를 공유하므로 해제(unlink)는 부모가 담당
+    blocks = [shared_memory.SharedMemory(name=name) for name in slot_names]
+    views = [np.ndarray((batch_size, 3, imgsz, imgsz), dtype=np.float32, buffer=b.buf) for b in blocks]
+    results.put(("ready", worker_id, None, None))
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            batch_id, slot, meta = task
+            try:
+                outputs = model(views[slot][:len(meta)], conf=confidence, verbose=False)
+                boxes = []
+                for row, result in zip(meta, outputs):
+                    xyxy, conf, cls = result_arrays(result)
+                    boxes.append((scale_boxes(xyxy, row), conf, cls))
+                results.put(("done", batch_id, slot, boxes))
+            except Exception as e:
+                results.put(("error", batch_id, slot, str(e)))
+    finally:
+        del views
+        for block in blocks:
+            block.close()
+
+
+def run_sharded_inference(
+    model_path: str,
+    images: Iterable[str],
+    workers: int,
+    threads_per_worker: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    num_workers: int = DEFAULT_NUM_WORKERS,
+    imgsz: int = DEFAULT_IMGSZ,
+    confidence: float = 0.5,
+    stats: Optional[Dict[str, Any]] = None,
+    cache: Optional[DecodedImageCache] = None,
+    metrics: Optional[Metrics] = None,
+    with_images: bool = False,
+    **model_options: Any,
+) -> Iterator[Union[Detections, Tuple[Detections, np.ndarray]]]:
+    """여러 워커 프로세스로 추론을 나누어 실행합니다.
+
+    Args:
+        model_path: 각 워커가 로드할 모델 경로
+        images: 이미지 파일 경로 이터러블
+        workers: 워커 프로세스 수
+        threads_per_worker: 워커당 연산 스레드 수 (None이면 CPU 코어 수 / 워커 수)
+        batch_size: 한 번에 워커에 넘길 이미지 수
+        num_workers: 부모 프로세스의 디코딩 스레드 수
+        imgsz: 레터박스 입력 크기
+        confidence: 신뢰도 임계값
+        stats: 전달되면 처리량/지연 통계를 채워 넣을 딕셔너리
+        cache: 디코딩된 이미지 캐시
+        metrics: 전달되면 배치 왕복 시간과 처리/실패 수를 기록할 계측기
+        with_images: True이면 (``Detections``, 디코딩된 원본 이미지) 쌍을 내보냄 (시각화/크롭이 다시 디코딩하지 않도록)
+        **model_options: ``load_model`` 에 전달할 옵션 (backend, device 등)
+
+    Yields:
+        입력 순서대로 이미지별 ``Detections``
+
+    Raises:
+        RuntimeError: 워커의 모델 로딩 또는 추론이 실패했거나 워커 프로세스가 비정상 종료했을 때
+    """
+    metrics = metrics or NULL_METRICS
+    workers = max(1, int(workers))
+    batch_size = max(1, int(batch_size))
+    threads = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+    model_options.setdefault("device", "cpu")
+
+    ctx = get_context("spawn")
+    num_slots = workers * SLOTS_PER_WORKER
+    nbytes = batch_size * 3 * imgsz * imgsz * np.dtype(np.float32).itemsize
+    blocks = [shared_memory.SharedMemory(create=True, size=nbytes) for _ in range(num_slots)]
+    buffers = [
+        LetterboxBatch(batch_size, imgsz, images=np.ndarray((batch_size, 3, imgsz, imgsz),
+                                                            dtype=np.float32, buffer=b.buf))
+        for b in blocks
+    ]
+    tasks = ctx.Queue()
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker_main, name=f"infer-worker-{i}", daemon=True,
+                    args=(i, str(model_path), model_options, threads, [b.name for b in blocks],
+                          batch_size, imgsz, confidence, tasks, results))
+        for i in range(workers)
+    ]
+
+    free_slots = list(range(num_slots))
+    in_flight: Dict[int, Tuple[List[str], float]] = {}
+    finished: Dict[int, Tuple[List[str], List[Tuple[np.ndarray, np.ndarray, np.ndarray]], np.ndarray]] = {}
+    metas: Dict[int, np.ndarray] = {}
+    # with_images일 때 결과를 내보낼 때까지 들고 있는 배치별 원본 이미지
+    decoded: Dict[int, List[np.ndarray]] = {}
+    batch_latencies: List[float] = []
+    num_images = 0
+    num_failed = 0
+    next_batch = 0
+    next_emit = 0
+
+    def next_result(block: bool) -> Tuple[str, int, Optional[int], Any]:
+        """워커 결과를 하나 꺼냅니다.
+
+        기다리는 동안 주기적으로 워커 생존 여부를 확인하여, 워커가 죽었으면
+        (OOM 종료, 네이티브 코드 오류 등) 영원히 기다리지 않고 예외를 냅니다.
+
+        Raises:
+            queue.Empty: ``block`` 이 False이고 받을 결과가 없을 때
+            RuntimeError: 워커 프로세스가 종료되었을 때
+        """
+        if not block:
+            return results.get_nowait()
+        while True:
+            try:
+                return results.get(timeout=LIVENESS_INTERVAL)
+            except queue.Empty:
+                dead = [process for process in processes if not process.is_alive()]
+                if dead:
+                    raise RuntimeError("워커 프로세스가 비정상 종료되었습니다: " + ", ".join(
+                        f"{process.name} (exitcode {process.exitcode})" for process in dead))
+
+    def receive(block: bool) -> bool:
+        """워커 결과를 하나 받아 정리합니다. 받은 것이 없으면 False."""
+        try:
+            kind, batch_id, slot, payload = next_result(block)
+        except queue.Empty:
+            return False
+        if kind == "error":
+            raise RuntimeError(f"워커 추론 실패 (batch {batch_id}): {payload}")
+        paths, submitted = in_flight.pop(batch_id)
+        batch_latencies.append(time.perf_counter() - submitted)
+        metrics.observe("batch_seconds", batch_latencies[-1], stage="worker")
+        metrics.observe("batch_size", len(paths))
+        metrics.inc("batches_total")
+        metrics.inc("images_processed_total", len(paths))
+        finished[batch_id] = (paths, payload, metas.pop(batch_id))
+        free_slots.append(slot)
+        return True
+
+    def ready() -> Iterator[Union[Detections, Tuple[Detections, np.ndarray]]]:
+        nonlocal next_emit, num_images
+        while next_emit in finished:
+            paths, boxes, meta = finished.pop(next_emit)
+            images_of_batch = decoded.pop(next_emit, None)
+            next_emit += 1
+            num_images += len(paths)
+            for i, (path, (xyxy, conf, cls), row) in enumerate(zip(paths, boxes, meta)):
+                det = Detections(path=path, xyxy=xyxy, conf=conf, cls=cls,
+                                 orig_shape=(int(row[3]), int(row[4])))
+                yield (det, images_of_batch[i]) if with_images else det
+
+    try:
+        with _thread_env(threads):
+            for process in processes:
+                process.start()
+        for _ in processes:
+            kind, worker_id, _, payload = next_result(block=True)
+            if kind == "error":
+                raise RuntimeError(f"워커 {worker_id} 시작 실패: {payload}")
+        logger.info(f"샤딩 추론 시작: 워커 {workers}개 x 스레드 {threads}개, 배치 {batch_size}, "
+                    f"공유 메모리 슬롯 {num_slots}개 ({nbytes / 1e6:.1f} MB)")
+
+        # 처리량은 모델 로딩이 끝난 뒤부터 측정
+        started = time.perf_counter()
+
+        iterator = iter(images)
+        with ThreadPoolExecutor(max_workers=max(1, num_workers), thread_name_prefix="decode") as executor:
+            while True:
+                chunk = list(islice(iterator, batch_size))
+                if not chunk:
+                    break
+                # 빈 슬롯이 없으면 워커 결과를 기다림
+                while not free_slots:
+                    receive(block=True)
+                yield from ready()
+
+                slot = free_slots.pop()
+                buffer = buffers[slot]
+                outcomes = list(executor.map(lambda item: _load_into(item[1], buffer, item[0], cache),
+                                             enumerate(chunk)))
+                ok_slots = [i for i, image in enumerate(outcomes) if image is not None]
+                for new_slot, old_slot in enumerate(ok_slots):
+                    if new_slot != old_slot:
+                        buffer.move(old_slot, new_slot)
+                paths = [chunk[i] for i in ok_slots]
+                if len(paths) < len(chunk):
+                    num_failed += len(chunk) - len(paths)
+                    metrics.inc("images_failed_total", len(chunk) - len(paths), stage="decode")
+                    logger.warning(f"디코딩 실패로 {len(chunk) - len(paths)}개 이미지를 건너뜁니다: "
+                                   f"{[p for p in chunk if p not in paths]}")
+
+                batch_id = next_batch
+                next_batch += 1
+                if not paths:
+                    free_slots.append(slot)
+                    finished[batch_id] = ([], [], np.zeros((0, 5)))
+                else:
+                    meta = buffer.meta[:len(paths)].copy()
+                    metas[batch_id] = meta
+                    if with_images:
+                        decoded[batch_id] = [outcomes[i] for i in ok_slots]
+                    in_flight[batch_id] = (paths, time.perf_counter())
+                    tasks.put((batch_id, slot, meta))
+
+                while receive(block=False):
+                    pass
+                yield from ready()
+
+        while in_flight:
+            receive(block=True)
+            yield from ready()
+        yield from ready()
+    finally:
+        for _ in processes:
+            tasks.put(None)
+        for process in processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        del buffers
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    elapsed = time.perf_counter() - started
+    throughput = num_images / elapsed if elapsed > 0 else 0.0
+    latencies_ms = np.asarray(batch_latencies) * 1000.0
+    if stats is not None:
+        stats.update({
+            "images": num_images,
+            "failed": num_failed,
+            "batches": len(batch_latencies),
+            "elapsed": elapsed,
+            "images_per_sec": throughput,
+            "batch_latency_ms": latencies_ms.tolist(),
+            "workers": workers,
+            "threads_per_worker": threads,
+        })
+    if batch_latencies:
+        logger.info(f"샤딩 추론 완료: {num_images}개 이미지, {throughput:.2f} images/s "
+                    f"(워커 {workers}개), 배치 지연 p50 {np.percentile(latencies_ms, 50):.1f} ms")
+
+
+def scaling_report(
+    model_path: str,
+    images: Sequence[str],
+    worker_counts: Sequence[int],
+    **options: Any,
+) -> List[Dict[str, Any]]:
+    """워커 수를 늘려 가며 처리량을 측정하고 확장 효율을 보고합니다.
+
+    Args:
+        model_path: 모델 경로
+        images: 측정에 사용할 이미지 경로 (매 실행 동일)
+        worker_counts: 측정할 워커 수 목록 (예: [1, 2, 4, 8])
+        **options: ``run_sharded_inference`` 옵션
+
+    Returns:
+        워커 수별 처리량, 속도 향상, 효율 딕셔너리 목록
+    """
+    rows: List[Dict[str, Any]] = []
+    base = None
+    for count in worker_counts:
+        stats: Dict[str, Any] = {}
+        for _ in run_sharded_inference(model_path, images, workers=count, stats=stats, **options):
+            pass
+        throughput = stats.get("images_per_sec", 0.0)
+        base = base or (throughput / count if throughput else None)
+        speedup = throughput / base if base else 0.0
+        rows.append({
+            "workers": count,
+            "threads_per_worker": stats.get("threads_per_worker"),
+            "images_per_sec": throughput,
+            "speedup": speedup,
+            "efficiency": speedup / count if count else 0.0,
+        })
+        logger.info(f"워커 {count}개: {throughput:.2f} images/s, 속도 향상 {speedup:.2f}x, "
+                    f"효율 {rows[-1]['efficiency']:.0%}")
+    return rows
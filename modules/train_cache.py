@@ -0,0 +1,297 @@
+"""학습 데이터 캐시 모듈 (labels.cache 검증, 미리 디코딩한 이미지 샤드).
+
+Ultralytics는 라벨을 처음 읽을 때 ``labels/<split>.cache`` 를 만들어 두는데,
+예전에는 학습할 때마다 이 캐시를 지워 모든 라벨을 다시 훑었습니다. 여기서는
+데이터셋 파일 목록, 크기, 수정 시각으로 만든 지문을 ``labels.fingerprint.json``
+에 기록해 두고, 지문이 같으면 캐시를 그대로 두고 달라졌을 때만 지웁니다.
+
+CPU가 부족한 장비에서는 에폭마다 반복되는 JPEG 디코딩이 학습 시간의 대부분을
+차지하므로, 학습 입력 크기(``imgsz``)로 미리 줄인 uint8 이미지를 하나의
+메모리 매핑 파일(샤드)에 모아 두고 데이터로더가 디코딩 없이 바로 읽게 할 수
+있습니다 (``modules.shard_dataset`` 참고).
+
+저장 구조::
+
+    datasets/deeppcb/
+    ├── labels.fingerprint.json      # labels.cache 검증용 지문
+    └── shards/
+        ├── train_640.npy            # 이미지 픽셀을 이어 붙인 (총 바이트,) uint8
+        └── train_640.index.npz      # 파일 이름, 오프셋, 크기, 원본 크기, 지문
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from modules.data_loader import SUPPORTED_EXTENSIONS, read_image_header
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_NAME = 'labels.fingerprint.json'
+FINGERPRINT_VERSION = 1
+SHARD_DIR = 'shards'
+SHARD_VERSION = 1
+
+# 지문 계산에서 제외할 파일 (Ultralytics가 학습 중에 만드는 라벨 캐시와 cache='disk' 이미지)
+_CACHE_SUFFIXES = {'.cache', '.npy'}
+
+
+def _tree_files(root: Path) -> List[Tuple[str, int, int]]:
+    """``root`` 아래 파일의 (상대 경로, 크기, 수정 시각 ns) 목록 (캐시 파일 제외)."""
+    files = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                stack.append(Path(entry.path))
+            elif os.path.splitext(entry.name)[1].lower() not in _CACHE_SUFFIXES:
+                stat = entry.stat()
+                files.append((Path(entry.path).relative_to(root).as_posix(), stat.st_size, stat.st_mtime_ns))
+    return sorted(files)
+
+
+def _fingerprint(files: Sequence[Tuple[str, int, int]]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for name, size, mtime_ns in files:
+        digest.update(f"{name}\0{size}\0{mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def dataset_fingerprint(dataset_dir: Union[str, Path]) -> Tuple[str, int]:
+    """데이터셋의 ``images/``, ``labels/`` 파일 목록, 크기, 수정 시각으로 지문을 계산합니다.
+
+    파일 내용은 읽지 않으므로 대형 데이터셋에서도 디렉터리 항목을 훑는 비용뿐입니다.
+
+    Returns:
+        (지문, 파일 수)
+    """
+    dataset_dir = Path(dataset_dir)
+    files = [(f"{sub}/{name}", size, mtime_ns)
+             for sub in ('images', 'labels') for name, size, mtime_ns in _tree_files(dataset_dir / sub)]
+    return _fingerprint(files), len(files)
+
+
+def label_cache_files(dataset_dir: Union[str, Path]) -> List[Path]:
+    """데이터셋의 라벨 캐시 파일 (``labels.cache``, ``labels/<split>.cache``) 목록."""
+    dataset_dir = Path(dataset_dir)
+    candidates = [dataset_dir / 'labels.cache'] + sorted((dataset_dir / 'labels').glob('*.cache'))
+    return [path for path in candidates if path.exists()]
+
+
+def validate_labels_cache(dataset_dir: Union[str, Path], force: bool = False) -> bool:
+    """지문이 바뀐 경우에만 라벨 캐시를 삭제합니다.
+
+    현재 지문을 ``labels.fingerprint.json`` 에 기록해 두므로, 이번 학습에서
+    Ultralytics가 새로 만든 캐시는 다음 학습에서 그대로 사용됩니다.
+
+    Args:
+        dataset_dir: 준비된 데이터셋 폴더 (``images/``, ``labels/`` 의 상위)
+        force: True이면 지문과 관계없이 삭제
+
+    Returns:
+        기존 캐시를 유지했으면 True
+    """
+    dataset_dir = Path(dataset_dir)
+    fingerprint_path = dataset_dir / FINGERPRINT_NAME
+    fingerprint, num_files = dataset_fingerprint(dataset_dir)
+    caches = label_cache_files(dataset_dir)
+
+    stored = None
+    if fingerprint_path.exists():
+        try:
+            with open(fingerprint_path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+            if record.get('version') == FINGERPRINT_VERSION:
+                stored = record.get('fingerprint')
+        except (OSError, ValueError) as e:
+            logger.warning(f"지문 파일을 읽을 수 없습니다: {fingerprint_path} ({e})")
+
+    if not force and stored == fingerprint:
+        if caches:
+            logger.info(f"라벨 캐시 유지 (데이터셋 변경 없음, 파일 {num_files}개): "
+                        + ", ".join(str(path) for path in caches))
+        return bool(caches)
+
+    for path in caches:
+        path.unlink()
+        logger.info(f"캐시 파일 삭제: {path}")
+    if caches and not force:
+        logger.info("데이터셋이 바뀌어 라벨 캐시를 다시 만듭니다.")
+
+    tmp = fingerprint_path.with_name(fingerprint_path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': FINGERPRINT_VERSION, 'fingerprint': fingerprint, 'files': num_files}, f)
+    os.replace(tmp, fingerprint_path)
+    return False
+
+
+def resized_shape(height: int, width: int, imgsz: int) -> Tuple[int, int]:
+    """긴 변을 ``imgsz`` 에 맞춘 크기 (Ultralytics ``load_image`` 의 rect 모드와 같은 계산)."""
+    r = imgsz / max(height, width)
+    if r == 1:
+        return height, width
+    return min(math.ceil(height * r), imgsz), min(math.ceil(width * r), imgsz)
+
+
+class ImageShard:
+    """학습 입력 크기로 미리 줄인 이미지들을 담은 메모리 매핑 샤드.
+
+    서로 다른 크기의 이미지를 한 파일에 이어 붙이고 이미지별 오프셋과 크기를
+    색인에 둡니다. 색인에는 원본 분할 폴더의 지문이 들어 있어 이미지가 바뀌면
+    ``open`` 이 None을 반환합니다. 데이터로더 워커로 전달될 때는 경로만
+    넘기고 각 프로세스에서 다시 매핑합니다.
+
+    Args:
+        data_path: 픽셀 파일 (``.npy``)
+        index_path: 색인 파일 (``.index.npz``)
+    """
+
+    def __init__(self, data_path: Union[str, Path], index_path: Union[str, Path]):
+        self.data_path = Path(data_path)
+        self.index_path = Path(index_path)
+        with np.load(self.index_path, allow_pickle=False) as index:
+            if int(index['version']) != SHARD_VERSION:
+                raise ValueError(f"Unsupported shard version: {int(index['version'])}")
+            self.names = index['names']
+            self.offsets = index['offsets']
+            self.shapes = index['shapes']
+            self.orig_shapes = index['orig_shapes']
+            self.imgsz = int(index['imgsz'])
+            self.fingerprint = str(index['fingerprint'])
+        self._rows: Dict[str, int] = {name: i for i, name in enumerate(self.names.tolist())}
+        self._data: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_data'] = None
+        return state
+
+    @staticmethod
+    def paths(dataset_dir: Union[str, Path], split: str, imgsz: int) -> Tuple[Path, Path]:
+        """(픽셀 파일, 색인 파일) 경로를 반환합니다."""
+        root = Path(dataset_dir) / SHARD_DIR
+        return root / f"{split}_{imgsz}.npy", root / f"{split}_{imgsz}.index.npz"
+
+    @staticmethod
+    def _split_files(image_dir: Path) -> List[Tuple[str, int, int]]:
+        return [item for item in _tree_files(image_dir)
+                if '/' not in item[0] and os.path.splitext(item[0])[1].lower() in SUPPORTED_EXTENSIONS]
+
+    @classmethod
+    def open(cls, dataset_dir: Union[str, Path], split: str, imgsz: int) -> Optional["ImageShard"]:
+        """유효한 샤드를 엽니다 (없거나 이미지가 바뀌었으면 None)."""
+        data_path, index_path = cls.paths(dataset_dir, split, imgsz)
+        if not (data_path.exists() and index_path.exists()):
+            return None
+        try:
+            shard = cls(data_path, index_path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"이미지 샤드 색인을 읽을 수 없습니다: {index_path} ({e})")
+            return None
+        if shard.fingerprint != _fingerprint(cls._split_files(Path(dataset_dir) / 'images' / split)):
+            logger.warning(f"이미지가 바뀌어 샤드를 사용하지 않습니다: {data_path}")
+            return None
+        return shard
+
+    @classmethod
+    def build(cls, dataset_dir: Union[str, Path], split: str, imgsz: int, num_workers: int = 4) -> "ImageShard":
+        """``images/<split>`` 의 이미지를 디코딩/축소하여 샤드를 만듭니다.
+
+        이미지 헤더로 크기를 먼저 읽어 오프셋을 정한 뒤, 여러 스레드가 서로
+        다른 구간에 디코딩 결과를 기록합니다. 그레이스케일 이미지도 학습
+        데이터로더와 같게 3채널(BGR)로 저장합니다.
+
+        Raises:
+            ValueError: 이미지를 읽을 수 없을 때
+        """
+        import cv2
+
+        image_dir = Path(dataset_dir) / 'images' / split
+        files = cls._split_files(image_dir)
+        names = [name for name, _, _ in files]
+        orig_shapes = np.zeros((len(names), 2), dtype=np.int32)
+        shapes = np.zeros((len(names), 2), dtype=np.int32)
+        for i, name in enumerate(names):
+            width, height, _ = read_image_header(str(image_dir / name))
+            orig_shapes[i] = height, width
+            shapes[i] = resized_shape(height, width, imgsz)
+        sizes = shapes[:, 0].astype(np.int64) * shapes[:, 1] * 3
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+        data_path, index_path = cls.paths(dataset_dir, split, imgsz)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_data = data_path.with_name(data_path.stem + '.tmp.npy')
+        data = np.lib.format.open_memmap(tmp_data, mode='w+', dtype=np.uint8, shape=(int(offsets[-1]),))
+
+        def fill(i: int) -> None:
+            image = cv2.imread(str(image_dir / names[i]), cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError(f"이미지를 읽을 수 없습니다: {image_dir / names[i]}")
+            h, w = shapes[i]
+            if image.shape[:2] != (h, w):
+                image = cv2.resize(image, (int(w), int(h)), interpolation=cv2.INTER_LINEAR)
+            data[offsets[i]:offsets[i + 1]] = image.reshape(-1)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+                list(executor.map(fill, range(len(names))))
+            data.flush()
+        except BaseException:
+            del data
+            tmp_data.unlink(missing_ok=True)
+            raise
+        del data
+
+        tmp_index = index_path.with_name(index_path.stem + '.tmp.npz')
+        with open(tmp_index, 'wb') as f:
+            np.savez(f, version=np.int32(SHARD_VERSION), names=np.asarray(names, dtype=str),
+                     offsets=offsets, shapes=shapes, orig_shapes=orig_shapes, imgsz=np.int32(imgsz),
+                     fingerprint=np.asarray(_fingerprint(files)))
+        os.replace(tmp_data, data_path)
+        os.replace(tmp_index, index_path)
+        logger.info(f"이미지 샤드 생성: {data_path} ({len(names)}개 이미지, {offsets[-1] / 1e6:.1f} MB)")
+        return cls(data_path, index_path)
+
+    def get(self, image_path: Union[str, Path]) -> Optional[Tuple[np.ndarray, Tuple[int, int]]]:
+        """이미지 파일 이름으로 (축소된 HWC BGR 이미지 뷰, 원본 (높이, 너비))를 찾습니다.
+
+        반환 배열은 읽기 전용 메모리 매핑 뷰이며, 샤드에 없는 이미지는 None입니다.
+        """
+        row = self._rows.get(os.path.basename(str(image_path)))
+        if row is None:
+            return None
+        if self._data is None:
+            self._data = np.load(self.data_path, mmap_mode='r')
+        h, w = self.shapes[row]
+        image = self._data[self.offsets[row]:self.offsets[row + 1]].reshape(int(h), int(w), 3)
+        return image, (int(self.orig_shapes[row][0]), int(self.orig_shapes[row][1]))
+
+
+def ensure_image_shards(dataset_dir: Union[str, Path], imgsz: int, splits: Sequence[str] = ('train', 'val'),
+                        num_workers: int = 4) -> Dict[str, ImageShard]:
+    """분할별 샤드가 없거나 이미지가 바뀌었으면 새로 만들고, 분할 -> 샤드를 반환합니다."""
+    shards = {}
+    for split in splits:
+        if not (Path(dataset_dir) / 'images' / split).is_dir():
+            continue
+        shard = ImageShard.open(dataset_dir, split, imgsz)
+        if shard is None:
+            shard = ImageShard.build(dataset_dir, split, imgsz, num_workers)
+        else:
+            logger.info(f"이미지 샤드 재사용: {shard.data_path} ({len(shard)}개 이미지)")
+        shards[split] = shard
+    return shards
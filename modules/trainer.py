@@ -1,8 +1,8 @@
 """모델 학습을 담당하는 모듈."""
 from typing import Any, Dict
 import os
-from pathlib import Path
 from modules.model_loader import load_pretrained
+from modules.train_cache import validate_labels_cache
 
 
 def train_model(config: Dict[str, Any]) -> None:
@@ -10,15 +10,17 @@ def train_model(config: Dict[str, Any]) -> None:
 
     Args:
         config: 학습에 필요한 설정 딕셔너리. ``output_model`` 경로가 포함되어야 합니다.
+            ``cache_cleanup`` (기본 True) 이면 데이터셋이 바뀐 경우에만, ``rebuild_cache`` 가
+            True이면 데이터셋 변경 여부와 관계없이 라벨 캐시를 삭제합니다 (``yolo_train.py`` 와 같은 규칙).
     """
     dataset_path = config.get("dataset")
     output_model = config.get("output_model")
     pretrained_model = config.get("pretrained_model")
 
-    cache_path = Path(dataset_path) / "labels.cache"
-    if cache_path.exists():
-        cache_path.unlink()
-        print(f"캐시 파일 삭제: {cache_path}")
+    # 데이터셋이 바뀐 경우에만 라벨 캐시 삭제
+    rebuild_cache = config.get("rebuild_cache", False)
+    if config.get("cache_cleanup", True) or rebuild_cache:
+        validate_labels_cache(dataset_path, force=rebuild_cache)
 
     if pretrained_model and os.path.exists(pretrained_model):
         load_pretrained(pretrained_model, device="cuda")
@@ -1,7 +1,299 @@
-"""결과 시각화 모듈."""
-from typing import Any, List
+"""결과 시각화 모듈.
 
+검출 박스를 그린 보드 이미지(또는 결함 크롭)를 백그라운드 워커 풀에서
+렌더링하고 JPEG로 인코딩하여 저장합니다. 추론 스레드는 ``AsyncVisualizer.submit``
+으로 결과를 넘기기만 하고, 디코딩/그리기/인코딩/쓰기는 워커 스레드에서
+수행됩니다 (OpenCV는 이 구간에서 GIL을 놓음). 큐 크기가 제한되어 있어 워커가
+밀리면 ``submit`` 이 잠시 대기하므로 메모리가 무한히 늘지 않습니다.
 
-def visualize(results: List[Any], save_dir: str) -> None:
-    """결과를 시각화하여 저장합니다."""
-    print(f"시각화 저장: {save_dir}")
+렌더링 모드:
+    all      모든 보드를 ``images/`` 에 저장
+    defects  결함이 검출된 보드만 ``images/`` 에 저장 (결함 없는 보드는 디코딩하지 않음)
+    crops    보드 대신 결함 영역 크롭만 ``crops/`` 내용 주소 저장소(``CropStore``)에 저장
+"""
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from modules.crop_store import DEFAULT_CROP_PADDING, CropStore
+from modules.data_loader import DecodedImageCache, load_single_image
+from modules.postprocessor import DetectionStore, Detections
+
+logger = logging.getLogger(__name__)
+
+VIS_MODES = ('all', 'defects', 'crops')
+
+# 기본 설정 (config.yaml의 inference.visualization 섹션으로 덮어씀)
+DEFAULT_MODE = 'defects'
+DEFAULT_JPEG_QUALITY = 90
+DEFAULT_SCALE = 1.0
+DEFAULT_NUM_WORKERS = 2
+DEFAULT_MAX_QUEUE = 32
+
+# 클래스별 박스 색상 (BGR)
+PALETTE = [
+    (56, 56, 255), (151, 157, 255), (31, 112, 255), (29, 178, 255),
+    (49, 210, 207), (10, 249, 72), (23, 204, 146), (134, 219, 61),
+]
+
+
+def draw_detections(
+    image: np.ndarray,
+    xyxy: np.ndarray,
+    conf: np.ndarray,
+    cls: np.ndarray,
+    names: Optional[Dict[int, str]] = None,
+    scale: float = DEFAULT_SCALE,
+) -> np.ndarray:
+    """이미지에 검출 박스와 라벨을 그린 새 배열을 반환합니다.
+
+    입력 이미지는 캐시에서 온 읽기 전용 배열일 수 있으므로 수정하지 않고,
+    축소(``scale < 1``)가 필요하면 먼저 줄인 뒤 그 위에 그립니다.
+
+    Args:
+        image: BGR 이미지 (그레이스케일이면 BGR로 변환)
+        xyxy: (N, 4) 원본 좌표 박스
+        conf: (N,) 신뢰도
+        cls: (N,) 클래스 ID
+        names: 클래스 ID → 이름
+        scale: 출력 배율
+
+    Returns:
+        박스가 그려진 BGR 이미지
+    """
+    import cv2
+
+    names = names or {}
+    if image.ndim == 2:
+        canvas = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    elif scale == 1.0:
+        canvas = image.copy()
+    else:
+        canvas = image
+    if scale != 1.0:
+        height, width = canvas.shape[:2]
+        canvas = cv2.resize(canvas, (max(1, round(width * scale)), max(1, round(height * scale))),
+                            interpolation=cv2.INTER_AREA)
+
+    thickness = max(1, round(max(canvas.shape[:2]) / 640))
+    boxes = np.round(np.asarray(xyxy, dtype=np.float32) * scale).astype(np.int32)
+    for (x1, y1, x2, y2), score, label in zip(boxes.tolist(), np.asarray(conf).tolist(),
+                                              np.asarray(cls).astype(np.int64).tolist()):
+        color = PALETTE[label % len(PALETTE)]
+        cv2.rectangle(canvas, (x1, y1), (x2, y2), color, thickness)
+        text = f"{names.get(label, label)} {score:.2f}"
+        cv2.putText(canvas, text, (x1, max(y1 - 4, 10)), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.4 * thickness, color, thickness, cv2.LINE_AA)
+    return canvas
+
+
+def _iter_detections(results: Union[DetectionStore, Iterable[Detections]]) -> Iterator[Detections]:
+    """``DetectionStore`` 또는 ``Detections`` 이터러블을 이미지별 ``Detections`` 로 풉니다."""
+    if not isinstance(results, DetectionStore):
+        yield from results
+        return
+    for index, path in enumerate(results.paths.tolist()):
+        rows = results.for_image(index)
+        yield Detections(path=path, xyxy=results.xyxy[rows], conf=results.conf[rows],
+                         cls=results.cls[rows], orig_shape=tuple(results.shapes[index]))
+
+
+class AsyncVisualizer:
+    """제한된 큐와 워커 스레드 풀로 결과 이미지를 렌더링/저장합니다.
+
+    Args:
+        save_dir: 저장 폴더 (보드는 ``save_dir/images``, 크롭은 ``save_dir/crops``)
+        mode: 렌더링 모드 (``VIS_MODES``)
+        jpeg_quality: JPEG 품질 (1-100)
+        scale: 보드 이미지 출력 배율 (예: 0.5면 가로세로 절반)
+        num_workers: 렌더링/인코딩 워커 스레드 수
+        max_queue: 대기 중인 작업 최대 수 (가득 차면 ``submit`` 이 대기)
+        names: 클래스 ID → 이름
+        cache: 이미지를 다시 읽을 때 사용할 디코딩 이미지 캐시
+        crop_padding: 크롭 모드의 박스 주변 여백 (픽셀)
+    """
+
+    def __init__(self, save_dir: str, mode: str = DEFAULT_MODE, jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+                 scale: float = DEFAULT_SCALE, num_workers: int = DEFAULT_NUM_WORKERS,
+                 max_queue: int = DEFAULT_MAX_QUEUE, names: Optional[Dict[int, str]] = None,
+                 cache: Optional[DecodedImageCache] = None, crop_padding: int = DEFAULT_CROP_PADDING):
+        if mode not in VIS_MODES:
+            raise ValueError(f"지원하지 않는 시각화 모드입니다: {mode} (지원: {', '.join(VIS_MODES)})")
+        self.save_dir = Path(save_dir)
+        self.mode = mode
+        self.jpeg_quality = int(jpeg_quality)
+        self.scale = float(scale)
+        self.names = dict(names or {})
+        self.cache = cache
+        self.crop_store = None
+        if mode == 'crops':
+            self.crop_store = CropStore(str(self.save_dir / "crops"), crop_padding, jpeg_quality)
+            self.output_dir = self.crop_store.root
+        else:
+            self.output_dir = self.save_dir / "images"
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._lock = threading.Lock()
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self._workers = [
+            threading.Thread(target=self._run, name=f"visualize-{i}", daemon=True)
+            for i in range(max(1, int(num_workers)))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self) -> "AsyncVisualizer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def submit(self, det: Detections, image: Optional[np.ndarray] = None) -> None:
+        """이미지 한 장의 결과를 렌더링 큐에 넣습니다.
+
+        Args:
+            det: 이미지별 검출 결과 (원본 좌표)
+            image: 이미 디코딩된 원본 이미지 (없으면 워커가 ``det.path`` 에서 읽음)
+        """
+        if self.mode != 'all' and not len(det.conf):
+            if self.crop_store is not None:
+                # 재검사에서 검출이 없어진 보드의 예전 크롭을 색인에서 지움 (이미지 불필요)
+                self.crop_store.add(det.path, None, det.xyxy, det.conf, det.cls)
+            with self._lock:
+                self.skipped += 1
+            return
+        started = time.perf_counter()
+        self._queue.put((det, image))
+        waited = time.perf_counter() - started
+        if waited > 0.001:
+            with self._lock:
+                self.blocked_seconds += waited
+
+    def tap(self, results: Iterable[Union[Detections, Tuple[Detections, np.ndarray]]]) -> Iterator[Detections]:
+        """결과를 그대로 내보내면서 렌더링 큐에도 넣는 제너레이터를 반환합니다.
+
+        ``(Detections, 디코딩된 이미지)`` 쌍이 들어오면 이미지를 함께 넘겨 워커가
+        다시 디코딩하지 않게 하고, 내보낼 때는 ``Detections`` 만 내보냅니다.
+        """
+        for item in results:
+            det, image = (item, None) if isinstance(item, Detections) else item
+            self.submit(det, image)
+            yield det
+
+    def close(self) -> None:
+        """남은 작업을 모두 저장한 뒤 워커를 종료합니다."""
+        if not any(worker.is_alive() for worker in self._workers):
+            return
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        if self.crop_store is not None:
+            self.crop_store.close()
+        logger.info(f"시각화 완료: {self.written}개 저장, {self.skipped}개 건너뜀, {self.failed}개 실패, "
+                    f"{self.bytes / 1e6:.1f} MB -> {self.output_dir}")
+        if self.blocked_seconds > 0.1:
+            logger.info(f"시각화 큐가 가득 차 추론이 {self.blocked_seconds:.2f}초 대기했습니다 "
+                        f"(num_workers/scale/jpeg_quality 조정 고려)")
+
+    def stats(self) -> Dict[str, Any]:
+        """저장 수, 건너뜀/실패 수, 기록 바이트, 대기 시간을 반환합니다."""
+        with self._lock:
+            stats = {
+                "written": self.written,
+                "skipped": self.skipped,
+                "failed": self.failed,
+                "bytes": self.bytes,
+                "busy_seconds": self.busy_seconds,
+                "blocked_seconds": self.blocked_seconds,
+                "queue_depth": self._queue.qsize(),
+            }
+        if self.crop_store is not None:
+            stats["crops"] = self.crop_store.stats()
+        return stats
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            det, image = item
+            started = time.perf_counter()
+            try:
+                written = self._render(det, image)
+            except Exception as e:
+                logger.warning(f"시각화 실패, 건너뜁니다: {det.path} ({e})")
+                with self._lock:
+                    self.failed += 1
+                continue
+            with self._lock:
+                self.written += 1
+                self.bytes += written
+                self.busy_seconds += time.perf_counter() - started
+
+    def _render(self, det: Detections, image: Optional[np.ndarray]) -> int:
+        """한 장을 렌더링/인코딩하여 쓰고 기록한 바이트 수를 반환합니다."""
+        import cv2
+
+        if image is None:
+            image = load_single_image(det.path, cache=self.cache)
+
+        if self.crop_store is not None:
+            # 크롭 바이트 수는 저장소 통계(중복 제거 포함)로 집계
+            self.crop_store.add(det.path, image, det.xyxy, det.conf, det.cls)
+            return 0
+
+        canvas = draw_detections(image, det.xyxy, det.conf, det.cls, self.names, self.scale)
+        path = self.output_dir / f"{Path(det.path).stem}.jpg"
+        ok, encoded = cv2.imencode(".jpg", canvas, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise ValueError(f"JPEG 인코딩 실패: {path}")
+        path.write_bytes(encoded.tobytes())
+        return encoded.size
+
+
+def visualize(
+    results: Union[DetectionStore, Iterable[Detections]],
+    save_dir: str,
+    mode: str = DEFAULT_MODE,
+    jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+    scale: float = DEFAULT_SCALE,
+    num_workers: int = DEFAULT_NUM_WORKERS,
+    max_queue: int = DEFAULT_MAX_QUEUE,
+    names: Optional[Dict[int, str]] = None,
+    cache: Optional[DecodedImageCache] = None,
+) -> Dict[str, Any]:
+    """결과를 시각화하여 저장합니다.
+
+    이미 모은 결과(``DetectionStore``)를 한 번에 저장할 때 사용합니다. 추론과
+    겹쳐 실행하려면 ``AsyncVisualizer.tap`` 으로 결과 제너레이터를 감쌉니다.
+
+    Args:
+        results: ``summarize`` 결과 또는 이미지별 ``Detections`` 이터러블
+        save_dir: 저장 폴더
+        mode: 렌더링 모드 (``VIS_MODES``)
+        jpeg_quality: JPEG 품질
+        scale: 보드 이미지 출력 배율
+        num_workers: 워커 스레드 수
+        max_queue: 대기 작업 최대 수
+        names: 클래스 ID → 이름
+        cache: 디코딩된 이미지 캐시
+
+    Returns:
+        ``AsyncVisualizer.stats`` 통계
+    """
+    with AsyncVisualizer(save_dir, mode, jpeg_quality, scale, num_workers, max_queue, names, cache) as visualizer:
+        for det in _iter_detections(results):
+            visualizer.submit(det)
+    return visualizer.stats()
@@ -0,0 +1,418 @@
+"""핫 폴더 감시 및 연속 추론 모듈.
+
+카메라가 이미지를 떨어뜨리는 폴더를 감시하여, 쓰기가 끝난 파일만 골라
+상주 모델로 추론하고 결과를 JSONL 파일에 한 줄씩 덧붙입니다.
+
+Linux에서는 inotify(``IN_CLOSE_WRITE``, ``IN_MOVED_TO``)로 완료된 파일을 통지받아
+디렉터리를 다시 훑지 않습니다. inotify를 쓸 수 없거나(다른 OS, 네트워크 공유)
+``mode="poll"`` 이면 디렉터리 수정 시각이 바뀔 때만 목록을 읽고, 새 파일은
+크기와 수정 시각이 ``settle_seconds`` 동안 변하지 않아야 완료로 봅니다.
+"""
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from modules.data_loader import SUPPORTED_EXTENSIONS, DecodedImageCache, load_single_image
+from modules.metrics import NULL_METRICS, Metrics
+from modules.result_db import ResultDatabase
+from modules.postprocessor import Detections
+from modules.preprocessor import DEFAULT_IMGSZ
+from modules.server import (DEFAULT_MAX_BATCH, DEFAULT_MAX_WAIT_MS, LATENCY_WINDOW, MicroBatcher,
+                            detections_to_dict)
+from modules.visualizer import AsyncVisualizer
+
+logger = logging.getLogger(__name__)
+
+WATCH_MODES = ('auto', 'inotify', 'poll')
+
+# 감시 기본 설정 (config.yaml의 inference.watch 섹션으로 덮어씀)
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_SETTLE_SECONDS = 1.0
+DEFAULT_REPORT_EVERY = 100
+# 종료 시 처리 중인 결과를 기다리는 최대 시간 (초)
+DEFAULT_DRAIN_TIMEOUT = 30.0
+# inotify 모드에서 삭제된 파일 이름을 기억 목록에서 지우는 주기 (초)
+KNOWN_PRUNE_INTERVAL = 60.0
+
+# inotify 상수 (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _is_image(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS
+
+
+class _Inotify:
+    """ctypes로 감싼 최소한의 inotify 감시자 (단일 디렉터리)."""
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch 실패: {directory}")
+
+    def read(self, timeout: float) -> Tuple[List[str], bool]:
+        """``timeout`` 초까지 기다려 (완료된 파일 이름 목록, 큐 넘침 여부)를 반환합니다."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return [], False
+        names, overflow = [], False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                elif name:
+                    names.append(os.fsdecode(name))
+        return names, overflow
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """폴더에 새로 완성된 이미지 파일을 찾아 주는 감시자 (하위 폴더 제외).
+
+    Args:
+        directory: 감시할 디렉터리
+        mode: ``'auto'`` (inotify 우선, 실패 시 폴링), ``'inotify'``, ``'poll'``
+        poll_interval: 폴링 주기 / inotify 대기 시간 (초)
+        settle_seconds: 폴링 모드에서 크기/수정 시각이 이 시간 동안 변하지 않아야 완료로 판단
+        include_existing: 시작 시점에 이미 있던 파일도 내보낼지 여부
+
+    Raises:
+        ValueError: 지원하지 않는 모드일 때
+        OSError: ``mode='inotify'`` 인데 inotify를 초기화할 수 없을 때
+    """
+
+    def __init__(self, directory: str, mode: str = 'auto', poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 settle_seconds: float = DEFAULT_SETTLE_SECONDS, include_existing: bool = True):
+        if mode not in WATCH_MODES:
+            raise ValueError(f"지원하지 않는 감시 모드입니다: {mode} (가능: {WATCH_MODES})")
+        self.directory = str(directory)
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+
+        self._inotify: Optional[_Inotify] = None
+        if mode in ('auto', 'inotify') and sys.platform.startswith('linux'):
+            try:
+                self._inotify = _Inotify(self.directory)
+            except (OSError, AttributeError) as e:
+                if mode == 'inotify':
+                    raise
+                logger.warning(f"inotify를 사용할 수 없어 폴링으로 감시합니다: {e}")
+        elif mode == 'inotify':
+            raise OSError("inotify는 Linux에서만 사용할 수 있습니다.")
+        self.mode = 'inotify' if self._inotify else 'poll'
+
+        # 폴링 상태: 디렉터리 수정 시각, 완료 대기 중인 파일 {이름: (크기, 수정 시각, 변화 관측 시각)}
+        self._dir_mtime: Optional[int] = None
+        self._pending: Dict[str, Tuple[int, int, float]] = {}
+        # 이미 내보낸 파일 이름 (디렉터리에서 사라진 이름은 주기적으로 제거)
+        self._known: Set[str] = set()
+        self._pruned = time.monotonic()
+
+        # 감시 시작 이후의 파일을 놓치지 않도록 inotify 등록 뒤에 기존 목록을 읽음.
+        # 시작 시점에 아직 쓰이는 중일 수 있는 최근 파일은 완료 확인 대기열로 보냄
+        existing = self._list()
+        self._backlog: List[str] = []
+        now, wall = time.monotonic(), time.time()
+        for name in sorted(existing):
+            if not include_existing:
+                self._known.add(name)
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            if wall - st.st_mtime >= self.settle_seconds:
+                self._known.add(name)
+                self._backlog.append(name)
+            else:
+                self._pending[name] = (st.st_size, st.st_mtime_ns, now)
+        logger.info(f"폴더 감시 시작: {self.directory} (mode={self.mode}, 기존 파일 {len(existing)}개)")
+
+    def _list(self) -> Set[str]:
+        with os.scandir(self.directory) as entries:
+            return {entry.name for entry in entries if entry.is_file() and _is_image(entry.name)}
+
+    def poll(self, timeout: Optional[float] = None) -> List[str]:
+        """완성된 새 파일 경로를 반환합니다 (없으면 ``timeout`` 까지 기다린 뒤 빈 리스트)."""
+        timeout = self.poll_interval if timeout is None else timeout
+        if self._backlog:
+            names, self._backlog = self._backlog, []
+        elif self._inotify is not None:
+            names = self._poll_inotify(timeout)
+        else:
+            names = self._poll_stat(timeout)
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _poll_inotify(self, timeout: float) -> List[str]:
+        names, overflow = self._inotify.read(timeout)
+        if overflow:
+            # 이벤트 큐가 넘치면 한 번 전체 목록과 비교해 놓친 파일을 찾음
+            logger.warning("inotify 이벤트 큐가 넘쳐 디렉터리를 다시 읽습니다.")
+            names = names + sorted(self._list() - self._known)
+        fresh = []
+        for name in names:
+            if _is_image(name) and name not in self._known:
+                self._known.add(name)
+                self._pending.pop(name, None)
+                fresh.append(name)
+        # 시작 시점에 쓰이는 중이던 파일은 닫힘 이벤트를 놓쳤을 수 있으므로 안정화로 확인
+        now = time.monotonic()
+        if self._pending:
+            fresh.extend(self._settled(now))
+        if now - self._pruned >= KNOWN_PRUNE_INTERVAL:
+            self._pruned = now
+            self._known &= self._list()
+        return fresh
+
+    def _poll_stat(self, timeout: float) -> List[str]:
+        time.sleep(timeout)
+        now = time.monotonic()
+
+        dir_mtime = os.stat(self.directory).st_mtime_ns
+        if dir_mtime != self._dir_mtime:
+            self._dir_mtime = dir_mtime
+            listed = self._list()
+            self._known &= listed
+            for name in listed - self._known - self._pending.keys():
+                self._pending[name] = (-1, -1, now)
+        return self._settled(now)
+
+    def _settled(self, now: float) -> List[str]:
+        """크기와 수정 시각이 ``settle_seconds`` 동안 변하지 않은 대기 파일을 꺼냅니다."""
+        completed = []
+        for name, (size, mtime, changed) in list(self._pending.items()):
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                del self._pending[name]
+                continue
+            if (st.st_size, st.st_mtime_ns) != (size, mtime):
+                self._pending[name] = (st.st_size, st.st_mtime_ns, now)
+            elif st.st_size > 0 and now - changed >= self.settle_seconds:
+                del self._pending[name]
+                self._known.add(name)
+                completed.append(name)
+        return sorted(completed)
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+def _processed_paths(results_path: Path) -> Set[str]:
+    """기존 결과 파일에서 이미 처리한 경로를 읽습니다 (재시작 시 중복 처리 방지)."""
+    done: Set[str] = set()
+    if not results_path.exists():
+        return done
+    with open(results_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["path"])
+            except (ValueError, KeyError):
+                continue
+    return done
+
+
+def watch_and_infer(
+    model: Any,
+    directory: str,
+    results_path: str,
+    mode: str = 'auto',
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+    max_batch: int = DEFAULT_MAX_BATCH,
+    max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    num_workers: int = 4,
+    imgsz: int = DEFAULT_IMGSZ,
+    confidence: float = 0.5,
+    report_every: int = DEFAULT_REPORT_EVERY,
+    drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+    cache: Optional[DecodedImageCache] = None,
+    stop_event: Optional[threading.Event] = None,
+    stats: Optional[Dict[str, Any]] = None,
+    metrics: Optional[Metrics] = None,
+    visualizer: Optional[AsyncVisualizer] = None,
+    result_db: Optional[ResultDatabase] = None,
+    run_id: Optional[int] = None,
+    lot: Optional[str] = None,
+) -> None:
+    """폴더를 감시하며 새 이미지를 추론하고 결과를 JSONL로 덧붙입니다.
+
+    디코딩은 스레드 풀에서, 추론은 ``MicroBatcher`` 에서 동적 배치로 수행되며,
+    결과는 완료되는 대로 ``results_path`` 에 한 줄씩 기록됩니다. 각 줄에는 파일
+    쓰기 완료 시각(수정 시각)부터 결과 기록까지의 지연(``latency_ms``)이 포함되고,
+    ``report_every`` 장마다 지연 p50/p95/max를 로그로 보고합니다.
+
+    Args:
+        model: ``model_loader.load_model`` 로 로드한 모델 백엔드
+        directory: 감시할 디렉터리
+        results_path: 결과를 덧붙일 JSONL 파일 경로 (이미 기록된 경로는 건너뜀)
+        mode: 감시 방식 (``WATCH_MODES``)
+        poll_interval: 폴링 주기 (초)
+        settle_seconds: 폴링 모드의 쓰기 완료 판단 시간 (초)
+        max_batch: 마이크로배치 최대 크기
+        max_wait_ms: 마이크로배치 최대 대기 시간
+        num_workers: 디코딩 스레드 수
+        imgsz: 레터박스 입력 크기
+        confidence: 신뢰도 임계값
+        report_every: 지연 통계를 보고할 이미지 간격
+        drain_timeout: 종료 시 처리 중인 결과를 기다리는 최대 시간 (초)
+        cache: 디코딩된 이미지 캐시
+        stop_event: 설정되면 대기 중인 결과를 모두 기록한 뒤 종료
+        stats: 전달되면 처리 수와 최근 ``LATENCY_WINDOW`` 개의 지연을 채워 넣을 딕셔너리
+        metrics: 전달되면 도착→기록 지연, 처리/실패/건너뜀 수를 기록할 계측기
+        visualizer: 전달되면 결과 이미지를 백그라운드에서 렌더링/저장 (닫기는 호출자가 담당)
+        result_db: 전달되면 한 번에 받은 결과를 묶어 검사 결과 DB에 기록 (닫기는 호출자가 담당)
+        run_id: 결과 DB 실행 ID
+        lot: 결과 DB 로트 이름
+    """
+    metrics = metrics or NULL_METRICS
+    results_path = Path(results_path)
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    # 재시작 시 건너뛸 경로는 지금 폴더에 있는 파일로 한정 (이후 중복은 감시자가 걸러냄)
+    done = _processed_paths(results_path)
+    if done:
+        done &= {os.path.join(str(directory), name) for name in os.listdir(directory)}
+        logger.info(f"이미 처리된 이미지 {len(done)}개는 건너뜁니다: {results_path}")
+
+    stop_event = stop_event or threading.Event()
+    watcher = FolderWatcher(directory, mode, poll_interval, settle_seconds)
+    batcher = MicroBatcher(model, max_batch, max_wait_ms, imgsz, confidence, metrics)
+    names = dict(getattr(model, "names", None) or {})
+    completed: "queue.Queue[Tuple[str, float, Future, Optional[np.ndarray]]]" = queue.Queue()
+    in_flight = 0
+    latencies: "deque[float]" = deque(maxlen=max(report_every, LATENCY_WINDOW))
+    num_written = 0
+    num_failed = 0
+
+    def decode_and_submit(path: str) -> None:
+        try:
+            arrived = os.stat(path).st_mtime
+            image = load_single_image(path, cache=cache)
+        except Exception as e:
+            metrics.inc("images_failed_total", stage="decode")
+            future: Future = Future()
+            future.set_exception(e)
+            completed.put((path, time.time(), future, None))
+            return
+        future = batcher.submit(path, image)
+        # 디코딩한 이미지는 시각화/크롭에서 다시 읽지 않도록 결과와 함께 넘김
+        future.add_done_callback(lambda f: completed.put((path, arrived, f, image if visualizer else None)))
+
+    def report() -> None:
+        if latencies:
+            window = np.asarray(list(latencies)[-report_every:]) * 1000.0
+            logger.info(f"감시 추론: 기록 {num_written}개, 실패 {num_failed}개, 처리 중 {in_flight}개, "
+                        f"도착→기록 지연 p50 {np.percentile(window, 50):.0f} ms / "
+                        f"p95 {np.percentile(window, 95):.0f} ms / max {window.max():.0f} ms")
+
+    with open(results_path, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=max(1, num_workers), thread_name_prefix="decode") as executor:
+
+        def drain(timeout: Optional[float] = None) -> None:
+            """완료된 결과를 기록합니다 (``timeout`` 이 있으면 첫 결과를 그만큼 기다림)."""
+            nonlocal in_flight, num_written, num_failed
+            finished: List[Detections] = []
+            block = timeout is not None
+            while True:
+                try:
+                    path, arrived, future, image = completed.get(block=block, timeout=timeout)
+                except queue.Empty:
+                    break
+                block = False
+                in_flight -= 1
+                try:
+                    det = future.result()
+                    record = detections_to_dict(det, names)
+                except Exception as e:
+                    num_failed += 1
+                    logger.warning(f"추론 실패, 건너뜁니다: {path} ({e})")
+                    continue
+                written = time.time()
+                record["arrived"] = arrived
+                record["latency_ms"] = round((written - arrived) * 1000.0, 1)
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                latencies.append(written - arrived)
+                if visualizer is not None:
+                    visualizer.submit(det, image)
+                finished.append(det)
+                metrics.observe("arrival_to_result_seconds", written - arrived)
+                num_written += 1
+                if report_every and num_written % report_every == 0:
+                    report()
+            if result_db is not None and finished:
+                # 한 번에 완료된 결과를 한 트랜잭션으로 기록
+                result_db.insert(finished, run_id, lot)
+
+        try:
+            while not stop_event.is_set():
+                for path in watcher.poll():
+                    if path in done:
+                        done.discard(path)
+                        metrics.inc("images_skipped_total", reason="already_processed")
+                        continue
+                    in_flight += 1
+                    executor.submit(decode_and_submit, path)
+                drain()
+                metrics.set("in_flight", in_flight)
+                metrics.set("queue_depth", batcher.queue_depth)
+        finally:
+            watcher.close()
+            # 이미 받은 파일은 끝까지 처리하여 기록 (배치 스레드가 죽었으면 기다리지 않도록 기한을 둠)
+            deadline = time.monotonic() + drain_timeout
+            while in_flight > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"처리 중인 이미지 {in_flight}개의 결과를 {drain_timeout:.0f}초 안에 "
+                                   f"받지 못해 기록하지 않고 종료합니다.")
+                    break
+                drain(timeout=remaining)
+            batcher.close(timeout=0.0 if in_flight > 0 else None)
+            report()
+
+    if stats is not None:
+        latencies_ms = np.asarray(latencies) * 1000.0
+        stats.update({
+            "images": num_written,
+            "failed": num_failed,
+            "latency_ms": latencies_ms.tolist(),
+        })
+    logger.info(f"폴더 감시 종료: 기록 {num_written}개, 실패 {num_failed}개 -> {results_path}")
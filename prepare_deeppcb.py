@@ -1,9 +1,11 @@
 """DeepPCB 데이터셋 준비 스크립트"""
 import argparse
 import logging
+import os
 from pathlib import Path
 import sys
-from modules.deeppcb_loader import DeepPCBLoader
+from modules.dataset_stats import IMGSZ_CANDIDATES, SUMMARY_NAME
+from modules.deeppcb_loader import DeepPCBLoader, LINK_MODES
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,17 +26,51 @@ def main():
         default="./datasets/deeppcb",
         help="출력 경로 (기본값: ./datasets/deeppcb)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="변환 프로세스 수 (기본값: CPU 코어 수, 1이면 순차 처리)"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="매니페스트를 무시하고 모든 샘플을 다시 변환"
+    )
+    parser.add_argument(
+        "--link-mode",
+        choices=LINK_MODES,
+        default="copy",
+        help="이미지 배치 방식 (기본값: copy, 다른 파일 시스템이면 hardlink/reflink는 copy로 대체)"
+    )
+    parser.add_argument(
+        "--stats-only",
+        action="store_true",
+        help="변환하지 않고 출력 폴더의 통계 색인(stats.npz, stats.json)만 증분 갱신"
+    )
     
     args = parser.parse_args()
     
     try:
+        if args.stats_only:
+            stats = DeepPCBLoader.update_stats(args.output)
+            logger.info(f"통계 색인 갱신 완료: {stats.num_images}개 이미지, {len(stats)}개 박스")
+            counts = stats.class_counts()
+            logger.info("클래스별 박스 수: " + ", ".join(
+                f"{name}={count}" for name, count in zip(stats.names.tolist(), counts.tolist())))
+            logger.info("imgsz별 작은 박스 비율: " + ", ".join(
+                f"{imgsz}={stats.small_box_fraction(imgsz):.1%}" for imgsz in IMGSZ_CANDIDATES))
+            logger.info(f"요약 파일: {Path(args.output) / SUMMARY_NAME}")
+            return
+
         # DeepPCB 로더 초기화
         logger.info(f"DeepPCB 데이터셋 로드 중: {args.input}")
         loader = DeepPCBLoader(args.input)
         
         # 데이터셋 준비
         logger.info(f"YOLO 형식으로 변환 중: {args.output}")
-        loader.prepare_dataset(args.output)
+        loader.prepare_dataset(args.output, workers=args.workers, incremental=not args.rebuild,
+                               link_mode=args.link_mode)
         
         logger.info("데이터셋 준비 완료!")
         logger.info(f"YAML 파일: {Path(args.output) / 'deeppcb.yaml'}")
@@ -0,0 +1,97 @@
+"""INT8 양자화 스크립트.
+
+학습된 모델을 DeepPCB 검증 세트로 보정하여 INT8 ONNX 모델을 만들고,
+FP32 모델과 mAP50/지연 시간을 비교합니다.
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+import yaml
+
+from modules.model_loader import export_onnx
+from modules.quantizer import DEFAULT_MAX_MAP_DROP, DEFAULT_NUM_CALIBRATION, compare_models, quantize_model
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="학습된 모델을 INT8로 양자화하고 FP32와 비교")
+    parser.add_argument("--config", default="config.yaml", help="설정 파일 경로")
+    parser.add_argument("--model", help="양자화할 모델 경로 (.pt 또는 .onnx, 기본값: model.output)")
+    parser.add_argument("--data", help="보정/평가 이미지 디렉터리 (기본값: quantization.data)")
+    parser.add_argument("--output", help="INT8 모델 저장 경로 (기본값: <이름>_int8.onnx)")
+    parser.add_argument("--num-calibration", type=int, help="보정에 사용할 이미지 수 (0이면 전체)")
+    parser.add_argument("--per-channel", action="store_true", help="가중치를 채널별로 양자화")
+    parser.add_argument("--no-compare", action="store_true", help="FP32/INT8 비교를 건너뜀")
+    parser.add_argument("--report", help="비교 결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    config = {}
+    if Path(args.config).exists():
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+    model_config = config.get("model", {})
+    quant_config = config.get("quantization", {}) or {}
+
+    model_path = args.model or model_config.get("output", "./models/deeppcb_best.pt")
+    data_dir = args.data or quant_config.get("data", "./datasets/deeppcb/images/val")
+    imgsz = quant_config.get("imgsz", config.get("inference", {}).get("imgsz", 640))
+    num_calibration = (args.num_calibration if args.num_calibration is not None
+                       else quant_config.get("num_calibration", DEFAULT_NUM_CALIBRATION))
+
+    try:
+        int8_path = quantize_model(
+            model_path,
+            data_dir,
+            output_path=args.output,
+            imgsz=imgsz,
+            num_calibration=num_calibration,
+            per_channel=args.per_channel or quant_config.get("per_channel", False),
+            exclude_head=quant_config.get("exclude_head", True),
+        )
+        if args.no_compare:
+            return
+
+        # 같은 백엔드(ONNX Runtime)끼리 비교하도록 FP32도 ONNX 모델을 사용
+        fp32_path = export_onnx(model_path, imgsz=imgsz) if Path(model_path).suffix.lower() == ".pt" else model_path
+        report = compare_models(
+            str(fp32_path),
+            str(int8_path),
+            data_dir,
+            max_map_drop=quant_config.get("max_map_drop", DEFAULT_MAX_MAP_DROP),
+            imgsz=imgsz,
+            batch_size=quant_config.get("batch_size", 1),
+            intra_op_threads=model_config.get("intra_op_threads"),
+        )
+    except Exception as e:
+        logger.error(f"양자화 실패: {e}")
+        sys.exit(1)
+
+    fp32, int8 = report["fp32"], report["int8"]
+    print("\n=== FP32 vs INT8 ===")
+    print(f"{'':8}{'mAP50':>10}{'p50 (ms)':>12}{'p95 (ms)':>12}{'images/s':>12}")
+    for name, r in (("FP32", fp32), ("INT8", int8)):
+        print(f"{name:8}{r['map50']:>10.4f}{r['latency_ms_p50']:>12.1f}"
+              f"{r['latency_ms_p95']:>12.1f}{r['images_per_sec']:>12.2f}")
+    print(f"mAP50 하락: {report['map50_drop']:+.4f}, 속도 향상: {report['speedup']:.2f}x")
+    print(f"판정: {'채택' if report['accepted'] else '거부'} "
+          f"(허용 하락폭 {quant_config.get('max_map_drop', DEFAULT_MAX_MAP_DROP)})")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"비교 결과 저장: {args.report}")
+
+    if not report["accepted"]:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
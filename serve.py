@@ -0,0 +1,104 @@
+"""로컬 추론 서버 실행 스크립트.
+
+모델을 한 번만 로드해 두고 HTTP로 이미지를 받아 마이크로배치 추론합니다.
+
+사용 예::
+
+    python serve.py --port 8080
+    curl --data-binary @board.jpg -H "Content-Type: image/jpeg" http://127.0.0.1:8080/infer
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+import yaml
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteAOI 로컬 추론 서버")
+    parser.add_argument("--config", default="config.yaml", help="설정 파일 경로")
+    parser.add_argument("--model", help="모델 파일 경로 (기본값: model.output)")
+    parser.add_argument("--backend", help="추론 백엔드 (auto/torch/onnxruntime/openvino)")
+    parser.add_argument("--host", help="바인딩할 주소 (기본값: server.host)")
+    parser.add_argument("--port", type=int, help="포트 (기본값: server.port)")
+    parser.add_argument("--max-batch", type=int, help="마이크로배치 최대 크기")
+    parser.add_argument("--max-wait-ms", type=float, help="마이크로배치 최대 대기 시간 (ms)")
+    args = parser.parse_args()
+
+    config = {}
+    if Path(args.config).exists():
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+    model_config = config.get("model", {})
+    inference_config = config.get("inference", {})
+    server_config = config.get("server", {}) or {}
+    metrics_config = config.get("metrics", {}) or {}
+
+    model_path = args.model or model_config.get("output", "./models/deeppcb_best.pt")
+    if not Path(model_path).exists():
+        logger.error(f"모델 파일을 찾을 수 없습니다: {model_path}")
+        sys.exit(1)
+
+    from modules.data_loader import DecodedImageCache
+    from modules.metrics import Metrics
+    from modules.model_loader import load_model
+    from modules.server import (DEFAULT_HOST, DEFAULT_MAX_BATCH, DEFAULT_MAX_UPLOAD_MB,
+                                DEFAULT_MAX_WAIT_MS, DEFAULT_PORT, InferenceServer)
+
+    # 서버는 /metrics?format=prometheus 를 위해 계측을 항상 켜 둠
+    metrics = Metrics()
+    imgsz = inference_config.get("imgsz", 640)
+    with metrics.stage("load_model"):
+        model = load_model(
+            model_path,
+            device=model_config.get("device", "cuda"),
+            backend=args.backend or model_config.get("backend", "auto"),
+            imgsz=imgsz,
+            intra_op_threads=model_config.get("intra_op_threads"),
+        )
+
+    cache_config = inference_config.get("cache", {}) or {}
+    cache = None
+    if cache_config.get("enabled", False):
+        cache = DecodedImageCache(
+            memory_bytes=int(cache_config.get("memory_mb", 1024) * 1024 ** 2),
+            disk_dir=cache_config.get("disk_dir") or None,
+            disk_bytes=int(cache_config.get("disk_mb", 20480) * 1024 ** 2),
+        )
+
+    server = InferenceServer(
+        model,
+        host=args.host or server_config.get("host", DEFAULT_HOST),
+        port=args.port if args.port is not None else server_config.get("port", DEFAULT_PORT),
+        max_batch=args.max_batch or server_config.get("max_batch", DEFAULT_MAX_BATCH),
+        max_wait_ms=(args.max_wait_ms if args.max_wait_ms is not None
+                     else server_config.get("max_wait_ms", DEFAULT_MAX_WAIT_MS)),
+        imgsz=imgsz,
+        confidence=inference_config.get("confidence", 0.5),
+        max_upload_mb=server_config.get("max_upload_mb", DEFAULT_MAX_UPLOAD_MB),
+        cache=cache,
+        metrics=metrics,
+    )
+    if metrics_config.get("enabled", False):
+        metrics.start_flusher(
+            metrics_config.get("flush_interval", 15),
+            prometheus_path=metrics_config.get("prometheus") or "./results/metrics.prom",
+            json_path=metrics_config.get("json") or "./results/metrics.json",
+        )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("사용자에 의해 서버가 중단되었습니다.")
+    finally:
+        metrics.stop_flusher()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""pytest 공통 설정: 저장소 루트를 임포트 경로에 추가합니다."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,46 @@
+"""benchmarks/pipeline.py (파이프라인 단계 벤치마크) 테스트."""
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TINY = ["--images", "6", "--image-size", "128", "--imgsz", "64", "--repeat", "1", "--warmup", "0"]
+
+_spec = importlib.util.spec_from_file_location("pipeline", PROJECT_ROOT / "benchmarks" / "pipeline.py")
+pipeline = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pipeline)
+
+
+def run_pipeline(*args):
+    return subprocess.run([sys.executable, "benchmarks/pipeline.py", *TINY, *args], cwd=PROJECT_ROOT,
+                          capture_output=True, text=True)
+
+
+def test_report_and_baseline_round_trip(tmp_path):
+    report_path = tmp_path / "baseline.json"
+    completed = run_pipeline("--json", str(report_path))
+    assert completed.returncode == 0, completed.stderr
+    report = json.loads(report_path.read_text())
+    assert set(report["stages"]) == {"load_images", "preprocess", "summarize", "visualize", "prepare_dataset"}
+
+    # 표 머리글, 단계별 한 줄, 최대 RSS 외에는 출력하지 않음
+    lines = completed.stdout.strip().splitlines()
+    assert len(lines) == len(report["stages"]) + 2
+    assert all(line.split()[0] in report["stages"] for line in lines[1:-1])
+
+    completed = run_pipeline("--baseline", str(report_path), "--tolerance", "100")
+    assert completed.returncode == 0, completed.stderr
+    assert "통과" in completed.stdout
+
+
+def test_compare_baseline_flags_regressions_beyond_noise():
+    baseline = {"stages": {"preprocess": {"p50_ms": 100.0, "peak_rss_mb": 200.0},
+                           "summarize": {"p50_ms": 0.1, "peak_rss_mb": 200.0}}}
+    report = {"stages": {"preprocess": {"p50_ms": 130.0, "peak_rss_mb": 210.0},
+                         "summarize": {"p50_ms": 0.5, "peak_rss_mb": 200.0},
+                         "new_stage": {"p50_ms": 1.0, "peak_rss_mb": 1.0}}}
+    regressions = pipeline.compare_baseline(report, baseline, tolerance=0.2)
+    # 0.4 ms 차이는 잡음, 기준선에 없는 단계는 비교하지 않음
+    assert [line.split(":")[0] for line in regressions] == ["preprocess.p50_ms"]
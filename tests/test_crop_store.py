@@ -0,0 +1,116 @@
+"""modules.crop_store (내용 주소 크롭 저장소) 테스트."""
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+import modules.crop_store as crop_store
+from modules.crop_store import CropStore
+
+
+def make_board(seed=0):
+    return np.random.default_rng(seed).integers(0, 255, (64, 64, 3), dtype=np.uint8)
+
+
+BOXES = np.array([[10, 10, 20, 20], [40, 40, 50, 50]], dtype=np.float32)
+CONF = np.array([0.9, 0.8], dtype=np.float32)
+CLS = np.array([0, 1])
+
+
+def test_identical_crops_are_stored_once(tmp_path):
+    store = CropStore(str(tmp_path), padding=2)
+    board = make_board()
+    first = store.add("a.jpg", board, BOXES, CONF, CLS)
+    second = store.add("b.jpg", board.copy(), BOXES, CONF, CLS)
+    store.close()
+
+    assert first == second
+    assert store.stats()["stored"] == 2
+    assert store.stats()["deduplicated"] == 2
+    assert all(store.object_path(digest).exists() for digest in first)
+    assert store.lookup("b.jpg", 1) == store.object_path(first[1])
+    assert [record["det"] for record in store.crops_for("a.jpg")] == [0, 1]
+
+
+def test_failed_write_is_not_counted_as_stored(tmp_path, monkeypatch):
+    store = CropStore(str(tmp_path), padding=2)
+    board = make_board()
+    real_imencode = cv2.imencode
+    monkeypatch.setattr(cv2, "imencode", lambda *args: (False, None))
+    with pytest.raises(ValueError):
+        store.add("a.jpg", board, BOXES, CONF, CLS)
+    monkeypatch.setattr(cv2, "imencode", real_imencode)
+
+    digests = store.add("a.jpg", board, BOXES, CONF, CLS)
+    store.close()
+    assert store.stats() == {"stored": 2, "deduplicated": 0, "bytes": store.stats()["bytes"]}
+    assert all(store.object_path(digest).exists() for digest in digests)
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_reopen_uses_index_without_rewriting(tmp_path):
+    store = CropStore(str(tmp_path), padding=2)
+    digests = store.add("a.jpg", make_board(), BOXES, CONF, CLS)
+    store.close()
+
+    reopened = CropStore(str(tmp_path), padding=2)
+    assert reopened.lookup("a.jpg", 0) == reopened.object_path(digests[0])
+    reopened.add("c.jpg", make_board(), BOXES, CONF, CLS)
+    reopened.close()
+    assert reopened.stats()["stored"] == 0
+    assert reopened.stats()["deduplicated"] == 2
+
+
+def test_superseded_index_lines_are_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(crop_store, "COMPACT_MIN_STALE", 3)
+    store = CropStore(str(tmp_path), padding=2)
+    board = make_board()
+    for _ in range(5):
+        store.add("a.jpg", board, BOXES, CONF, CLS)
+    store.close()
+
+    lines = (tmp_path / "index.jsonl").read_text().splitlines()
+    assert len(lines) == 1
+    assert [crop["det"] for crop in json.loads(lines[0])["crops"]] == [0, 1]
+    assert CropStore(str(tmp_path)).lookup("a.jpg", 1) is not None
+
+
+def test_reinspected_board_replaces_previous_crops(tmp_path):
+    store = CropStore(str(tmp_path), padding=2)
+    board = make_board()
+    first = store.add("a.jpg", board, BOXES, CONF, CLS)
+    store.add("b.jpg", board, BOXES, CONF, CLS)
+
+    second = store.add("a.jpg", board, BOXES[1:], CONF[1:], CLS[1:])
+    assert [record["hash"] for record in store.crops_for("a.jpg")] == second == [first[1]]
+    assert store.lookup("a.jpg", 0) == store.object_path(first[1])
+    assert store.lookup("a.jpg", 1) is None
+
+    # 검출이 없어진 보드는 이미지 없이도 지워짐, 처음 보는 깨끗한 보드는 기록하지 않음
+    assert store.add("b.jpg", None, BOXES[:0], CONF[:0], CLS[:0]) == []
+    store.add("clean.jpg", None, BOXES[:0], CONF[:0], CLS[:0])
+    store.close()
+    assert store.crops_for("b.jpg") == []
+    lines = [json.loads(line) for line in (tmp_path / "index.jsonl").read_text().splitlines()]
+    assert [line["board"] for line in lines] == ["a.jpg", "b.jpg", "a.jpg", "b.jpg"]
+
+    reopened = CropStore(str(tmp_path), padding=2)
+    assert [record["det"] for record in reopened.crops_for("a.jpg")] == [0]
+    assert reopened.lookup("a.jpg", 1) is None
+    assert reopened.crops_for("b.jpg") == []
+    reopened.close()
+
+
+def test_visualizer_clears_crops_of_boards_without_detections(tmp_path):
+    from modules.postprocessor import Detections
+    from modules.visualizer import AsyncVisualizer
+
+    board = make_board()
+    with AsyncVisualizer(str(tmp_path), mode="crops", crop_padding=2) as visualizer:
+        visualizer.submit(Detections(path="a.jpg", xyxy=BOXES, conf=CONF, cls=CLS, orig_shape=(64, 64)), board)
+    with AsyncVisualizer(str(tmp_path), mode="crops", crop_padding=2) as visualizer:
+        assert len(visualizer.crop_store.crops_for("a.jpg")) == 2
+        visualizer.submit(Detections(path="a.jpg", xyxy=BOXES[:0], conf=CONF[:0], cls=CLS[:0],
+                                     orig_shape=(64, 64)))
+        assert visualizer.crop_store.lookup("a.jpg", 0) is None
@@ -0,0 +1,161 @@
+"""modules.data_loader 테스트."""
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from modules.data_loader import (DecodedImageCache, check_image_header, read_image_header,
+                                  read_label_arrays, validate_image_batch)
+
+
+def test_disk_tier_returns_read_only_memmap(tmp_path):
+    image_path = tmp_path / 'board.png'
+    pixels = np.random.default_rng(0).integers(0, 255, (32, 48, 3), dtype=np.uint8)
+    cv2.imwrite(str(image_path), pixels)
+
+    first = DecodedImageCache(memory_bytes=0, disk_dir=str(tmp_path / 'cache'))
+    np.testing.assert_array_equal(first.load(str(image_path)), pixels)
+    assert first.stats()['misses'] == 1
+
+    second = DecodedImageCache(memory_bytes=1 << 20, disk_dir=str(tmp_path / 'cache'))
+    image = second.load(str(image_path))
+    assert isinstance(image, np.memmap)
+    assert not image.flags.writeable
+    np.testing.assert_array_equal(image, pixels)
+    stats = second.stats()
+    assert stats['disk_hits'] == 1
+    assert stats['memory_items'] == 0
+
+
+def test_memory_tier_invalidated_when_file_changes(tmp_path):
+    image_path = tmp_path / 'board.png'
+    cv2.imwrite(str(image_path), np.zeros((8, 8, 3), np.uint8))
+    cache = DecodedImageCache()
+    assert cache.load(str(image_path)).max() == 0
+    assert cache.load(str(image_path)) is cache.load(str(image_path))
+
+    cv2.imwrite(str(image_path), np.full((8, 8, 3), 255, np.uint8))
+    assert cache.load(str(image_path)).min() == 255
+
+
+def test_read_label_arrays_concatenates_files(tmp_path):
+    (tmp_path / 'a.txt').write_text("0 0.5 0.5 0.1 0.1\n1 0.2 0.3 0.4 0.5\n")
+    (tmp_path / 'b.txt').write_text("")
+    (tmp_path / 'c.txt').write_text("\n2 0.1 0.1 0.2 0.2\n\n")
+    values, counts, malformed = read_label_arrays([tmp_path / 'a.txt', tmp_path / 'b.txt', tmp_path / 'c.txt'])
+    np.testing.assert_allclose(values, [[0, 0.5, 0.5, 0.1, 0.1], [1, 0.2, 0.3, 0.4, 0.5], [2, 0.1, 0.1, 0.2, 0.2]])
+    np.testing.assert_array_equal(counts, [2, 0, 1])
+    np.testing.assert_array_equal(malformed, [0, 0, 0])
+
+
+def test_read_label_arrays_skips_malformed_lines(tmp_path):
+    (tmp_path / 'a.txt').write_text("1 2 3 4 5\n1 2 3\nx 2 3 4 5\n6 7 8 9 10 extra\n")
+    (tmp_path / 'b.txt').write_text("11 12 13 14 15\n")
+    values, counts, malformed = read_label_arrays(
+        [tmp_path / 'a.txt', tmp_path / 'missing.txt', tmp_path / 'b.txt'], dtype=np.int64)
+    np.testing.assert_array_equal(values, [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [11, 12, 13, 14, 15]])
+    assert values.dtype == np.int64
+    np.testing.assert_array_equal(counts, [2, 0, 1])
+    np.testing.assert_array_equal(malformed, [2, 0, 0])
+
+
+def test_read_label_arrays_empty():
+    values, counts, malformed = read_label_arrays([])
+    assert values.shape == (0, 5) and counts.shape == (0,) and malformed.shape == (0,)
+
+
+@pytest.mark.parametrize("suffix, params", [
+    (".jpg", []),
+    (".jpg", [cv2.IMWRITE_JPEG_PROGRESSIVE, 1]),
+    (".png", []),
+    (".bmp", []),
+    (".webp", [cv2.IMWRITE_WEBP_QUALITY, 80]),
+    (".webp", [cv2.IMWRITE_WEBP_QUALITY, 101]),
+    (".tif", []),
+])
+def test_header_readers_match_decoded_size(tmp_path, suffix, params):
+    image_path = tmp_path / f"board{suffix}"
+    pixels = np.random.default_rng(1).integers(0, 255, (37, 53, 3), dtype=np.uint8)
+    assert cv2.imwrite(str(image_path), pixels, params)
+    width, height, channels = read_image_header(str(image_path))
+    assert (height, width) == cv2.imread(str(image_path)).shape[:2] == (37, 53)
+    assert channels in (3, 4)
+    assert check_image_header(str(image_path), check_truncation=True) is None
+
+
+def test_header_reader_grayscale_png(tmp_path):
+    image_path = tmp_path / "gray.png"
+    cv2.imwrite(str(image_path), np.zeros((10, 20), np.uint8))
+    assert read_image_header(str(image_path)) == (20, 10, 1)
+
+
+def test_check_image_header_reports_broken_files(tmp_path):
+    jpeg = tmp_path / "board.jpg"
+    cv2.imwrite(str(jpeg), np.random.default_rng(2).integers(0, 255, (64, 64, 3), dtype=np.uint8))
+    truncated = tmp_path / "truncated.jpg"
+    truncated.write_bytes(jpeg.read_bytes()[:-200])
+    garbage = tmp_path / "garbage.jpg"
+    garbage.write_bytes(b"not an image at all")
+    no_sof = tmp_path / "no_sof.jpg"
+    no_sof.write_bytes(b"\xff\xd8\xff\xd9")
+
+    assert check_image_header(str(truncated)) is None
+    assert check_image_header(str(truncated), check_truncation=True) == "파일이 잘려 있습니다"
+    assert check_image_header(str(garbage)) is not None
+    assert "EOI" in check_image_header(str(no_sof))
+    assert check_image_header(str(tmp_path / "missing.jpg")) is not None
+    with pytest.raises(ValueError):
+        read_image_header(str(garbage))
+
+
+def test_validate_image_batch_reuses_cached_verdicts(tmp_path, monkeypatch):
+    import modules.data_loader as data_loader
+
+    good = tmp_path / "good.png"
+    cv2.imwrite(str(good), np.zeros((8, 8, 3), np.uint8))
+    bad = tmp_path / "bad.png"
+    bad.write_bytes(b"broken")
+    cache_path = str(tmp_path / "verdicts.json")
+    paths = [str(good), str(bad)]
+
+    assert validate_image_batch(paths, cache_path=cache_path) == ([str(good)], [str(bad)])
+    checked = []
+    original = data_loader._validate_one
+
+    def recording(path, *args):
+        checked.append(path)
+        return original(path, *args)
+
+    monkeypatch.setattr(data_loader, "_validate_one", recording)
+    assert validate_image_batch(paths, cache_path=cache_path) == ([str(good)], [str(bad)])
+    assert checked == []
+
+    # 파일이 바뀌면 다시 검사하고, 다른 모드의 판정은 재사용하지 않음
+    cv2.imwrite(str(bad), np.zeros((8, 8, 3), np.uint8))
+    assert validate_image_batch(paths, cache_path=cache_path) == (paths, [])
+    assert checked == [str(bad)]
+    validate_image_batch(paths, check_truncation=True, cache_path=cache_path)
+    assert sorted(checked[1:]) == sorted(paths)
+
+
+def test_image_discovery_single_pass(tmp_path):
+    from modules.data_loader import iter_images, load_images
+
+    (tmp_path / 'sub' / 'deeper').mkdir(parents=True)
+    for name in ('b.JPG', 'a.png', 'notes.txt', 'sub/c.jpeg', 'sub/deeper/d.TIF'):
+        (tmp_path / name).write_bytes(b'')
+    (tmp_path / 'dir.jpg').mkdir()
+    os.symlink(tmp_path / 'sub', tmp_path / 'link')
+
+    top = sorted(os.path.relpath(p, tmp_path) for p in iter_images(str(tmp_path)))
+    assert top == ['a.png', 'b.JPG']
+    nested = sorted(os.path.relpath(p, tmp_path) for p in iter_images(str(tmp_path), recursive=True))
+    assert nested == ['a.png', 'b.JPG', os.path.join('sub', 'c.jpeg'), os.path.join('sub', 'deeper', 'd.TIF')]
+
+    assert load_images(str(tmp_path), recursive=True) == sorted(str(tmp_path / p) for p in nested)
+    assert sorted(load_images(str(tmp_path), stream=True)) == [str(tmp_path / p) for p in top]
+    with pytest.raises(ValueError):
+        load_images(str(tmp_path / 'dir.jpg'), stream=True)
+    with pytest.raises(FileNotFoundError):
+        load_images(str(tmp_path / 'missing'))
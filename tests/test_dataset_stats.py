@@ -0,0 +1,87 @@
+"""modules.dataset_stats 테스트."""
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from modules import dataset_stats
+from modules.dataset_stats import DatasetStats, update_dataset_stats
+
+# float64로 바뀌면 정밀도를 잃는 수정 시각 (ns)
+MTIME_NS = 1760000000123456789
+
+
+def _add_sample(root, split, stem, lines, mtime_ns=MTIME_NS):
+    (root / 'images' / split).mkdir(parents=True, exist_ok=True)
+    (root / 'labels' / split).mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(root / 'images' / split / f'{stem}.png'), np.zeros((40, 60, 3), np.uint8))
+    label = root / 'labels' / split / f'{stem}.txt'
+    label.write_text(''.join(f'{line}\n' for line in lines))
+    os.utime(label, ns=(mtime_ns, mtime_ns))
+    return f'labels/{split}/{stem}.txt'
+
+
+@pytest.fixture
+def reread(monkeypatch):
+    """``update_dataset_stats`` 가 라벨 파일을 다시 읽은 경로 목록."""
+    paths = []
+    original = dataset_stats.read_label_arrays
+
+    def recording(files, *args, **kwargs):
+        paths.extend(os.path.relpath(path, files[0].parents[2]) for path in files)
+        return original(files, *args, **kwargs)
+
+    monkeypatch.setattr(dataset_stats, 'read_label_arrays', recording)
+    return paths
+
+
+def test_unchanged_tree_reuses_every_image(tmp_path, reread):
+    _add_sample(tmp_path, 'train', 'a', ['0 0.5 0.5 0.1 0.2', '3 0.2 0.2 0.1 0.1'])
+    _add_sample(tmp_path, 'val', 'b', ['5 0.4 0.6 0.2 0.2'])
+    first = update_dataset_stats(tmp_path, names=['open', 'short', 'mousebite', 'spur', 'copper', 'pin-hole'])
+    assert len(reread) == 2
+    assert first.sources.dtype == np.int64
+    assert first.sources[:, 1].tolist() == [MTIME_NS, MTIME_NS]
+
+    for _ in range(2):
+        reread.clear()
+        again = update_dataset_stats(tmp_path)
+        assert reread == []
+        np.testing.assert_array_equal(again.sources, first.sources)
+        np.testing.assert_array_equal(again.labels, first.labels)
+        np.testing.assert_array_equal(again.xywh, first.xywh)
+        np.testing.assert_array_equal(again.cls, first.cls)
+        np.testing.assert_array_equal(again.names, first.names)
+
+    loaded = DatasetStats.from_npz(tmp_path / dataset_stats.STATS_NAME)
+    np.testing.assert_array_equal(loaded.sources, first.sources)
+
+
+def test_added_group_reads_only_new_labels(tmp_path, reread):
+    _add_sample(tmp_path, 'train', 'a', ['0 0.5 0.5 0.1 0.2'])
+    update_dataset_stats(tmp_path, groups={'labels/train/a.txt': 'group00041'})
+
+    reread.clear()
+    added = _add_sample(tmp_path, 'train', 'c', ['1 0.5 0.5 0.2 0.2', '2 0.1 0.1 0.1 0.1'])
+    stats = update_dataset_stats(tmp_path, groups={added: 'group00044'})
+    assert reread == [os.path.join('labels', 'train', 'c.txt')]
+    assert stats.labels.tolist() == ['labels/train/a.txt', 'labels/train/c.txt']
+    assert stats.groups.tolist() == ['group00041', 'group00044']
+    assert stats.counts_per_image().tolist() == [1, 2]
+    assert stats.shapes.tolist() == [[40, 60], [40, 60]]
+    assert stats.cls.tolist() == [0, 1, 2]
+
+
+def test_changed_and_removed_labels(tmp_path, reread):
+    _add_sample(tmp_path, 'train', 'a', ['0 0.5 0.5 0.1 0.2'])
+    _add_sample(tmp_path, 'val', 'b', ['1 0.5 0.5 0.1 0.2'])
+    update_dataset_stats(tmp_path)
+
+    reread.clear()
+    _add_sample(tmp_path, 'train', 'a', ['4 0.5 0.5 0.1 0.2', '4 0.3 0.3 0.1 0.2'], mtime_ns=MTIME_NS + 1)
+    (tmp_path / 'labels' / 'val' / 'b.txt').unlink()
+    stats = update_dataset_stats(tmp_path)
+    assert reread == [os.path.join('labels', 'train', 'a.txt')]
+    assert stats.labels.tolist() == ['labels/train/a.txt']
+    assert stats.cls.tolist() == [4, 4]
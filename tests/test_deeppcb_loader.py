@@ -0,0 +1,183 @@
+"""modules.deeppcb_loader (DeepPCB -> YOLO 변환) 테스트."""
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from modules.deeppcb_loader import MANIFEST_NAME, DeepPCBLoader
+
+
+def make_deeppcb(root, groups=2, boards=2):
+    """그룹마다 ``boards`` 장의 테스트 이미지와 라벨이 있는 DeepPCB 폴더를 만듭니다."""
+    for g in range(groups):
+        group = root / 'PCBData' / f'group{g:05d}'
+        (group / f'{g:05d}').mkdir(parents=True, exist_ok=True)
+        (group / f'{g:05d}_not').mkdir(exist_ok=True)
+        for b in range(boards):
+            stem = f'{g:05d}{b:03d}'
+            cv2.imwrite(str(group / f'{g:05d}' / f'{stem}.jpg'), np.full((64, 80, 3), b * 40, np.uint8))
+            (group / f'{g:05d}_not' / f'{stem}.txt').write_text(f'{b} 4 {b + 20} 30 {b % 6 + 1}\n')
+    return root
+
+
+@pytest.fixture
+def converted(monkeypatch):
+    """``_convert_samples`` 가 변환한 원본 이미지 이름 목록."""
+    names = []
+    original = DeepPCBLoader._convert_samples
+
+    def recording(self, samples, *args, **kwargs):
+        names.extend(image.name for image, _, _ in samples)
+        return original(self, samples, *args, **kwargs)
+
+    monkeypatch.setattr(DeepPCBLoader, '_convert_samples', recording)
+    return names
+
+
+def test_rerun_skips_unchanged_samples(tmp_path, converted):
+    source = make_deeppcb(tmp_path / 'DeepPCB')
+    output = tmp_path / 'out'
+    loader = DeepPCBLoader(str(source))
+    loader.prepare_dataset(str(output))
+    assert len(converted) == 4
+    manifest = json.loads((output / MANIFEST_NAME).read_text())
+    assert len(manifest['samples']) == 4
+
+    converted.clear()
+    loader.prepare_dataset(str(output))
+    assert converted == []
+
+    # 수정 시각만 바뀌고 내용이 같으면 해시로 확인하여 건너뜀
+    label = source / 'PCBData' / 'group00000' / '00000_not' / '00000000.txt'
+    os.utime(label, ns=(label.stat().st_atime_ns, label.stat().st_mtime_ns + 10 ** 9))
+    loader.prepare_dataset(str(output))
+    assert converted == []
+
+    converted.clear()
+    loader.prepare_dataset(str(output), incremental=False)
+    assert len(converted) == 4
+
+
+def test_changed_removed_and_missing_outputs(tmp_path, converted):
+    source = make_deeppcb(tmp_path / 'DeepPCB')
+    output = tmp_path / 'out'
+    loader = DeepPCBLoader(str(source))
+    loader.prepare_dataset(str(output))
+    converted.clear()
+
+    group0 = source / 'PCBData' / 'group00000'
+    (group0 / '00000_not' / '00000001.txt').write_text('1 2 30 40 2\n3 3 9 9 6\n')
+    (group0 / '00000' / '00000000.jpg').unlink()
+    (output / 'labels' / 'train' / '00001001.txt').unlink()
+    loader.prepare_dataset(str(output))
+
+    assert sorted(converted) == ['00000001.jpg', '00001001.jpg']
+    assert not (output / 'images' / 'train' / '00000000.jpg').exists()
+    assert not (output / 'labels' / 'train' / '00000000.txt').exists()
+    assert len((output / 'labels' / 'train' / '00000001.txt').read_text().splitlines()) == 2
+    assert (output / 'labels' / 'train' / '00001001.txt').exists()
+    manifest = json.loads((output / MANIFEST_NAME).read_text())
+    assert sorted(manifest['samples']) == ['group00000/00000/00000001.jpg', 'group00001/00001/00001000.jpg',
+                                           'group00001/00001/00001001.jpg']
+
+
+def test_array_labels_match_legacy_per_box_path(tmp_path):
+    from modules.deeppcb_loader import deeppcb_to_yolo, format_yolo_labels, parse_deeppcb_labels
+
+    loader = DeepPCBLoader(str(make_deeppcb(tmp_path / 'DeepPCB', groups=1, boards=1)))
+    rng = np.random.default_rng(0)
+    label_paths, sizes = [], []
+    for i in range(40):
+        count = int(rng.integers(0, 8))
+        x1y1 = rng.integers(0, 600, (count, 2))
+        x2y2 = x1y1 + rng.integers(1, 40, (count, 2))
+        cls = rng.integers(1, 7, count)
+        lines = [f'{a} {b} {c} {d} {k}' for (a, b), (c, d), k in zip(x1y1, x2y2, cls)]
+        if i % 5 == 0 and lines:
+            lines[-1] += ' 0.97'  # 여분의 열
+            lines.insert(1, '')  # 빈 줄
+        path = tmp_path / f'{i}.txt'
+        path.write_text('\n'.join(lines) + ('\n' if i % 2 else ''))
+        label_paths.append(path)
+        sizes.append((640 + i, 480 + 2 * i))
+
+    boxes, counts, malformed = parse_deeppcb_labels(label_paths)
+    assert not malformed.any()
+    widths = np.repeat([w for w, _ in sizes], counts)
+    heights = np.repeat([h for _, h in sizes], counts)
+    contents = format_yolo_labels(deeppcb_to_yolo(boxes, widths, heights), counts)
+
+    for path, (width, height), content in zip(label_paths, sizes, contents):
+        annotations = loader.load_deeppcb_annotation(str(path))
+        legacy = '\n'.join(loader.convert_to_yolo_format(annotations, width, height))
+        assert content.encode() == legacy.encode()
+
+
+def test_malformed_label_lines_are_counted(tmp_path):
+    from modules.deeppcb_loader import parse_deeppcb_labels
+
+    path = tmp_path / 'bad.txt'
+    path.write_text('1 2 3 4 1\n1 2 3\n1 2 x 4 2\n5 6 7 8 6\n')
+    boxes, counts, malformed = parse_deeppcb_labels([path, tmp_path / 'missing.txt'])
+    assert boxes.tolist() == [[1, 2, 3, 4, 0], [5, 6, 7, 8, 5]]
+    assert counts.tolist() == [2, 0]
+    assert malformed.tolist() == [2, 0]
+
+
+def test_parallel_conversion_matches_sequential(tmp_path):
+    source = make_deeppcb(tmp_path / 'DeepPCB', groups=4, boards=3)
+    loader = DeepPCBLoader(str(source))
+    loader.prepare_dataset(str(tmp_path / 'seq'), workers=1)
+    loader.prepare_dataset(str(tmp_path / 'par'), workers=3)
+
+    outputs = sorted(p.relative_to(tmp_path / 'seq') for p in (tmp_path / 'seq' / 'labels').rglob('*.txt'))
+    assert len(outputs) == 12
+    assert outputs == sorted(p.relative_to(tmp_path / 'par') for p in (tmp_path / 'par' / 'labels').rglob('*.txt'))
+    for rel in outputs:
+        assert (tmp_path / 'seq' / rel).read_bytes() == (tmp_path / 'par' / rel).read_bytes()
+    sequential = json.loads((tmp_path / 'seq' / MANIFEST_NAME).read_text())['samples']
+    parallel = json.loads((tmp_path / 'par' / MANIFEST_NAME).read_text())['samples']
+    assert sequential == parallel
+
+
+@pytest.mark.parametrize('link_mode', ['copy', 'hardlink', 'symlink', 'reflink'])
+def test_materialize_modes(tmp_path, link_mode):
+    from modules.deeppcb_loader import materialize
+
+    src = tmp_path / 'src.jpg'
+    src.write_bytes(b'pixels' * 100)
+    dst = tmp_path / 'dst.jpg'
+    dst.write_bytes(b'stale output')
+    used, written = materialize(src, dst, link_mode)
+
+    assert dst.read_bytes() == src.read_bytes()
+    if link_mode == 'reflink':
+        # reflink를 지원하지 않는 파일 시스템이면 복사로 대체
+        assert used in ('reflink', 'copy')
+    else:
+        assert used == link_mode
+    assert written == (src.stat().st_size if used == 'copy' else 0)
+    assert (dst.stat().st_ino == src.stat().st_ino) == (link_mode in ('hardlink', 'symlink'))
+    assert dst.is_symlink() == (link_mode == 'symlink')
+
+    # 다시 배치해도 이전 링크를 통해 원본을 덮어쓰지 않음
+    materialize(src, dst, 'copy')
+    assert src.read_bytes() == b'pixels' * 100
+
+
+def test_materialize_falls_back_to_copy_across_filesystems(tmp_path, monkeypatch):
+    import errno
+
+    from modules.deeppcb_loader import materialize
+
+    def cross_device(*args):
+        raise OSError(errno.EXDEV, 'Invalid cross-device link')
+
+    monkeypatch.setattr(os, 'link', cross_device)
+    src = tmp_path / 'src.jpg'
+    src.write_bytes(b'x' * 10)
+    assert materialize(src, tmp_path / 'dst.jpg', 'hardlink') == ('copy', 10)
+    with pytest.raises(ValueError):
+        materialize(src, tmp_path / 'dst.jpg', 'move')
@@ -0,0 +1,78 @@
+"""modules.inference (배치/프리페치 추론) 테스트."""
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from modules.inference import run_inference
+from modules.postprocessor import Detections
+
+
+class StubModel:
+    """이미지 밝기를 신뢰도로 돌려주고 박스 하나를 내는 모델."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, images, conf=0.5, verbose=False):
+        self.batch_sizes.append(len(images))
+        outputs = []
+        for image in images:
+            if image.dtype == np.float32:
+                # 레터박스 입력 (3, imgsz, imgsz), 0-1 RGB
+                level = float(image[0, image.shape[1] // 2, image.shape[2] // 2]) * 255
+            else:
+                level = float(image[image.shape[0] // 2, image.shape[1] // 2, 0])
+            outputs.append(Detections(path="", xyxy=np.array([[16, 24, 48, 40]], np.float32),
+                                      conf=np.array([level / 255], np.float32),
+                                      cls=np.zeros(1, np.int64), orig_shape=(0, 0)))
+        return outputs
+
+
+@pytest.fixture
+def boards(tmp_path):
+    paths = []
+    for i in range(7):
+        path = tmp_path / f"{i}.png"
+        cv2.imwrite(str(path), np.full((32, 64, 3), 20 * (i + 1), np.uint8))
+        paths.append(str(path))
+    # 디코딩 실패 슬롯: 없는 파일과 깨진 파일
+    paths.insert(1, str(tmp_path / "missing.png"))
+    (tmp_path / "broken.png").write_bytes(b"not an image")
+    paths.insert(5, str(tmp_path / "broken.png"))
+    return paths
+
+
+def expected_levels(paths):
+    return [int(Path(p).stem) for p in paths]
+
+
+@pytest.mark.parametrize("imgsz", [None, 64])
+def test_results_keep_input_order_and_drop_failed_slots(boards, imgsz):
+    model = StubModel()
+    stats = {}
+    results = list(run_inference(model, iter(boards), batch_size=3, prefetch=2, num_workers=4,
+                                 imgsz=imgsz, stats=stats))
+    decoded = [p for p in boards if "missing" not in p and "broken" not in p]
+    assert [det.path for det in results] == decoded
+    assert [round(float(det.conf[0]) * 255) for det in results] == [20 * (i + 1) for i in expected_levels(decoded)]
+    assert all(det.orig_shape == (32, 64) for det in results)
+    assert stats["images"] == 7 and stats["failed"] == 2
+    # 실패한 슬롯은 모델에 넘기지 않음 (3개씩 묶인 배치에서 빠짐)
+    assert model.batch_sizes == [2, 2, 3]
+
+
+def test_letterboxed_boxes_are_mapped_to_original_coordinates(boards):
+    results = list(run_inference(StubModel(), boards[:1], imgsz=64))
+    # 64x32 이미지는 배율 1, 세로 패딩 16 -> (16, 24, 48, 40) 는 원본 (16, 8, 48, 24)
+    np.testing.assert_allclose(results[0].xyxy, [[16, 8, 48, 24]])
+
+
+def test_with_images_yields_decoded_pairs(boards):
+    pairs = list(run_inference(StubModel(), boards, batch_size=4, imgsz=64, with_images=True))
+    assert len(pairs) == 7
+    for det, image in pairs:
+        assert image.shape == (32, 64, 3)
+        assert round(float(det.conf[0]) * 255) == int(image[0, 0, 0])
+
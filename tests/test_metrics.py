@@ -0,0 +1,25 @@
+"""modules.metrics 테스트."""
+import time
+
+from modules.metrics import Metrics, TimedIterator
+
+
+def slow_items(count, delay):
+    for i in range(count):
+        time.sleep(delay)
+        yield i
+
+
+def test_stage_excludes_time_spent_in_upstream_iterator():
+    metrics = Metrics()
+    produced = TimedIterator(slow_items(3, 0.05))
+    with metrics.stage("summarize", exclude=produced):
+        for _ in produced:
+            time.sleep(0.01)
+    metrics.observe("stage_seconds", produced.seconds, stage="inference")
+
+    stages = {key: value for key, value in metrics.to_dict()["histograms"].items() if "stage_seconds" in key}
+    inference = next(value for key, value in stages.items() if "inference" in key)
+    summarize = next(value for key, value in stages.items() if "summarize" in key)
+    assert inference["sum"] >= 0.15
+    assert 0.02 <= summarize["sum"] < 0.1
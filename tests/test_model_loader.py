@@ -0,0 +1,66 @@
+"""modules.model_loader (백엔드 레지스트리, ONNX 출력 디코딩) 테스트."""
+import numpy as np
+import pytest
+
+import modules.model_loader as model_loader
+from modules.model_loader import OnnxRuntimeBackend, load_model, register_backend
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(model_loader, "BACKENDS", dict(model_loader.BACKENDS))
+    monkeypatch.setattr(model_loader, "EXTENSION_BACKENDS", dict(model_loader.EXTENSION_BACKENDS))
+
+
+def test_registered_backend_is_chosen_by_name_and_extension(tmp_path, registry):
+    @register_backend("fake", extensions=(".FAKE",))
+    class FakeBackend:
+        def __init__(self, model_path, device="cpu", **options):
+            self.model_path = model_path
+            self.device = device
+            self.options = options
+
+    model_path = tmp_path / "model.fake"
+    model_path.write_bytes(b"")
+    model = load_model(str(model_path), device="cpu", imgsz=320)
+    assert isinstance(model, FakeBackend) and model.name == "fake"
+    assert model.options == {"imgsz": 320}
+    assert isinstance(load_model(str(model_path), backend="fake"), FakeBackend)
+
+    with pytest.raises(RuntimeError, match="지원하지 않는 백엔드"):
+        load_model(str(model_path), backend="tensorrt")
+    unknown = tmp_path / "model.bin"
+    unknown.write_bytes(b"")
+    with pytest.raises(RuntimeError, match="확장자"):
+        load_model(str(unknown))
+    with pytest.raises(RuntimeError, match="찾을 수 없습니다"):
+        load_model(str(tmp_path / "missing.fake"))
+
+
+def test_default_extension_backends():
+    assert model_loader.EXTENSION_BACKENDS[".pt"] == "torch"
+    assert model_loader.EXTENSION_BACKENDS[".onnx"] == "onnxruntime"
+    assert issubclass(model_loader.BACKENDS["openvino"], OnnxRuntimeBackend)
+
+
+def test_onnx_output_decoding_applies_threshold_and_nms():
+    backend = object.__new__(OnnxRuntimeBackend)
+    backend.iou, backend.max_det, backend.imgsz = 0.7, 300, 640
+
+    # (B=1, 4 + nc=2, N=4): xywh 다음 클래스 점수
+    candidates = np.array([
+        [100, 100, 20, 20, 0.90, 0.10],
+        [101, 101, 20, 20, 0.80, 0.05],  # 첫 박스와 겹쳐 NMS로 제거
+        [300, 300, 10, 40, 0.20, 0.60],
+        [500, 500, 10, 10, 0.30, 0.20],  # 임계값 미만
+    ], dtype=np.float32)
+    (det,) = backend._decode(candidates.T[None], conf=0.5)
+
+    np.testing.assert_allclose(det.xyxy, [[90, 90, 110, 110], [295, 280, 305, 320]])
+    np.testing.assert_allclose(det.conf, [0.9, 0.6])
+    assert det.cls.tolist() == [0, 1]
+    assert det.orig_shape == (640, 640)
+
+    backend.max_det = 1
+    (det,) = backend._decode(candidates.T[None], conf=0.5)
+    assert len(det.conf) == 1
@@ -0,0 +1,132 @@
+"""modules.postprocessor (NMS, 타일 경계 병합, DetectionStore) 테스트."""
+import numpy as np
+import pytest
+
+from modules.postprocessor import (DetectionStore, Detections, box_overlap, merge_boxes, nms,
+                                   pairwise_overlap, summarize)
+
+
+def reference_merge(xyxy, conf, cls, threshold, metric):
+    """박스 하나씩 흡수하는 단순 greedy 병합 (비교 기준)."""
+    order = np.argsort(-conf, kind="stable")
+    xyxy, conf, cls = xyxy[order], conf[order], cls[order]
+    merged = xyxy.copy()
+    alive = np.ones(len(xyxy), dtype=bool)
+    keep = []
+    for i in range(len(xyxy)):
+        if not alive[i]:
+            continue
+        alive[i] = False
+        keep.append(i)
+        candidates = np.flatnonzero(alive & (cls == cls[i]))
+        if candidates.size == 0:
+            continue
+        hits = candidates[box_overlap(merged[i], xyxy[candidates], metric) > threshold]
+        if hits.size:
+            merged[i, :2] = np.minimum(merged[i, :2], xyxy[hits, :2].min(axis=0))
+            merged[i, 2:] = np.maximum(merged[i, 2:], xyxy[hits, 2:].max(axis=0))
+            alive[hits] = False
+    keep = np.asarray(keep, dtype=np.int64)
+    return merged[keep], conf[keep], cls[keep]
+
+
+def random_boxes(rng, count, num_classes=3):
+    top_left = rng.uniform(0, 200, (count, 2))
+    size = rng.uniform(5, 60, (count, 2))
+    xyxy = np.concatenate([top_left, top_left + size], axis=1).astype(np.float32)
+    conf = rng.uniform(0.1, 1.0, count).astype(np.float32)
+    cls = rng.integers(0, num_classes, count).astype(np.int64)
+    return xyxy, conf, cls
+
+
+def test_pairwise_overlap_matches_box_overlap():
+    xyxy, _, _ = random_boxes(np.random.default_rng(0), 20)
+    for metric in ("iou", "ios"):
+        matrix = pairwise_overlap(xyxy, metric)
+        for i in range(len(xyxy)):
+            np.testing.assert_allclose(matrix[i], box_overlap(xyxy[i], xyxy, metric), rtol=1e-6)
+    with pytest.raises(ValueError):
+        pairwise_overlap(xyxy, "dice")
+
+
+@pytest.mark.parametrize("metric", ["iou", "ios"])
+@pytest.mark.parametrize("seed", range(5))
+def test_merge_boxes_matches_reference(seed, metric):
+    xyxy, conf, cls = random_boxes(np.random.default_rng(seed), 60)
+    expected = reference_merge(xyxy, conf, cls, 0.3, metric)
+    actual = merge_boxes(xyxy, conf, cls, 0.3, metric)
+    for a, b in zip(actual, expected):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_merge_boxes_joins_split_defect():
+    # 타일 경계에서 두 조각으로 잘린 결함 + 다른 클래스 박스
+    xyxy = np.array([[100, 10, 140, 30], [130, 12, 170, 28], [100, 10, 140, 30]], dtype=np.float32)
+    conf = np.array([0.9, 0.8, 0.7], dtype=np.float32)
+    cls = np.array([0, 0, 1])
+    merged, merged_conf, merged_cls = merge_boxes(xyxy, conf, cls, threshold=0.2)
+    np.testing.assert_array_equal(merged, [[100, 10, 170, 30], [100, 10, 140, 30]])
+    np.testing.assert_allclose(merged_conf, [0.9, 0.7], rtol=1e-6)
+    np.testing.assert_array_equal(merged_cls, [0, 1])
+
+
+def test_merge_boxes_empty():
+    empty = np.zeros((0, 4), np.float32)
+    merged, conf, cls = merge_boxes(empty, np.zeros(0, np.float32), np.zeros(0, np.int64))
+    assert merged.shape == (0, 4) and conf.shape == (0,) and cls.shape == (0,)
+
+
+def test_nms_is_per_class():
+    xyxy = np.array([[0, 0, 10, 10], [1, 1, 10, 10], [0, 0, 10, 10], [50, 50, 60, 60]], dtype=np.float32)
+    conf = np.array([0.9, 0.8, 0.7, 0.6], dtype=np.float32)
+    cls = np.array([0, 0, 1, 0])
+    np.testing.assert_array_equal(nms(xyxy, conf, cls, 0.5), [0, 2, 3])
+    assert nms(np.zeros((0, 4), np.float32), np.zeros(0), np.zeros(0), 0.5).size == 0
+
+
+def sample_store():
+    empty = (np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int64))
+    return summarize([
+        Detections("a.jpg", np.array([[0, 0, 10, 10], [20, 20, 30, 30]], np.float32),
+                   np.array([0.9, 0.3], np.float32), np.array([0, 5]), (100, 200)),
+        Detections("clean.jpg", *empty, (100, 200)),
+        Detections("b.jpg", np.array([[5, 5, 15, 15]], np.float32), np.array([0.6], np.float32),
+                   np.array([5]), (50, 80)),
+    ])
+
+
+def test_summarize_builds_columnar_store(capsys):
+    store = sample_store()
+    assert capsys.readouterr().out == ""
+    assert store.paths.tolist() == ["a.jpg", "clean.jpg", "b.jpg"]
+    assert store.image_index.tolist() == [0, 0, 2]
+    assert store.counts_per_image().tolist() == [2, 0, 1]
+    assert store.class_counts(6).tolist() == [1, 0, 0, 0, 0, 2]
+    assert store.for_image(1) == slice(2, 2)
+    np.testing.assert_array_equal(store.xyxy[store.for_image(2)], [[5, 5, 15, 15]])
+
+
+def test_detection_store_filter_keeps_image_table():
+    store = sample_store()
+    confident = store.filter(min_conf=0.5)
+    assert confident.paths.tolist() == store.paths.tolist()
+    assert confident.counts_per_image().tolist() == [1, 0, 1]
+    assert confident.conf.tolist() == pytest.approx([0.9, 0.6])
+
+    pinholes = store.filter(classes=[5])
+    assert pinholes.image_index.tolist() == [0, 2]
+    assert store.filter(min_conf=0.5, classes=[5]).image_index.tolist() == [2]
+    assert len(store.filter(classes=[])) == 0
+
+
+def test_detection_store_npz_round_trip(tmp_path):
+    store = sample_store()
+    store.to_npz(tmp_path / "detections.npz")
+    loaded = DetectionStore.from_npz(tmp_path / "detections.npz")
+    for name in ("paths", "shapes", "image_index", "xyxy", "conf", "cls"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(store, name))
+        assert getattr(loaded, name).dtype == getattr(store, name).dtype
+
+    DetectionStore.empty().to_npz(tmp_path / "empty.npz")
+    empty = DetectionStore.from_npz(tmp_path / "empty.npz")
+    assert len(empty) == 0 and empty.num_images == 0
@@ -0,0 +1,120 @@
+"""modules.preprocessor (레터박스 배치 버퍼, 골든 템플릿 프리필터) 테스트."""
+import cv2
+import numpy as np
+import pytest
+
+from modules.postprocessor import scale_boxes
+from modules.preprocessor import (PAD_VALUE, LetterboxBatch, evaluate_prefilter, find_template, prefilter,
+                                  preprocess, template_difference_score)
+
+
+@pytest.mark.parametrize("height, width", [(480, 640), (640, 480), (100, 100), (1000, 250)])
+def test_meta_describes_scale_and_padding(height, width):
+    batch = LetterboxBatch(2, imgsz=320)
+    image = np.full((height, width, 3), 200, np.uint8)
+    batch.fill(1, image)
+
+    scale, pad_x, pad_y, orig_h, orig_w = batch.meta[1]
+    assert (orig_h, orig_w) == (height, width)
+    assert scale == pytest.approx(min(320 / height, 320 / width))
+    assert pad_x == int(round((320 - round(width * scale)) / 2 - 0.1))
+    assert pad_y == int(round((320 - round(height * scale)) / 2 - 0.1))
+
+    plane = batch.images[1, 0]
+    assert plane.dtype == np.float32
+    # 이미지 영역은 원래 색, 패딩은 114
+    assert plane[160, 160] == pytest.approx(200 / 255)
+    if pad_x >= 1:
+        assert plane[160, 0] == pytest.approx(PAD_VALUE / 255)
+    if pad_y >= 1:
+        assert plane[0, 160] == pytest.approx(PAD_VALUE / 255)
+
+
+def test_fill_matches_resize_and_converts_to_rgb_chw():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 255, (120, 160, 3), dtype=np.uint8)
+    batch = preprocess([image], imgsz=80)
+    _, pad_x, pad_y, _, _ = batch.meta[0]
+    assert (pad_x, pad_y) == (0, 10)
+
+    expected = cv2.resize(image, (80, 60), interpolation=cv2.INTER_LINEAR)[:, :, ::-1].transpose(2, 0, 1)
+    np.testing.assert_allclose(batch.images[0, :, 10:70] * 255, expected, atol=1.01)
+
+
+def test_scale_boxes_inverts_letterbox():
+    batch = LetterboxBatch(1, imgsz=640)
+    batch.fill(0, np.zeros((1200, 1600, 3), np.uint8))
+    scale, pad_x, pad_y, _, _ = batch.meta[0]
+
+    original = np.array([[100, 200, 300, 400], [0, 0, 1600, 1200]], np.float32)
+    letterboxed = original * scale + np.array([pad_x, pad_y, pad_x, pad_y], np.float32)
+    np.testing.assert_allclose(scale_boxes(letterboxed, batch.meta[0]), original, atol=1e-3)
+
+    # 패딩 영역으로 나간 박스는 원본 경계로 잘림
+    outside = np.array([[-10, 0, 700, 700]], np.float32)
+    np.testing.assert_allclose(scale_boxes(outside, batch.meta[0]), [[0, 0, 1600, 1200]])
+
+
+def test_move_and_buffer_reuse():
+    images = np.zeros((3, 3, 32, 32), np.float32)
+    batch = LetterboxBatch(3, imgsz=32, images=images)
+    batch.fill(2, np.full((16, 32, 3), 50, np.uint8))
+    batch.move(2, 0)
+    assert batch.images is images
+    np.testing.assert_array_equal(batch.meta[0], batch.meta[2])
+    np.testing.assert_array_equal(images[0], images[2])
+    assert preprocess([np.zeros((8, 8, 3), np.uint8)], imgsz=32, batch=batch) is batch
+    with pytest.raises(ValueError):
+        LetterboxBatch(2, imgsz=32, images=np.zeros((2, 3, 16, 16), np.float32))
+
+
+def make_pair(root, name, defect_size=0):
+    """DeepPCB 구조처럼 ``X/NNN_test.png``, ``X/NNN_temp.png``, ``X_not/NNN.txt`` 를 만듭니다."""
+    (root / 'X').mkdir(parents=True, exist_ok=True)
+    (root / 'X_not').mkdir(exist_ok=True)
+    template = np.zeros((64, 64), np.uint8)
+    template[10:54, 30:34] = 255  # 배선
+    test = template.copy()
+    if defect_size:
+        test[20:20 + defect_size, 40:40 + defect_size] = 255
+    cv2.imwrite(str(root / 'X' / f'{name}_temp.png'), template)
+    cv2.imwrite(str(root / 'X' / f'{name}_test.png'), test)
+    label = f'40 20 {40 + defect_size} {20 + defect_size} 1\n' if defect_size else ''
+    (root / 'X_not' / f'{name}.txt').write_text(label)
+    return str(root / 'X' / f'{name}_test.png')
+
+
+def test_difference_score_ignores_thin_misalignment():
+    template = np.zeros((64, 64), np.uint8)
+    template[10:54, 30:34] = 255
+    shifted = np.roll(template, 1, axis=1)
+    assert template_difference_score(shifted, template, kernel_size=3) == 0
+
+    defect = template.copy()
+    defect[5:11, 5:11] = 255
+    assert template_difference_score(defect, template) == 36
+    # 크기가 다른 템플릿은 테스트 이미지 크기로 맞춤
+    assert template_difference_score(defect, cv2.resize(template, (32, 32), interpolation=cv2.INTER_NEAREST)) == 36
+
+
+def test_prefilter_skips_clean_boards_and_keeps_unknown(tmp_path):
+    clean = make_pair(tmp_path, '000')
+    tiny = make_pair(tmp_path, '001', defect_size=3)
+    defective = make_pair(tmp_path, '002', defect_size=8)
+    (tmp_path / 'other.png').write_bytes(cv2.imencode('.png', np.zeros((8, 8), np.uint8))[1].tobytes())
+    no_template = str(tmp_path / 'other.png')
+    assert find_template(clean).endswith('000_temp.png')
+    assert find_template(no_template) is None
+
+    stats = {}
+    to_detect, skipped = prefilter([clean, tiny, defective, no_template], min_blob_area=20, stats=stats)
+    assert to_detect == [defective, no_template]
+    assert [det.path for det in skipped] == [clean, tiny]
+    assert all(len(det.conf) == 0 and det.orig_shape == (64, 64) for det in skipped)
+    assert stats['skipped'] == 2 and stats['no_template'] == 1
+    assert stats['scores'] == [0, 9, 64, None]
+
+    # 작은 결함(라벨 있음)을 건너뛴 만큼 보드 재현율이 떨어짐
+    report = evaluate_prefilter([clean, tiny, defective], [det.path for det in skipped])
+    assert report['defective'] == 2 and report['missed_defective'] == 1
+    assert report['board_recall'] == 0.5
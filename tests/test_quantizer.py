@@ -0,0 +1,56 @@
+"""modules.quantizer 평가 함수(mAP50) 테스트."""
+import numpy as np
+import pytest
+
+from modules.postprocessor import Detections
+from modules.quantizer import average_precision, load_yolo_labels, map50
+
+
+def labelled_image(root, name, lines):
+    """``images/<name>`` 와 ``labels/<name>.txt`` 를 만들고 이미지 경로를 반환합니다."""
+    (root / 'images').mkdir(exist_ok=True)
+    (root / 'labels').mkdir(exist_ok=True)
+    (root / 'images' / f"{name}.jpg").write_bytes(b'')
+    (root / 'labels' / f"{name}.txt").write_text("".join(line + "\n" for line in lines))
+    return str(root / 'images' / f"{name}.jpg")
+
+
+def detections(path, boxes, conf, cls):
+    return Detections(path=path, xyxy=np.asarray(boxes, np.float32).reshape(-1, 4),
+                      conf=np.asarray(conf, np.float32), cls=np.asarray(cls, np.int64), orig_shape=(100, 200))
+
+
+def test_load_yolo_labels_to_pixels(tmp_path):
+    path = labelled_image(tmp_path, 'a', ["1 0.5 0.5 0.1 0.2"])
+    np.testing.assert_allclose(load_yolo_labels(path, (100, 200)), [[1, 90, 40, 110, 60]])
+    assert load_yolo_labels(str(tmp_path / 'images' / 'missing.jpg'), (100, 200)).shape == (0, 5)
+
+
+def test_perfect_detections_score_one(tmp_path):
+    path = labelled_image(tmp_path, 'a', ["0 0.5 0.5 0.1 0.2", "1 0.25 0.25 0.1 0.1"])
+    result = map50([detections(path, [[90, 40, 110, 60], [40, 20, 60, 30]], [0.9, 0.8], [0, 1])])
+    assert result["map50"] == pytest.approx(1.0)
+    assert result["images"] == 1
+
+
+def test_duplicates_and_misses_lower_ap(tmp_path):
+    path = labelled_image(tmp_path, 'a', ["0 0.5 0.5 0.1 0.2", "0 0.1 0.1 0.05 0.05"])
+    # 같은 정답에 두 번 검출 (두 번째는 오검출), 두 번째 정답은 놓침
+    result = map50([detections(path, [[90, 40, 110, 60], [91, 41, 110, 60]], [0.9, 0.8], [0, 0])])
+    # 재현율 0~0.5의 51개 점에서만 정밀도 1
+    assert result["per_class"][0] == pytest.approx(51 / 101)
+
+
+def test_average_precision_interpolation():
+    assert average_precision(np.array([1.0]), np.array([1.0])) == pytest.approx(1.0)
+    assert average_precision(np.zeros(0), np.zeros(0)) == 0.0
+    # 정밀도는 오른쪽의 최댓값으로 채움 (재현율 0.5에서 0.5 → 1.0에서 2/3)
+    recall, precision = np.array([0.5, 0.5, 1.0]), np.array([1.0, 0.5, 2 / 3])
+    assert average_precision(recall, precision) == pytest.approx((51 * 1.0 + 50 * 2 / 3) / 101)
+
+
+def test_class_without_detections_scores_zero(tmp_path):
+    path = labelled_image(tmp_path, 'a', ["0 0.5 0.5 0.1 0.2", "2 0.25 0.25 0.1 0.1"])
+    result = map50([detections(path, [[90, 40, 110, 60]], [0.9], [0])])
+    assert result["per_class"] == {0: pytest.approx(1.0), 2: 0.0}
+    assert result["map50"] == pytest.approx(0.5)
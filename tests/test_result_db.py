@@ -0,0 +1,38 @@
+"""modules.result_db (검사 결과 DB) 테스트."""
+import numpy as np
+import pytest
+
+from modules.postprocessor import Detections
+from modules.result_db import ResultDatabase
+
+
+def detections(count):
+    for i in range(count):
+        yield Detections(path=f"board_{i}.jpg", xyxy=np.array([[1, 2, 3, 4]], np.float32),
+                         conf=np.array([0.9], np.float32), cls=np.array([0]), orig_shape=(10, 10))
+
+
+def failing_after(count):
+    yield from detections(count)
+    raise RuntimeError("inference failed")
+
+
+def test_tap_records_received_results_when_upstream_fails(tmp_path):
+    db = ResultDatabase(str(tmp_path / "results.db"))
+    run_id = db.start_run(lot="LOT")
+    seen = []
+    with pytest.raises(RuntimeError):
+        for det in db.tap(failing_after(5), run_id, "LOT", batch_size=2):
+            seen.append(det.path)
+    db.close()
+    db.close()  # 두 번 닫아도 됨
+
+    assert len(seen) == 4
+    assert db.images == 5
+
+
+def test_tap_passes_results_through_in_order(tmp_path):
+    with ResultDatabase(str(tmp_path / "results.db")) as db:
+        paths = [det.path for det in db.tap(detections(5), batch_size=2)]
+    assert paths == [f"board_{i}.jpg" for i in range(5)]
+    assert db.images == 5
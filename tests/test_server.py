@@ -0,0 +1,59 @@
+"""modules.server (로컬 추론 서버) 요청 검증 테스트."""
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import cv2
+import numpy as np
+import pytest
+
+from modules.postprocessor import Detections
+from modules.server import InferenceServer
+
+
+class EmptyModel:
+    """모든 이미지에 검출 없음을 반환하는 모델."""
+
+    names = {0: 'defect'}
+
+    def __call__(self, images, **kwargs):
+        return [Detections(path='', xyxy=np.zeros((0, 4), np.float32), conf=np.zeros(0, np.float32),
+                           cls=np.zeros(0, np.int64), orig_shape=(0, 0)) for _ in images]
+
+
+@pytest.fixture
+def server():
+    app = InferenceServer(EmptyModel(), host='127.0.0.1', port=0, max_wait_ms=0, imgsz=64)
+    thread = threading.Thread(target=app.serve_forever, daemon=True)
+    thread.start()
+    yield app
+    app.httpd.shutdown()
+    thread.join(timeout=5)
+
+
+def post(app, body, content_type='application/json'):
+    request = urllib.request.Request(f"{app.address}/infer", data=body, headers={'Content-Type': content_type})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize("body", [b'[]', b'"x"', b'42', b'{"paths": "a.jpg"}', b'{"path": 1}', b'{}', b'{bad json'])
+def test_malformed_json_is_a_client_error(server, body):
+    status, payload = post(server, body)
+    assert status == 400
+    assert payload["error"]
+
+
+def test_path_request(server, tmp_path):
+    image_path = tmp_path / 'board.png'
+    cv2.imwrite(str(image_path), np.zeros((32, 32, 3), np.uint8))
+    status, payload = post(server, json.dumps({"path": str(image_path)}).encode())
+    assert status == 200
+    assert payload["results"][0]["path"] == str(image_path)
+
+    status, _ = post(server, json.dumps({"path": str(tmp_path / 'missing.png')}).encode())
+    assert status == 400
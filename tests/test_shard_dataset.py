@@ -0,0 +1,31 @@
+"""modules.shard_dataset 테스트 (Ultralytics가 설치된 환경에서만 실행)."""
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("ultralytics")
+
+from ultralytics.cfg import get_cfg  # noqa: E402
+from ultralytics.data.dataset import YOLODataset  # noqa: E402
+
+from modules.shard_dataset import ShardYOLODataset  # noqa: E402
+from modules.train_cache import ImageShard  # noqa: E402
+
+
+def test_mosaic_training_reads_from_shard(tmp_path):
+    (tmp_path / 'images' / 'train').mkdir(parents=True)
+    (tmp_path / 'labels' / 'train').mkdir(parents=True)
+    for i in range(4):
+        cv2.imwrite(str(tmp_path / 'images' / 'train' / f"{i}.jpg"), np.full((96, 128, 3), 40 * i, np.uint8))
+        (tmp_path / 'labels' / 'train' / f"{i}.txt").write_text("0 0.5 0.5 0.25 0.25\n")
+
+    hyp = get_cfg(overrides={'mosaic': 1.0})
+    dataset = YOLODataset(str(tmp_path / 'images' / 'train'), imgsz=64, augment=True, hyp=hyp,
+                          batch_size=2, data={'names': {0: 'defect'}, 'nc': 1, 'channels': 3})
+    dataset.__class__ = ShardYOLODataset
+    dataset.shard = ImageShard.build(tmp_path, 'train', imgsz=64)
+
+    sample = dataset[0]  # Mosaic은 buffer에서 이웃 이미지를 고름
+    assert tuple(sample['img'].shape[1:]) == (64, 64)
+    assert dataset.buffer
+    assert all(dataset.ims[j] is not None for j in dataset.buffer)
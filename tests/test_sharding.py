@@ -0,0 +1,80 @@
+"""modules.sharding 테스트 (워커 프로세스 비정상 종료 처리)."""
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+import modules.sharding as sharding
+
+
+def crashing_worker(worker_id, model_path, model_options, threads, slot_names, batch_size, imgsz,
+                    confidence, tasks, results):
+    """준비 신호를 보낸 뒤 첫 작업에서 죽는 워커 (OOM 종료 흉내)."""
+    results.put(("ready", worker_id, None, None))
+    tasks.get()
+    os._exit(9)
+
+
+def shm_names():
+    return set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+
+
+def test_dead_worker_raises_and_releases_shared_memory(tmp_path, monkeypatch):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"{i}.png"
+        cv2.imwrite(str(path), np.zeros((20, 20, 3), np.uint8))
+        paths.append(str(path))
+    monkeypatch.setattr(sharding, "_worker_main", crashing_worker)
+    monkeypatch.setattr(sharding, "LIVENESS_INTERVAL", 0.2)
+
+    before = shm_names()
+    with pytest.raises(RuntimeError, match="exitcode 9"):
+        list(sharding.run_sharded_inference("unused.pt", paths, workers=1, batch_size=2, imgsz=32))
+    assert shm_names() - before == set()
+
+
+def echo_worker(worker_id, model_path, model_options, threads, slot_names, batch_size, imgsz,
+                confidence, tasks, results):
+    """스레드 환경 변수를 ``model_path`` 에 기록하고 이미지마다 빈 박스를 돌려주는 워커."""
+    import json
+    import sys
+
+    with open(model_path, "w") as f:
+        json.dump({"env": {var: os.environ.get(var) for var in sharding._THREAD_ENV_VARS},
+                   "numpy_loaded": "numpy" in sys.modules}, f)
+    results.put(("ready", worker_id, None, None))
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        batch_id, slot, meta = task
+        empty = (np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int64))
+        results.put(("done", batch_id, slot, [empty] * len(meta)))
+
+
+def test_workers_inherit_thread_caps_and_images_are_returned(tmp_path, monkeypatch):
+    import json
+
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"{i}.png"
+        cv2.imwrite(str(path), np.full((20, 30, 3), i, np.uint8))
+        paths.append(str(path))
+    paths.insert(2, str(tmp_path / "missing.png"))
+    monkeypatch.setattr(sharding, "_worker_main", echo_worker)
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+
+    report = tmp_path / "worker.json"
+    items = list(sharding.run_sharded_inference(str(report), paths, workers=1, threads_per_worker=3,
+                                                batch_size=2, imgsz=32, with_images=True))
+    assert [det.path for det, _ in items] == [p for p in paths if "missing" not in p]
+    for i, (det, image) in enumerate(items):
+        assert image.shape == (20, 30, 3) and det.orig_shape == (20, 30)
+        assert int(image[0, 0, 0]) == i
+
+    worker = json.loads(report.read_text())
+    assert worker["numpy_loaded"]
+    assert worker["env"] == {var: "3" for var in sharding._THREAD_ENV_VARS}
+    assert "OMP_NUM_THREADS" not in os.environ
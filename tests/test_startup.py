@@ -0,0 +1,33 @@
+"""CLI 진입점 지연 임포트 테스트 (benchmarks/startup.py 와 같은 대상)."""
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+_spec = importlib.util.spec_from_file_location("startup", PROJECT_ROOT / "benchmarks" / "startup.py")
+startup = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(startup)
+
+
+def test_module_imports_do_not_load_heavy_dependencies():
+    code = (
+        "import importlib, json, sys\n"
+        f"for module in {startup.IMPORT_TARGETS!r}:\n"
+        "    importlib.import_module(module)\n"
+        f"print(json.dumps(sorted(m for m in {startup.HEAVY_MODULES!r} if m in sys.modules)))\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
+
+
+@pytest.mark.parametrize("entry", startup.ENTRY_POINTS)
+def test_entry_point_help_runs(entry):
+    completed = subprocess.run([sys.executable, entry, "--help"], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
+    assert "usage" in completed.stdout
@@ -0,0 +1,88 @@
+"""modules.train_cache (labels.cache 검증, 이미지 샤드) 테스트."""
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from modules.train_cache import ImageShard, ensure_image_shards, resized_shape, validate_labels_cache
+
+
+def make_dataset(root, sizes=((48, 64), (64, 32), (20, 20))):
+    """``images/train``, ``labels/train`` 에 작은 이미지와 라벨을 만듭니다."""
+    (root / 'images' / 'train').mkdir(parents=True)
+    (root / 'labels' / 'train').mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    for i, (h, w) in enumerate(sizes):
+        cv2.imwrite(str(root / 'images' / 'train' / f"{i}.png"), rng.integers(0, 255, (h, w, 3), dtype=np.uint8))
+        (root / 'labels' / 'train' / f"{i}.txt").write_text("0 0.5 0.5 0.2 0.2\n")
+    return root
+
+
+def test_labels_cache_kept_until_dataset_changes(tmp_path):
+    root = make_dataset(tmp_path)
+    cache = root / 'labels' / 'train.cache'
+
+    assert validate_labels_cache(root) is False  # 첫 실행: 지문만 기록
+    cache.write_bytes(b'cache')
+    assert validate_labels_cache(root) is True
+    assert cache.exists()
+
+    label = root / 'labels' / 'train' / '0.txt'
+    label.write_text("1 0.5 0.5 0.3 0.3\n")
+    os.utime(label, ns=(1, 1))
+    assert validate_labels_cache(root) is False
+    assert not cache.exists()
+
+
+def test_labels_cache_force(tmp_path):
+    root = make_dataset(tmp_path)
+    validate_labels_cache(root)
+    cache = root / 'labels.cache'
+    cache.write_bytes(b'cache')
+    assert validate_labels_cache(root, force=True) is False
+    assert not cache.exists()
+
+
+def test_resized_shape_matches_rect_mode():
+    assert resized_shape(640, 640, 640) == (640, 640)
+    assert resized_shape(1000, 500, 640) == (640, 320)
+    assert resized_shape(10, 20, 640) == (320, 640)
+
+
+def test_image_shard_matches_decode(tmp_path):
+    root = make_dataset(tmp_path)
+    shard = ImageShard.build(root, 'train', imgsz=32, num_workers=2)
+    assert len(shard) == 3
+    for name in ('0.png', '1.png', '2.png'):
+        original = cv2.imread(str(root / 'images' / 'train' / name))
+        h, w = resized_shape(*original.shape[:2], 32)
+        expected = cv2.resize(original, (w, h), interpolation=cv2.INTER_LINEAR) \
+            if (h, w) != original.shape[:2] else original
+        image, orig_hw = shard.get(root / 'images' / 'train' / name)
+        assert orig_hw == original.shape[:2]
+        np.testing.assert_array_equal(image, expected)
+        assert not image.flags.writeable
+    assert shard.get('missing.png') is None
+
+
+def test_image_shard_invalidated_when_images_change(tmp_path):
+    root = make_dataset(tmp_path)
+    first = ensure_image_shards(root, 32)['train']
+    assert ImageShard.open(root, 'train', 32) is not None
+    assert ImageShard.open(root, 'train', 64) is None
+
+    cv2.imwrite(str(root / 'images' / 'train' / '3.png'), np.zeros((8, 8, 3), np.uint8))
+    assert ImageShard.open(root, 'train', 32) is None
+    rebuilt = ensure_image_shards(root, 32)['train']
+    assert len(rebuilt) == len(first) + 1
+
+
+def test_image_shard_build_fails_on_unreadable_image(tmp_path):
+    root = make_dataset(tmp_path, sizes=((16, 16),))
+    with open(root / 'images' / 'train' / 'bad.png', 'wb') as f:
+        # 헤더만 있는 손상된 PNG
+        f.write(b'\x89PNG\r\n\x1a\n' + b'\x00\x00\x00\rIHDR' + (16).to_bytes(4, 'big') * 2 + b'\x08\x02\x00\x00\x00')
+    with pytest.raises(ValueError):
+        ImageShard.build(root, 'train', imgsz=16)
+    assert not list((root / 'shards').glob('*.tmp.npy'))
@@ -0,0 +1,90 @@
+"""modules.visualizer (백그라운드 렌더링 워커 풀) 테스트."""
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+import modules.visualizer as visualizer_module
+from modules.postprocessor import Detections, summarize
+from modules.visualizer import AsyncVisualizer, draw_detections, visualize
+
+
+def detections(path, boxes=1):
+    xyxy = np.tile(np.array([[4, 4, 20, 20]], np.float32), (boxes, 1))
+    return Detections(path=str(path), xyxy=xyxy, conf=np.full(boxes, 0.9, np.float32),
+                      cls=np.zeros(boxes, np.int64), orig_shape=(32, 48))
+
+
+@pytest.fixture
+def boards(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / 'in' / f'{i}.png'
+        path.parent.mkdir(exist_ok=True)
+        cv2.imwrite(str(path), np.full((32, 48, 3), 40 * i, np.uint8))
+        paths.append(path)
+    return paths
+
+
+def test_draw_detections_does_not_modify_input():
+    image = np.zeros((32, 48, 3), np.uint8)
+    image.flags.writeable = False
+    canvas = draw_detections(image, np.array([[4, 4, 20, 20]], np.float32), np.array([0.9]), np.array([1]),
+                             names={1: 'short'}, scale=0.5)
+    assert canvas.shape == (16, 24, 3)
+    assert canvas.any() and not image.any()
+
+
+@pytest.mark.parametrize('mode, written', [('all', 3), ('defects', 2)])
+def test_modes_write_boards(tmp_path, boards, mode, written):
+    store = summarize([detections(boards[0]), detections(boards[1], boxes=0), detections(boards[2], boxes=2)])
+    stats = visualize(store, str(tmp_path / 'out'), mode=mode, num_workers=2)
+    assert stats['written'] == written and stats['failed'] == 0
+    assert stats['skipped'] == 3 - written
+    saved = sorted(p.name for p in (tmp_path / 'out' / 'images').iterdir())
+    assert saved == (['0.jpg', '1.jpg', '2.jpg'] if mode == 'all' else ['0.jpg', '2.jpg'])
+    assert cv2.imread(str(tmp_path / 'out' / 'images' / '0.jpg')).shape == (32, 48, 3)
+
+
+def test_tap_passes_decoded_images_to_workers(tmp_path, boards, monkeypatch):
+    loaded = []
+    monkeypatch.setattr(visualizer_module, 'load_single_image', lambda path, cache=None: loaded.append(path))
+    items = [(detections(path), cv2.imread(str(path))) for path in boards]
+    with AsyncVisualizer(str(tmp_path / 'out'), mode='all') as visualizer:
+        assert [det.path for det in visualizer.tap(iter(items))] == [str(p) for p in boards]
+    assert loaded == []
+    assert visualizer.stats()['written'] == 3
+
+
+def test_render_failures_are_counted_and_skipped(tmp_path, boards):
+    with AsyncVisualizer(str(tmp_path / 'out'), mode='all') as visualizer:
+        visualizer.submit(detections(tmp_path / 'missing.png'))
+        visualizer.submit(detections(boards[0]))
+    stats = visualizer.stats()
+    assert stats['failed'] == 1 and stats['written'] == 1
+
+
+def test_full_queue_blocks_submit(tmp_path, boards, monkeypatch):
+    release = threading.Event()
+    original = AsyncVisualizer._render
+
+    def slow_render(self, det, image):
+        release.wait(5)
+        return original(self, det, image)
+
+    monkeypatch.setattr(AsyncVisualizer, '_render', slow_render)
+    visualizer = AsyncVisualizer(str(tmp_path / 'out'), mode='all', num_workers=1, max_queue=1)
+    visualizer.submit(detections(boards[0]))  # 워커가 처리 중
+    visualizer.submit(detections(boards[1]))  # 큐를 채움
+    submitted = threading.Event()
+    threading.Thread(target=lambda: (visualizer.submit(detections(boards[2])), submitted.set())).start()
+    assert not submitted.wait(0.2)
+    release.set()
+    assert submitted.wait(5)
+    visualizer.close()
+    assert visualizer.stats()['written'] == 3
+    assert visualizer.stats()['blocked_seconds'] > 0.1
+
+    with pytest.raises(ValueError):
+        AsyncVisualizer(str(tmp_path / 'out'), mode='boards')
@@ -0,0 +1,87 @@
+"""modules.watcher (핫 폴더 감시) 테스트."""
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from modules.watcher import FolderWatcher, watch_and_infer
+
+
+def write_image(path, age=10.0):
+    cv2.imwrite(str(path), np.zeros((16, 16, 3), np.uint8))
+    old = time.time() - age
+    os.utime(path, (old, old))
+
+
+def test_poll_watcher_forgets_deleted_files(tmp_path):
+    write_image(tmp_path / 'a.png')
+    watcher = FolderWatcher(str(tmp_path), mode='poll', poll_interval=0.0, settle_seconds=0.0)
+    try:
+        assert watcher.poll() == [str(tmp_path / 'a.png')]
+        (tmp_path / 'a.png').unlink()
+        os.utime(tmp_path, ns=(1, 1))  # 디렉터리 수정 시각 변경을 확실히 함
+        assert watcher.poll() == []
+        assert not watcher._known
+
+        # 같은 이름으로 다시 들어온 파일은 새 파일로 처리
+        write_image(tmp_path / 'a.png')
+        os.utime(tmp_path, ns=(2, 2))
+        found = watcher.poll() + watcher.poll()
+        assert found == [str(tmp_path / 'a.png')]
+    finally:
+        watcher.close()
+
+
+class HangingModel:
+    """호출되면 풀려날 때까지 멈추는 모델 (죽거나 멈춘 배치 스레드 흉내)."""
+
+    names = {0: 'defect'}
+
+    def __init__(self):
+        self.called = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, images, **kwargs):
+        self.called.set()
+        self.release.wait()
+        return []
+
+
+def test_shutdown_does_not_wait_forever_for_stuck_batches(tmp_path):
+    watch_dir = tmp_path / 'in'
+    watch_dir.mkdir()
+    write_image(watch_dir / 'a.png')
+    model = HangingModel()
+    stop = threading.Event()
+    threading.Thread(target=lambda: model.called.wait(5) and stop.set(), daemon=True).start()
+
+    stats = {}
+    start = time.monotonic()
+    try:
+        watch_and_infer(model, str(watch_dir), str(tmp_path / 'results.jsonl'), mode='poll',
+                        poll_interval=0.05, settle_seconds=0.0, max_wait_ms=0, drain_timeout=0.3,
+                        stop_event=stop, stats=stats)
+    finally:
+        model.release.set()
+    assert time.monotonic() - start < 5
+    assert stats['images'] == 0
+
+
+def test_restart_skips_processed_files(tmp_path):
+    watch_dir = tmp_path / 'in'
+    watch_dir.mkdir()
+    write_image(watch_dir / 'a.png')
+    results = tmp_path / 'results.jsonl'
+    results.write_text(f'{{"path": "{watch_dir / "a.png"}"}}\n{{"path": "{watch_dir / "gone.png"}"}}\n')
+
+    model = HangingModel()
+    model.release.set()
+    stop = threading.Event()
+    threading.Timer(0.5, stop.set).start()
+    stats = {}
+    watch_and_infer(model, str(watch_dir), str(results), mode='poll', poll_interval=0.05,
+                    settle_seconds=0.0, stop_event=stop, stats=stats)
+    assert not model.called.is_set()
+    assert stats['images'] == 0
@@ -7,7 +7,6 @@ import shutil
 import argparse
 import yaml
 from typing import Optional
-from ultralytics import YOLO
 
 # 로깅 설정
 logging.basicConfig(
@@ -95,15 +94,36 @@ def find_deeppcb_data(dataset_dir: Optional[str]) -> Optional[str]:
         return None
 
 
-def remove_labels_cache(data_config: str) -> None:
-    """데이터셋 캐시 파일이 존재하면 삭제합니다."""
+def dataset_root(data_config: str) -> Path:
+    """데이터셋 YAML의 ``path`` 를 Ultralytics와 같은 규칙으로 해석한 데이터셋 루트를 반환합니다.
+
+    ``path`` 가 없으면 YAML이 있는 폴더, 상대 경로이면 Ultralytics 설정의
+    ``datasets_dir`` 기준입니다 (``check_det_dataset`` 과 같은 규칙).
+    """
+    config_path = Path(data_config).resolve()
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            root = (yaml.safe_load(f) or {}).get("path")
+    except (OSError, yaml.YAMLError):
+        root = None
+    if not root:
+        return config_path.parent
+    root = Path(root)
+    if not root.is_absolute():
+        from ultralytics.utils import DATASETS_DIR
+
+        root = (Path(DATASETS_DIR) / root).resolve()
+    return root
+
+
+def refresh_labels_cache(data_config: str, force: bool = False) -> None:
+    """데이터셋이 바뀐 경우에만 라벨 캐시 파일을 삭제합니다 (``force`` 이면 항상 삭제)."""
+    from modules.train_cache import validate_labels_cache
+
     try:
-        cache_path = Path(data_config).resolve().parent / "labels.cache"
-        if cache_path.exists():
-            cache_path.unlink()
-            logger.info(f"캐시 파일 삭제: {cache_path}")
+        validate_labels_cache(dataset_root(data_config), force=force)
     except Exception as e:
-        logger.error(f"캐시 파일 삭제 중 오류: {e}")
+        logger.error(f"라벨 캐시 확인 중 오류: {e}")
 
 
 def validate_model_path(model_path: str) -> bool:
@@ -124,6 +144,7 @@ def main() -> None:
         DATA_CONFIG_DEFAULT = config.get("dataset", {}).get("path", "./datasets/deeppcb/deeppcb.yaml")
         PRETRAINED_MODEL_DEFAULT = config.get("model", {}).get("pretrained", "./models/yolov8x.pt")
         EPOCHS_DEFAULT = config.get("training", {}).get("epochs", 50)
+        IMGSZ_DEFAULT = config.get("training", {}).get("imgsz", 640)
         OUTPUT_DIR_DEFAULT = Path(config.get("training", {}).get("project", "./output"))
 
         parser = argparse.ArgumentParser(description="YOLOv8 학습 스크립트")
@@ -133,6 +154,12 @@ def main() -> None:
         parser.add_argument("--epochs", type=int, default=EPOCHS_DEFAULT, help="학습 에폭 수")
         parser.add_argument("--output", default=str(OUTPUT_DIR_DEFAULT), help="결과 저장 디렉터리")
         parser.add_argument("--config", default="config.yaml", help="설정 파일 경로")
+        parser.add_argument("--imgsz", type=int, default=IMGSZ_DEFAULT, help="학습 입력 크기")
+        parser.add_argument("--rebuild-cache", action="store_true",
+                            help="데이터셋 변경 여부와 관계없이 labels.cache 삭제")
+        parser.add_argument("--image-shard", action="store_true",
+                            default=config.get("training", {}).get("image_shard", False),
+                            help="imgsz로 미리 줄인 메모리 매핑 이미지 샤드에서 학습 이미지를 읽음")
         args = parser.parse_args()
 
         # 데이터셋 경로 결정
@@ -159,28 +186,43 @@ def main() -> None:
             
         logger.info(f"데이터셋: {data_config}")
         
-        # 캐시 삭제
-        remove_labels_cache(data_config)
+        # 라벨 캐시 검증 (데이터셋이 바뀐 경우에만 삭제)
+        if config.get("dataset", {}).get("cache_cleanup", True) or args.rebuild_cache:
+            refresh_labels_cache(data_config, force=args.rebuild_cache)
 
         # 모델 검증 및 로드
         if not validate_model_path(args.model):
             sys.exit(1)
             
         logger.info(f"사전 학습 모델 로드: {args.model}")
+        from ultralytics import YOLO
+
         model = YOLO(args.model)
         
         # 출력 디렉터리 생성
         output_dir = Path(args.output)
         output_dir.mkdir(parents=True, exist_ok=True)
         
+        # 이미지 샤드 준비 (없거나 이미지가 바뀐 분할만 새로 생성)
+        train_kwargs = {}
+        if args.image_shard:
+            from modules.shard_dataset import ShardDetectionTrainer
+            from modules.train_cache import ensure_image_shards
+
+            ensure_image_shards(dataset_root(data_config), args.imgsz,
+                                num_workers=config.get("training", {}).get("shard_workers", 4))
+            train_kwargs["trainer"] = ShardDetectionTrainer
+
         # 학습 실행
         logger.info("모델 학습 시작...")
         results = model.train(
             data=data_config,
             epochs=args.epochs,
+            imgsz=args.imgsz,
             project=str(output_dir),
             name=config.get("training", {}).get("name", "deeppcb_yolo"),
             device=config.get("model", {}).get("device", 0),
+            **train_kwargs,
         )
 
         # 결과 저장